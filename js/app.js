@@ -2,7 +2,8 @@
 let servicesData = [];
 let reposData = [];
 let metaData = {};
-let errorsData = [];
+let aggregatesData = {};
+let errorDaysFallback = {};
 
 // Load data on page load
 document.addEventListener('DOMContentLoaded', loadData);
@@ -35,14 +36,26 @@ async function loadData() {
         const metaResponse = await fetch('data/meta.json' + cacheBuster);
         metaData = await metaResponse.json();
 
-        // Load errors for chart
+        // Load precomputed chart aggregates (daily/hourly counts, usage ranking)
         try {
-            const errorsResponse = await fetch('data/errors.json' + cacheBuster);
-            if (errorsResponse.ok) {
-                errorsData = await errorsResponse.json();
+            const aggregatesResponse = await fetch('data/aggregates.json' + cacheBuster);
+            if (aggregatesResponse.ok) {
+                aggregatesData = await aggregatesResponse.json();
             }
         } catch (e) {
-            errorsData = [];
+            aggregatesData = {};
+        }
+
+        // Without aggregates.json (not generated yet) the daily chart counts
+        // errors per day from the error manifest (or errors.json, see data.js)
+        if (!(aggregatesData.errors && aggregatesData.errors.daily)) {
+            try {
+                const manifest = await loadErrorManifest(true);
+                errorDaysFallback = Object.fromEntries(Object.entries(manifest.days || {})
+                    .map(([day, entry]) => [day, { total: entry.count }]));
+            } catch (e) {
+                errorDaysFallback = {};
+            }
         }
 
         document.getElementById('lastUpdate').textContent = `Ultima actualizacion: ${formatDate(metaData.lastUpdate)}`;
@@ -102,13 +115,9 @@ function renderDailyErrorsChart() {
     }
 
     // Count errors per day
-    errorsData.forEach(error => {
-        if (error.timestamp) {
-            const date = error.timestamp.split('T')[0];
-            if (dailyCounts.hasOwnProperty(date)) {
-                dailyCounts[date]++;
-            }
-        }
+    const errorDays = (aggregatesData.errors && aggregatesData.errors.daily) || errorDaysFallback;
+    Object.keys(dailyCounts).forEach(date => {
+        dailyCounts[date] = errorDays[date] ? errorDays[date].total : 0;
     });
 
     const days = Object.keys(dailyCounts).sort();
@@ -151,10 +160,12 @@ function renderUsageHeatmap() {
     if (!container) return;
 
     try {
-        // Sort services by usage (requests30d)
-        const sortedServices = servicesData
-            .filter(s => s && s.interactions)
-            .sort((a, b) => (b.interactions.requests30d || 0) - (a.interactions.requests30d || 0));
+        // Services sorted by usage (requests30d), precomputed in aggregates.json
+        const sortedServices = aggregatesData.usage
+            ? aggregatesData.usage.map(u => ({ name: u.name, interactions: u }))
+            : servicesData
+                .filter(s => s && s.interactions)
+                .sort((a, b) => (b.interactions.requests30d || 0) - (a.interactions.requests30d || 0));
 
         if (sortedServices.length === 0) {
             container.innerHTML = '<div class="no-data">No hay datos de uso disponibles</div>';
@@ -460,6 +471,18 @@ function showServiceDetails(serviceName) {
                         <span class="cost-item-label">Requests (${formatNumber(costEstimate.estimatedRequests || 0)})</span>
                         <span class="cost-item-value">$${(costEstimate.requestCost || 0).toFixed(2)}</span>
                     </div>
+                    ${costEstimate.minInstanceCost ? `
+                    <div class="cost-item">
+                        <span class="cost-item-label">Instancias minimas ociosas (${costEstimate.minInstances})</span>
+                        <span class="cost-item-value">$${costEstimate.minInstanceCost.toFixed(2)}</span>
+                    </div>
+                    ` : ''}
+                    ${costEstimate.freeTierCredit ? `
+                    <div class="cost-item">
+                        <span class="cost-item-label">Tier gratuito (parte del proyecto)</span>
+                        <span class="cost-item-value">-$${costEstimate.freeTierCredit.toFixed(2)}</span>
+                    </div>
+                    ` : ''}
                     <div class="cost-item subtotal" style="border-top: 1px solid var(--border-color); padding-top: 0.25rem; margin-top: 0.25rem;">
                         <span class="cost-item-label" style="font-weight: 500;">Subtotal Cloud Run</span>
                         <span class="cost-item-value" style="font-weight: 500;">$${(costEstimate.estimatedMonthly || 0).toFixed(2)}</span>
@@ -480,7 +503,7 @@ function showServiceDetails(serviceName) {
                     ` : ''}
                 </div>
                 <p class="cost-note" style="font-size: 0.75rem; color: var(--text-secondary); margin-top: 0.5rem;">
-                    * Estimacion basada en uso actual. ${usesDb ? 'Costo SQL dividido entre servicios que usan la DB consolidada.' : ''}${costEstimate.hasDedicatedDb ? 'Costo completo de DB dedicada.' : ''}
+                    * Estimacion basada en uso actual${costEstimate.utilization !== undefined ? ` (utilizacion de instancias ${Math.round(costEstimate.utilization * 100)}%)` : ''}. ${usesDb ? 'Costo SQL dividido entre servicios que usan la DB consolidada.' : ''}${costEstimate.hasDedicatedDb ? 'Costo completo de DB dedicada.' : ''}
                 </p>
             </div>
         </div>
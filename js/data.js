@@ -0,0 +1,94 @@
+// Sharded error data (see scripts/data_publish.py)
+//
+// data/errors/manifest.json is small and always fetched fresh. Shard file
+// names carry a content hash, so they are fetched without a cache buster
+// (the browser can reuse them) and kept in memory.
+
+let errorManifest = null;
+const errorShardCache = {};
+
+async function loadErrorManifest(force = false) {
+    if (errorManifest && !force) return errorManifest;
+    const response = await fetch(`data/errors/manifest.json?t=${Date.now()}`);
+    if (response.status === 404) {
+        // Shards not published yet (generated by the next update_data.py run)
+        errorManifest = await manifestFromErrorList();
+        return errorManifest;
+    }
+    if (!response.ok) throw new Error(`manifest.json: ${response.status}`);
+    errorManifest = await response.json();
+    return errorManifest;
+}
+
+// Same structure as publish_error_shards, built in memory from
+// data/errors.json; its "shards" are preloaded into errorShardCache.
+async function manifestFromErrorList() {
+    const response = await fetch(`data/errors.json?t=${Date.now()}`);
+    if (!response.ok) throw new Error(`errors.json: ${response.status}`);
+    const errors = await response.json();
+
+    const byDay = {};
+    const byService = {};
+    errors.forEach(error => {
+        const day = (error.timestamp || '').slice(0, 10) || 'unknown';
+        (byDay[day] = byDay[day] || []).push(error);
+        const service = error.service || 'unknown';
+        (byService[service] = byService[service] || []).push(error);
+    });
+
+    const section = (kind, groups) => Object.fromEntries(Object.entries(groups).map(([name, items]) => {
+        const file = `errors.json#${kind}/${name}`;
+        errorShardCache[file] = Promise.resolve(items);
+        return [name, { file, count: items.length, bytes: items.length }];
+    }));
+    return { total: errors.length, days: section('day', byDay), services: section('service', byService) };
+}
+
+function loadErrorShard(file) {
+    if (!errorShardCache[file]) {
+        errorShardCache[file] = fetch(`data/${file}`)
+            .then(response => {
+                if (!response.ok) throw new Error(`${file}: ${response.status}`);
+                return response.json();
+            })
+            .catch(error => {
+                delete errorShardCache[file];
+                throw error;
+            });
+    }
+    return errorShardCache[file];
+}
+
+// Manifest days (UTC, YYYY-MM-DD) within the range, widened by one day on
+// each side because the page filters use local dates.
+function manifestDaysBetween(manifest, dateFrom, dateTo) {
+    const shift = (value, days) => {
+        const date = new Date(`${value}T00:00:00Z`);
+        date.setUTCDate(date.getUTCDate() + days);
+        return date.toISOString().split('T')[0];
+    };
+    const from = dateFrom ? shift(dateFrom, -1) : null;
+    const to = dateTo ? shift(dateTo, 1) : null;
+    return Object.keys(manifest.days || {})
+        .filter(day => (!from || day >= from) && (!to || day <= to));
+}
+
+// Errors for a date range and/or service: downloads either the service
+// shard or the day shards, whichever is smaller.
+async function loadErrorsFor({ dateFrom = null, dateTo = null, service = 'all' } = {}) {
+    const manifest = await loadErrorManifest();
+    const dayEntries = manifestDaysBetween(manifest, dateFrom, dateTo)
+        .map(day => manifest.days[day]);
+    const serviceEntry = service !== 'all' ? (manifest.services || {})[service] : null;
+
+    if (service !== 'all' && !serviceEntry) return [];
+
+    let entries = dayEntries;
+    if (serviceEntry) {
+        const dayBytes = dayEntries.reduce((sum, entry) => sum + entry.bytes, 0);
+        if (serviceEntry.bytes <= dayBytes) entries = [serviceEntry];
+    }
+
+    const shards = await Promise.all(entries.map(entry => loadErrorShard(entry.file)));
+    return shards.flat();
+}
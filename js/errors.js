@@ -1,8 +1,11 @@
 // Global state
 let allErrors = [];
+let listRequestId = 0;
 let consolidatedErrors = {};
+let aggregatesData = null;
 let errorAnalyses = {};
-let filteredErrors = [];
+let listResults = { size: 0, page: async () => [] };
+let pageErrors = [];
 let currentPage = 1;
 let currentView = 'priority';
 const errorsPerPage = 20;
@@ -36,21 +39,23 @@ async function loadAllData() {
         const cacheBuster = `?t=${Date.now()}`;
 
         // Load all data in parallel
-        const [errorsRes, consolidatedRes, analysesRes, metaRes] = await Promise.all([
-            fetch('data/errors.json' + cacheBuster),
+        // Individual errors are loaded per shard when the list view needs them
+        const [manifest, consolidatedRes, analysesRes, metaRes, aggregatesRes] = await Promise.all([
+            loadErrorManifest(true),
             fetch('data/consolidated_errors.json' + cacheBuster),
             fetch('data/error_analyses.json' + cacheBuster),
-            fetch('data/meta.json' + cacheBuster)
+            fetch('data/meta.json' + cacheBuster),
+            fetch('data/aggregates.json' + cacheBuster).catch(() => null)
         ]);
 
-        allErrors = await errorsRes.json();
         consolidatedErrors = await consolidatedRes.json();
         errorAnalyses = await analysesRes.json();
         const meta = await metaRes.json();
+        aggregatesData = aggregatesRes && aggregatesRes.ok ? await aggregatesRes.json() : null;
 
         document.getElementById('lastUpdate').textContent = `Ultima actualizacion: ${formatDate(meta.lastUpdate)}`;
 
-        populateServiceFilter();
+        populateServiceFilter(manifest);
         updateSummary();
         applyFilters();
 
@@ -60,8 +65,8 @@ async function loadAllData() {
     }
 }
 
-function populateServiceFilter() {
-    const services = [...new Set(allErrors.map(e => e.service).filter(s => s))].sort();
+function populateServiceFilter(manifest) {
+    const services = Object.keys(manifest.services || {}).filter(s => s && s !== 'unknown').sort();
     const select = document.getElementById('serviceFilter');
     select.innerHTML = '<option value="all">Todos</option>';
 
@@ -76,21 +81,32 @@ function populateServiceFilter() {
 function updateSummary() {
     const totalErrors = Object.values(consolidatedErrors).reduce((sum, e) => sum + e.count, 0);
     const totalGroups = Object.keys(consolidatedErrors).length;
-    const allServices = new Set();
-    Object.values(consolidatedErrors).forEach(e => e.services.forEach(s => allServices.add(s)));
-
-    // Find service with most errors
-    const serviceCounts = {};
-    Object.values(consolidatedErrors).forEach(e => {
-        e.services.forEach(s => {
-            serviceCounts[s] = (serviceCounts[s] || 0) + e.count;
+    let affectedServices = 0;
+    let topService = null;
+
+    if (aggregatesData && aggregatesData.errors) {
+        // Per-service counts precomputed by update_data.py
+        affectedServices = Object.keys(aggregatesData.errors.byService).length;
+        const top = aggregatesData.topServices.errors[0];
+        topService = top ? [top.name, top.count] : null;
+    } else {
+        const allServices = new Set();
+        Object.values(consolidatedErrors).forEach(e => e.services.forEach(s => allServices.add(s)));
+        affectedServices = allServices.size;
+
+        // Find service with most errors
+        const serviceCounts = {};
+        Object.values(consolidatedErrors).forEach(e => {
+            e.services.forEach(s => {
+                serviceCounts[s] = (serviceCounts[s] || 0) + e.count;
+            });
         });
-    });
-    const topService = Object.entries(serviceCounts).sort((a, b) => b[1] - a[1])[0];
+        topService = Object.entries(serviceCounts).sort((a, b) => b[1] - a[1])[0];
+    }
 
     document.getElementById('totalErrors').textContent = totalErrors.toLocaleString();
     document.getElementById('totalGroups').textContent = totalGroups;
-    document.getElementById('affectedServices').textContent = allServices.size;
+    document.getElementById('affectedServices').textContent = affectedServices;
     document.getElementById('topErrorService').textContent = topService ? topService[0] : '--';
 }
 
@@ -192,9 +208,19 @@ function renderGroupedView(serviceFilter) {
     }
 }
 
+function getFamilySizes() {
+    // Cantidad de grupos por familia (errores similares con distinto hash)
+    const sizes = {};
+    Object.values(consolidatedErrors).forEach(e => {
+        if (e.family) sizes[e.family] = (sizes[e.family] || 0) + 1;
+    });
+    return sizes;
+}
+
 function renderPriorityView(container, errors) {
     // Sort by score descending
     errors.sort((a, b) => b.score - a.score);
+    const familySizes = getFamilySizes();
 
     let html = '<div class="priority-list">';
 
@@ -219,11 +245,13 @@ function renderPriorityView(container, errors) {
                     <h3 class="error-type-title">${escapeHtml(errorType)}</h3>
                     <div class="error-services">
                         ${error.services.map(s => `<span class="service-tag">${s}</span>`).join('')}
+                        ${familySizes[error.family] > 1 ? `<span class="service-tag" title="Familia ERROR-${error.family}">${familySizes[error.family]} variantes similares</span>` : ''}
                     </div>
                     <div class="error-timing">
                         <span>Primera vez: ${formatDate(error.first_seen)}</span>
                         <span>Ultima vez: ${timeAgo}</span>
                     </div>
+                    ${error.traceback?.app_frame ? `<div class="error-timing"><span>En: ${escapeHtml(error.traceback.app_frame.file)}:${error.traceback.app_frame.line} (${escapeHtml(error.traceback.app_frame.function)})</span></div>` : ''}
                     <div class="error-message-preview-small">${escapeHtml(truncateMessage(error.sample_message, 200))}</div>
                 </div>
                 <div class="priority-footer">
@@ -433,44 +461,81 @@ document.addEventListener('keydown', (e) => {
 
 // ==================== LIST VIEW FUNCTIONS ====================
 
-function applyListFilters() {
-    const serviceFilter = document.getElementById('serviceFilter').value;
-    const severityFilter = document.getElementById('severityFilter').value;
-    const dateFrom = document.getElementById('dateFrom').value;
-    const dateTo = document.getElementById('dateTo').value;
-    const searchFilter = document.getElementById('searchFilter').value.toLowerCase();
-
-    filteredErrors = allErrors.filter(error => {
-        if (serviceFilter !== 'all' && error.service !== serviceFilter) return false;
-        if (severityFilter !== 'all' && error.severity !== severityFilter) return false;
-
-        if (dateFrom) {
-            const errorDate = new Date(error.timestamp);
-            const [year, month, day] = dateFrom.split('-').map(Number);
-            const fromDate = new Date(year, month - 1, day, 0, 0, 0, 0);
-            if (errorDate < fromDate) return false;
-        }
+async function applyListFilters() {
+    const filters = {
+        service: document.getElementById('serviceFilter').value,
+        severity: document.getElementById('severityFilter').value,
+        dateFrom: document.getElementById('dateFrom').value,
+        dateTo: document.getElementById('dateTo').value,
+        text: document.getElementById('searchFilter').value
+    };
 
-        if (dateTo) {
-            const errorDate = new Date(error.timestamp);
-            const [year, month, day] = dateTo.split('-').map(Number);
-            const toDate = new Date(year, month - 1, day, 23, 59, 59, 999);
-            if (errorDate > toDate) return false;
+    const requestId = ++listRequestId;
+    let results;
+    try {
+        results = await findListErrors(filters);
+    } catch (error) {
+        console.error('Error loading errors:', error);
+        document.getElementById('errorsList').innerHTML = '<div class="loading">Error al cargar errores.</div>';
+        return;
+    }
+    if (requestId !== listRequestId) return;
+
+    listResults = results;
+    currentPage = 1;
+    renderListErrors();
+    updatePagination();
+}
+
+function localDayBounds(dateFrom, dateTo) {
+    let from = null, to = null;
+    if (dateFrom) {
+        const [year, month, day] = dateFrom.split('-').map(Number);
+        from = new Date(year, month - 1, day, 0, 0, 0, 0);
+    }
+    if (dateTo) {
+        const [year, month, day] = dateTo.split('-').map(Number);
+        to = new Date(year, month - 1, day, 23, 59, 59, 999);
+    }
+    return { from, to };
+}
+
+// Answers the filters from the search index (posting-list intersection);
+// falls back to filtering the loaded shards if the index is not available
+// or finds nothing for the text (substring matches inside a word).
+async function findListErrors({ service, severity, dateFrom, dateTo, text }) {
+    const { from, to } = localDayBounds(dateFrom, dateTo);
+
+    try {
+        const ids = await searchErrorIds({ from, to, service, severity, text });
+        if (ids.length || !text.trim()) {
+            return { size: ids.length, page: (start, end) => loadErrorsById(ids.slice(start, end)) };
         }
+    } catch (error) {
+        console.warn('Search index unavailable, filtering shards:', error);
+    }
+
+    allErrors = await loadErrorsFor({ dateFrom, dateTo, service });
+    const searchFilter = text.toLowerCase();
+    const filtered = allErrors.filter(error => {
+        if (service !== 'all' && error.service !== service) return false;
+        if (severity !== 'all' && error.severity !== severity) return false;
+
+        const errorDate = new Date(error.timestamp);
+        if (from && errorDate < from) return false;
+        if (to && errorDate > to) return false;
 
         if (searchFilter) {
             const message = (error.message || '').toLowerCase();
-            const service = (error.service || '').toLowerCase();
-            if (!message.includes(searchFilter) && !service.includes(searchFilter)) return false;
+            const serviceName = (error.service || '').toLowerCase();
+            if (!message.includes(searchFilter) && !serviceName.includes(searchFilter)) return false;
         }
 
         return true;
     });
 
-    filteredErrors.sort((a, b) => new Date(b.timestamp) - new Date(a.timestamp));
-    currentPage = 1;
-    renderListErrors();
-    updatePagination();
+    filtered.sort((a, b) => new Date(b.timestamp) - new Date(a.timestamp));
+    return { size: filtered.length, page: async (start, end) => filtered.slice(start, end) };
 }
 
 function clearFilters() {
@@ -481,13 +546,17 @@ function clearFilters() {
     applyFilters();
 }
 
-function renderListErrors() {
+async function renderListErrors() {
     const container = document.getElementById('errorsList');
     const startIndex = (currentPage - 1) * errorsPerPage;
     const endIndex = startIndex + errorsPerPage;
-    const pageErrors = filteredErrors.slice(startIndex, endIndex);
+    const results = listResults;
+    const errors = await results.page(startIndex, endIndex);
+    // A newer filter or page change already replaced the results
+    if (results !== listResults || startIndex !== (currentPage - 1) * errorsPerPage) return;
+    pageErrors = errors;
 
-    document.getElementById('resultsCount').textContent = `${filteredErrors.length} errores encontrados`;
+    document.getElementById('resultsCount').textContent = `${listResults.size} errores encontrados`;
 
     if (pageErrors.length === 0) {
         container.innerHTML = '<div class="loading">No se encontraron errores con los filtros seleccionados.</div>';
@@ -518,7 +587,7 @@ function renderListErrors() {
                         <span>${error.revision || '--'}</span>
                         ${error.httpRequest ? `<span>${error.httpRequest.method} ${truncateUrl(error.httpRequest.url)}</span>` : ''}
                     </div>
-                    <button class="view-details-btn" onclick="showErrorDetails(${startIndex + index})">Ver detalles</button>
+                    <button class="view-details-btn" onclick="showErrorDetails(${index})">Ver detalles</button>
                 </div>
             </div>
         `;
@@ -526,7 +595,7 @@ function renderListErrors() {
 }
 
 function updatePagination() {
-    const totalPages = Math.ceil(filteredErrors.length / errorsPerPage);
+    const totalPages = Math.ceil(listResults.size / errorsPerPage);
 
     document.getElementById('paginationInfo').textContent = `Pagina ${currentPage} de ${totalPages || 1}`;
     document.getElementById('prevBtn').disabled = currentPage <= 1;
@@ -581,12 +650,12 @@ function previousPage() {
 }
 
 function nextPage() {
-    const totalPages = Math.ceil(filteredErrors.length / errorsPerPage);
+    const totalPages = Math.ceil(listResults.size / errorsPerPage);
     if (currentPage < totalPages) goToPage(currentPage + 1);
 }
 
 function showErrorDetails(index) {
-    const error = filteredErrors[index];
+    const error = pageErrors[index];
     if (!error) return;
 
     document.getElementById('modalTitle').textContent = `Error en ${error.service}`;
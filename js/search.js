@@ -0,0 +1,132 @@
+// Static search index for the errors list (see scripts/search_index.py)
+//
+// Error ids run from newest to oldest in the same order as the day shards,
+// so posting lists are already sorted by time and a time range is a
+// contiguous id range. Term shards are loaded lazily (one per token prefix)
+// through loadErrorShard() from data.js.
+
+let searchManifest = null;
+
+async function loadSearchManifest(force = false) {
+    if (searchManifest && !force) return searchManifest;
+    const response = await fetch(`data/search/manifest.json?t=${Date.now()}`);
+    if (!response.ok) throw new Error(`search manifest: ${response.status}`);
+    searchManifest = await response.json();
+    return searchManifest;
+}
+
+// Same tokens as search_index.query_tokens: lowercase runs of letters/digits/_.
+// Each one is matched as a prefix of an indexed token, and the index also
+// holds the parts of compound identifiers (KeyError -> key, error).
+function tokenizeQuery(text, manifest) {
+    return (text.toLowerCase().match(/[\p{L}\p{N}_]+/gu) || [])
+        .filter(t => t.length >= manifest.minTokenLength && t.length <= manifest.maxTokenLength);
+}
+
+function shardKeyFor(token) {
+    return /^[a-z0-9]/.test(token) ? token[0] : '_';
+}
+
+function deltaDecode(encoded) {
+    const postings = new Array(encoded.length);
+    let total = 0;
+    for (let i = 0; i < encoded.length; i++) {
+        total += encoded[i];
+        postings[i] = total;
+    }
+    return postings;
+}
+
+function intersectSorted(a, b) {
+    const result = [];
+    let i = 0, j = 0;
+    while (i < a.length && j < b.length) {
+        if (a[i] === b[j]) {
+            result.push(a[i]);
+            i++;
+            j++;
+        } else if (a[i] < b[j]) {
+            i++;
+        } else {
+            j++;
+        }
+    }
+    return result;
+}
+
+// Ids [lo, hi) of the UTC hour buckets overlapping [from, to]. Local day
+// boundaries fall on whole UTC hours for whole-hour time zones.
+function idRangeFor(manifest, from, to) {
+    let lo = manifest.total, hi = 0;
+    manifest.hours.forEach(([hour, offset, count]) => {
+        const start = Date.parse(`${hour}:00:00Z`);
+        if (isNaN(start)) return;
+        if ((!to || start <= to.getTime()) && (!from || start + 3600000 > from.getTime())) {
+            lo = Math.min(lo, offset);
+            hi = Math.max(hi, offset + count);
+        }
+    });
+    return lo < hi ? [lo, hi] : [0, 0];
+}
+
+// Postings of every term that starts with the token (prefix search)
+async function prefixPostings(manifest, token) {
+    const file = manifest.terms[shardKeyFor(token)];
+    if (!file) return [];
+    const shard = await loadErrorShard(file);
+    const matches = new Set();
+    Object.keys(shard).forEach(term => {
+        if (term.startsWith(token)) deltaDecode(shard[term]).forEach(id => matches.add(id));
+    });
+    return [...matches].sort((a, b) => a - b);
+}
+
+// Matching ids, newest first. `text` also accepts service:x, severity:x and status:500.
+async function searchErrorIds({ from = null, to = null, service = 'all', severity = 'all', text = '' }) {
+    const manifest = await loadSearchManifest();
+    const fieldTerms = [];
+    if (service !== 'all') fieldTerms.push(`service:${service}`);
+    if (severity !== 'all') fieldTerms.push(`severity:${severity}`);
+    const freeText = text.replace(/\b(service|severity|status):(\S+)/gi, (_, field, value) => {
+        fieldTerms.push(`${field.toLowerCase()}:${field.toLowerCase() === 'severity' ? value.toUpperCase() : value}`);
+        return ' ';
+    });
+
+    const lists = [];
+    if (fieldTerms.length) {
+        const fields = await loadErrorShard(manifest.fields);
+        fieldTerms.forEach(term => lists.push(deltaDecode(fields[term] || [])));
+    }
+    const tokens = tokenizeQuery(freeText, manifest);
+    lists.push(...await Promise.all(tokens.map(token => prefixPostings(manifest, token))));
+
+    const [lo, hi] = idRangeFor(manifest, from, to);
+    if (!lists.length) {
+        return Array.from({ length: hi - lo }, (_, i) => lo + i);
+    }
+    lists.sort((a, b) => a.length - b.length);
+    let result = lists[0].filter(id => id >= lo && id < hi);
+    for (let i = 1; i < lists.length && result.length; i++) {
+        result = intersectSorted(result, lists[i]);
+    }
+    return result;
+}
+
+// Errors for a slice of ids: only the day shards those ids live in are loaded
+async function loadErrorsById(ids) {
+    const manifest = await loadSearchManifest();
+    const days = manifest.days;
+    const dayFor = id => {
+        let lo = 0, hi = days.length - 1;
+        while (lo < hi) {
+            const mid = (lo + hi + 1) >> 1;
+            if (days[mid].offset <= id) lo = mid; else hi = mid - 1;
+        }
+        return days[lo];
+    };
+    return Promise.all(ids.map(async id => {
+        const day = dayFor(id);
+        const shard = await loadErrorShard(day.file);
+        return shard[id - day.offset];
+    }));
+}
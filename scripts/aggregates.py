@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Agregados precalculados para los graficos del dashboard (data/aggregates.json).
+
+Los graficos solo necesitan conteos: errores por dia y por hora (por servicio
+y severidad), despliegues por dia y los servicios con mas errores, despliegues
+y requests. Se calculan una vez en update_data.py y las paginas descargan unos
+pocos KB en lugar de recorrer todos los errores individuales.
+"""
+
+import os
+from datetime import datetime, timezone, timedelta
+from typing import Optional
+
+TOP_SERVICES = int(os.environ.get('AGGREGATES_TOP_SERVICES', '10'))
+AGGREGATES_VERSION = 1
+
+
+def _bucket() -> dict:
+    return {'total': 0, 'bySeverity': {}, 'byService': {}}
+
+
+def _count(bucket: dict, service: str, severity: str, amount: int = 1):
+    bucket['total'] += amount
+    bucket['bySeverity'][severity] = bucket['bySeverity'].get(severity, 0) + amount
+    bucket['byService'][service] = bucket['byService'].get(service, 0) + amount
+
+
+def _top(counts: dict, limit: int = TOP_SERVICES) -> list:
+    ranked = sorted(((name, count) for name, count in counts.items() if count), key=lambda x: (-x[1], x[0]))
+    return [{'name': name, 'count': count} for name, count in ranked[:limit]]
+
+
+def error_aggregates(errors: list) -> dict:
+    """Conteos de errores totales, por dia (UTC) y por hora (UTC)."""
+    totals = _bucket()
+    daily = {}
+    hourly = {}
+    for error in errors:
+        timestamp = error.get('timestamp') or ''
+        service = error.get('service') or 'unknown'
+        severity = error.get('severity') or 'ERROR'
+        _count(totals, service, severity)
+        if len(timestamp) >= 13:
+            # 'YYYY-MM-DD' y 'YYYY-MM-DDTHH' (los timestamps de Cloud Logging vienen en UTC)
+            day, hour = timestamp[:10], timestamp[:13]
+            _count(daily.setdefault(day, _bucket()), service, severity)
+            _count(hourly.setdefault(hour, _bucket()), service, severity)
+    return {
+        **totals,
+        'daily': dict(sorted(daily.items())),
+        'hourly': dict(sorted(hourly.items()))
+    }
+
+
+def deployment_aggregates(services: list) -> dict:
+    """Despliegues por dia y por servicio a partir de services.json."""
+    daily = {}
+    by_service = {}
+    for service in services:
+        deployments = service.get('deployments') or {}
+        by_service[service['name']] = {
+            'last24h': deployments.get('last24h', 0),
+            'last7d': deployments.get('last7d', 0)
+        }
+        for day, count in (deployments.get('byDay') or {}).items():
+            daily[day] = daily.get(day, 0) + count
+    return {
+        'last24h': sum(s['last24h'] for s in by_service.values()),
+        'last7d': sum(s['last7d'] for s in by_service.values()),
+        'daily': dict(sorted(daily.items())),
+        'byService': by_service
+    }
+
+
+def usage_ranking(services: list) -> list:
+    """Servicios ordenados por requests de 30 dias (mapa de calor de uso)."""
+    usage = [{
+        'name': s['name'],
+        'requests7d': (s.get('interactions') or {}).get('requests7d', 0) or 0,
+        'requests30d': (s.get('interactions') or {}).get('requests30d', 0) or 0
+    } for s in services if s.get('interactions')]
+    return sorted(usage, key=lambda u: (-u['requests30d'], u['name']))
+
+
+def build_aggregates(errors: list, services: list, now: Optional[datetime] = None) -> dict:
+    now = now or datetime.now(timezone.utc)
+    error_counts = error_aggregates(errors)
+    deployments = deployment_aggregates(services)
+    usage = usage_ranking(services)
+    return {
+        'version': AGGREGATES_VERSION,
+        'generatedAt': now.isoformat(),
+        'window': {
+            'from': (now - timedelta(days=7)).strftime('%Y-%m-%d'),
+            'to': now.strftime('%Y-%m-%d')
+        },
+        'errors': error_counts,
+        'deployments': deployments,
+        'usage': usage,
+        'topServices': {
+            'errors': _top(error_counts['byService']),
+            'deployments': _top({name: d['last7d'] for name, d in deployments['byService'].items()}),
+            'requests': [{'name': u['name'], 'count': u['requests30d']} for u in usage[:TOP_SERVICES] if u['requests30d']]
+        }
+    }
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Cache persistente de analisis de errores (data/analysis_cache.json).
+
+Cada entrada se guarda por hash de grupo junto con un digest de las entradas
+del prompt que definen el error (servicios, tipo, mensaje de muestra, HTTP).
+Los campos que cambian en cada ejecucion (conteo, fechas) no forman parte del
+digest; en su lugar, un analisis guardado se reutiliza salvo que el grupo
+haya cambiado de forma relevante:
+- el digest es distinto (otro mensaje de muestra, otros servicios)
+- el conteo cruzo un orden de magnitud (p. ej. de 9 a 10, de 99 a 100)
+- aparecio una revision que no existia al analizar
+- el analisis tiene mas de ANALYSIS_CACHE_TTL_DAYS dias
+
+El tamano se acota a ANALYSIS_CACHE_MAX_ENTRIES (se descartan las entradas
+usadas hace mas tiempo).
+"""
+
+import hashlib
+import json
+import math
+import os
+import threading
+from datetime import datetime, timezone, timedelta
+from typing import Optional
+
+CACHE_TTL_DAYS = int(os.environ.get('ANALYSIS_CACHE_TTL_DAYS', '14'))
+CACHE_MAX_ENTRIES = int(os.environ.get('ANALYSIS_CACHE_MAX_ENTRIES', '500'))
+
+# Tokens de salida estimados por analisis (max_tokens de la llamada)
+OUTPUT_TOKENS_ESTIMATE = 1000
+
+
+def analysis_digest(error_data: dict) -> str:
+    """Digest de las entradas estables del prompt."""
+    http = error_data.get('sample_http') or {}
+    key = json.dumps({
+        'services': sorted(error_data.get('services', [])),
+        'error_type': error_data.get('error_type', ''),
+        'message': (error_data.get('sample_message') or '')[:2000],
+        'http': [http.get('method'), http.get('status')] if isinstance(http, dict) else str(http)
+    }, sort_keys=True)
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def _magnitude(count: int) -> int:
+    return int(math.log10(count)) if count > 0 else -1
+
+
+class AnalysisCache:
+    """Analisis guardados por grupo con reglas de invalidacion y estadisticas."""
+
+    def __init__(self, path: str, ttl_days: int = CACHE_TTL_DAYS, max_entries: int = CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = timedelta(days=ttl_days)
+        self.max_entries = max_entries
+        self.entries = {}
+        self.hits = 0
+        self.misses = {}
+        self.tokens_saved = 0
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.entries = json.load(f).get('entries', {})
+            except (OSError, json.JSONDecodeError, AttributeError) as e:
+                print(f"  Cache de analisis ilegible, se reinicia: {e}")
+
+    def _miss_reason(self, entry: Optional[dict], error_data: dict, now: datetime) -> Optional[str]:
+        if entry is None:
+            return 'nuevo'
+        if entry.get('digest') != analysis_digest(error_data):
+            return 'mensaje'
+        analyzed_at = datetime.fromisoformat(entry['analyzed_at'])
+        if now - analyzed_at > self.ttl:
+            return 'ttl'
+        if _magnitude(error_data.get('count', 0)) > _magnitude(entry.get('count', 0)):
+            return 'conteo'
+        if set(error_data.get('revisions', [])) - set(entry.get('revisions', [])):
+            return 'revision'
+        return None
+
+    def lookup(self, error_hash: str, error_data: dict, prompt: str = '',
+               now: Optional[datetime] = None) -> Optional[dict]:
+        """Retorna el analisis guardado si sigue vigente (y cuenta hit/miss)."""
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            entry = self.entries.get(error_hash)
+            reason = self._miss_reason(entry, error_data, now)
+            if reason:
+                self.misses[reason] = self.misses.get(reason, 0) + 1
+                return None
+            self.hits += 1
+            self.tokens_saved += len(prompt) // 4 + OUTPUT_TOKENS_ESTIMATE
+            entry['last_used'] = now.isoformat()
+            return {'analysis': entry['analysis'], 'analyzed_at': entry['analyzed_at'], 'cached': True}
+
+    def store(self, error_hash: str, error_data: dict, result: dict, now: Optional[datetime] = None):
+        """Guarda un analisis exitoso."""
+        if not result.get('analysis'):
+            return
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            self.entries[error_hash] = {
+                'digest': analysis_digest(error_data),
+                'count': error_data.get('count', 0),
+                'revisions': sorted(error_data.get('revisions', [])),
+                'analysis': result['analysis'],
+                'analyzed_at': result.get('analyzed_at') or now.isoformat(),
+                'last_used': now.isoformat()
+            }
+
+    def evict(self, now: Optional[datetime] = None):
+        """Descarta entradas vencidas y, si sobran, las usadas hace mas tiempo."""
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            for key in [k for k, e in self.entries.items()
+                        if now - datetime.fromisoformat(e['analyzed_at']) > self.ttl]:
+                del self.entries[key]
+            if len(self.entries) > self.max_entries:
+                by_use = sorted(self.entries, key=lambda k: self.entries[k].get('last_used', ''))
+                for key in by_use[:len(self.entries) - self.max_entries]:
+                    del self.entries[key]
+
+    def stats(self) -> dict:
+        misses = sum(self.misses.values())
+        total = self.hits + misses
+        return {
+            'hits': self.hits,
+            'misses': misses,
+            'missReasons': dict(self.misses),
+            'hitRate': round(self.hits / total, 3) if total else None,
+            'estimatedTokensSaved': self.tokens_saved,
+            'entries': len(self.entries)
+        }
+
+    def save(self, now: Optional[datetime] = None):
+        self.evict(now)
+        with self._lock:
+            data = {'entries': self.entries}
+        data['lastRun'] = self.stats()
+        with open(self.path, 'w') as f:
+            json.dump(data, f, indent=2)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Pipeline concurrente para las llamadas a la API de Claude.
+
+- Concurrencia acotada (pool de hilos)
+- Limite de tasa con token bucket (requests por minuto)
+- Reintentos con backoff exponencial y jitter ante 429, 5xx y errores de
+  conexion, respetando el header retry-after si viene en la respuesta
+- FakeClient: cliente local con la misma interfaz que anthropic.Anthropic
+  (client.messages.create) para pruebas y benchmarks sin red
+"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+MAX_CONCURRENCY = int(os.environ.get('CLAUDE_MAX_CONCURRENCY', '4'))
+REQUESTS_PER_MINUTE = float(os.environ.get('CLAUDE_REQUESTS_PER_MINUTE', '50'))
+MAX_RETRIES = int(os.environ.get('CLAUDE_MAX_RETRIES', '4'))
+
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+
+class TokenBucket:
+    """Token bucket thread-safe: `rate` tokens por segundo, hasta `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Espera hasta que haya un token disponible y lo consume."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            self._sleep(wait)
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: float) -> 'TokenBucket':
+        # Capacidad baja: evita una rafaga inicial de todo el minuto
+        return cls(requests_per_minute / 60.0, capacity=min(MAX_CONCURRENCY, requests_per_minute))
+
+
+def status_code_of(error: Exception) -> Optional[int]:
+    """Codigo HTTP de un error de la API (anthropic.APIStatusError o FakeAPIError)."""
+    status = getattr(error, 'status_code', None)
+    if status is None and getattr(error, 'response', None) is not None:
+        status = getattr(error.response, 'status_code', None)
+    return status
+
+
+def is_retryable(error: Exception) -> bool:
+    status = status_code_of(error)
+    if status is None:
+        # Errores de conexion/timeout (sin respuesta HTTP)
+        return type(error).__name__ in ('APIConnectionError', 'APITimeoutError', 'ConnectionError', 'TimeoutError')
+    return status == 429 or status >= 500
+
+
+def retry_delay(error: Exception, attempt: int) -> float:
+    """Espera antes del reintento `attempt` (desde 1): retry-after o backoff con jitter."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    retry_after = headers.get('retry-after') if hasattr(headers, 'get') else None
+    if retry_after:
+        try:
+            return min(float(retry_after), RETRY_MAX_DELAY)
+        except ValueError:
+            pass
+    delay = min(RETRY_BASE_DELAY * 2 ** (attempt - 1), RETRY_MAX_DELAY)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def call_with_retry(func: Callable[[], object], bucket: Optional[TokenBucket] = None,
+                    max_retries: int = MAX_RETRIES, sleep: Callable[[float], None] = time.sleep):
+    """Ejecuta func respetando el limite de tasa y reintentando errores transitorios."""
+    attempt = 0
+    while True:
+        if bucket:
+            bucket.acquire()
+        try:
+            return func()
+        except Exception as e:
+            attempt += 1
+            if attempt > max_retries or not is_retryable(e):
+                raise
+            delay = retry_delay(e, attempt)
+            print(f"  Reintento {attempt}/{max_retries} en {delay:.1f}s ({status_code_of(e) or type(e).__name__})")
+            sleep(delay)
+
+
+def run_concurrent(jobs: dict, worker: Callable[[str, object], object],
+                   max_concurrency: int = MAX_CONCURRENCY) -> dict:
+    """
+    Ejecuta worker(clave, valor) para cada job con concurrencia acotada.
+    Retorna {clave: resultado} en el orden de jobs.
+    """
+    if not jobs:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(jobs)))) as executor:
+        futures = {key: executor.submit(worker, key, value) for key, value in jobs.items()}
+        return {key: future.result() for key, future in futures.items()}
+
+
+# ---------------------------------------------------------------------------
+# Cliente falso
+# ---------------------------------------------------------------------------
+
+class FakeAPIError(Exception):
+    """Error HTTP simulado con la forma de anthropic.APIStatusError."""
+
+    def __init__(self, status_code: int, retry_after: Optional[float] = None):
+        super().__init__(f"Fake API error {status_code}")
+        self.status_code = status_code
+        headers = {'retry-after': str(retry_after)} if retry_after is not None else {}
+        self.response = type('FakeResponse', (), {'status_code': status_code, 'headers': headers})()
+
+
+class _FakeText:
+    def __init__(self, text: str):
+        self.type = 'text'
+        self.text = text
+
+
+class _FakeMessage:
+    def __init__(self, text: str, input_tokens: int, output_tokens: int):
+        self.content = [_FakeText(text)]
+        self.usage = type('Usage', (), {'input_tokens': input_tokens, 'output_tokens': output_tokens})()
+
+
+class FakeClient:
+    """
+    Cliente local compatible con client.messages.create.
+
+    latency: segundos por llamada; failures: lista de codigos HTTP que se
+    devuelven (en orden) antes de responder bien; responder(prompt) genera el texto.
+    """
+
+    def __init__(self, latency: float = 0.0, failures: Optional[list] = None,
+                 responder: Optional[Callable[[str], str]] = None):
+        self.latency = latency
+        self.failures = list(failures or [])
+        self.responder = responder or (lambda prompt: f"**Resumen**: analisis simulado ({len(prompt)} caracteres)")
+        self.calls = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.messages = self
+
+    def create(self, model: str, max_tokens: int, messages: list, **kwargs):
+        with self._lock:
+            self.calls += 1
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+            failure = self.failures.pop(0) if self.failures else None
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            if failure:
+                raise FakeAPIError(failure)
+            prompt = messages[-1]['content']
+            return _FakeMessage(self.responder(prompt), len(prompt) // 4, max_tokens // 2)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark del pipeline de analisis con un cliente falso (sin red ni API key).
+
+Simula la latencia de la API y errores 429/5xx transitorios, y compara el
+tiempo de analyze_with_claude con concurrencia 1 (como antes) y con la
+concurrencia configurada.
+
+Uso:
+    python scripts/bench_analysis.py [grupos] [latencia_s] [concurrencia]
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import analysis_pipeline
+from analysis_pipeline import FakeClient, TokenBucket
+import consolidate_errors
+from consolidate_errors import analyze_with_claude
+
+
+def main():
+    groups = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+    with open(os.path.join(data_dir, 'consolidated_errors.json'), 'r') as f:
+        consolidated = json.load(f)
+    significant = {k: v for k, v in consolidated.items()
+                   if v['count'] >= consolidate_errors.MIN_OCCURRENCES_FOR_ISSUE}
+    consolidate_errors.MAX_ANALYSES_PER_RUN = groups
+    # Backoff corto para que los reintentos no dominen el benchmark
+    analysis_pipeline.RETRY_BASE_DELAY = 0.05
+
+    print(f"Grupos: {min(groups, len(significant))}, latencia simulada: {latency}s")
+    print(f"\n{'Concurrencia':>12}{'Tiempo (s)':>12}{'Llamadas':>10}{'Max en vuelo':>14}{'Fallidos':>10}")
+    for workers in (1, concurrency):
+        client = FakeClient(latency=latency, failures=[429, 503, 429])
+        bucket = TokenBucket(rate=1000, capacity=workers)
+        start = time.perf_counter()
+        analyses = analyze_with_claude(significant, api_key='', client=client,
+                                       max_concurrency=workers, bucket=bucket)
+        elapsed = time.perf_counter() - start
+        failed = sum(1 for a in analyses.values() if not a.get('analysis'))
+        print(f"{workers:>12}{elapsed:>12.2f}{client.calls:>10}{client.max_in_flight:>14}{failed:>10}")
+
+
+if __name__ == '__main__':
+    main()
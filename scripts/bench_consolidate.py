@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark de consolidacion serial vs paralela.
+
+Replica los errores de data/errors.json hasta distintos tamanos (variando IDs
+y timestamps para que el cache del normalizador no oculte el costo real),
+mide la consolidacion serial y la paralela (consolidate_errors_parallel,
+sin el umbral PARALLEL_MIN_ERRORS) y verifica que ambas produzcan
+exactamente el mismo resultado. Con menos de 2 workers solo se mide la
+serial: las columnas del modo paralelo quedan en N/A.
+
+Uso:
+    python scripts/bench_consolidate.py [workers] [tamano ...]
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from consolidate_errors import build_partial_groups, consolidate_errors_parallel, finalize_groups
+from error_normalizer import default_normalizer
+
+
+def replicate(errors: list, size: int) -> list:
+    """Copias de los errores con IDs y timestamps distintos en cada vuelta."""
+    result = []
+    i = 0
+    while len(result) < size:
+        for error in errors:
+            if len(result) >= size:
+                break
+            copy = dict(error)
+            copy['message'] = f"{error.get('message', '')} request {1000000000 + i}"
+            copy['timestamp'] = f"2026-01-{1 + i % 28:02d}T{i % 24:02d}:00:00.{i:06d}Z"
+            result.append(copy)
+            i += 1
+    return result
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    sizes = [int(s) for s in sys.argv[2:]] or [10000, 50000, 200000]
+    data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+    with open(os.path.join(data_dir, 'errors.json'), 'r') as f:
+        errors = json.load(f)
+
+    print(f"Workers: {workers}")
+    if workers < 2:
+        print("Con menos de 2 workers no hay modo paralelo que medir (indicar workers >= 2)")
+    print(f"\n{'Errores':>10}{'Serial (s)':>12}{'Paralelo (s)':>14}{'Speedup':>10}{'Igual':>8}")
+    for size in sizes:
+        batch = replicate(errors, size)
+
+        # Cada medicion parte con el cache del normalizador vacio (los procesos
+        # del modo paralelo heredarian el que deja la serial)
+        default_normalizer.cache_clear()
+        start = time.perf_counter()
+        serial = finalize_groups(build_partial_groups(batch))
+        serial_time = time.perf_counter() - start
+
+        if workers < 2:
+            print(f"{size:>10}{serial_time:>12.2f}{'N/A':>14}{'N/A':>10}{'N/A':>8}")
+            continue
+
+        default_normalizer.cache_clear()
+        start = time.perf_counter()
+        parallel = consolidate_errors_parallel(batch, workers=workers)
+        parallel_time = time.perf_counter() - start
+
+        same = json.dumps(serial) == json.dumps(parallel)
+        print(f"{size:>10}{serial_time:>12.2f}{parallel_time:>14.2f}"
+              f"{serial_time / parallel_time:>9.1f}x{'si' if same else 'NO':>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark de normalizacion de mensajes de error.
+
+Compara la version original de normalize_error_message (seis re.sub +
+split/join) con el motor de una sola pasada de error_normalizer, sobre los
+mensajes de data/errors.json. Verifica ademas que ambas produzcan el mismo
+resultado para cada mensaje (los hashes de los grupos no cambian).
+
+Uso:
+    python scripts/bench_normalize.py [repeticiones]
+"""
+
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from error_normalizer import ErrorNormalizer
+
+
+def normalize_error_message_legacy(message: str) -> str:
+    """Version original (referencia)."""
+    if not message:
+        return ""
+    normalized = re.sub(r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}', '[TIMESTAMP]', message)
+    normalized = re.sub(r'\b\d{10,}\b', '[ID]', normalized)
+    normalized = re.sub(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', '[UUID]', normalized, flags=re.IGNORECASE)
+    normalized = re.sub(r'/\d+/', '/[ID]/', normalized)
+    normalized = re.sub(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}', '[IP]', normalized)
+    normalized = re.sub(r'0x[0-9a-fA-F]+', '[HEX]', normalized)
+    normalized = ' '.join(normalized.split())
+    return normalized
+
+
+def timed(func, messages, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for message in messages:
+            func(message)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+    with open(os.path.join(data_dir, 'errors.json'), 'r') as f:
+        messages = [e.get('message', '') for e in json.load(f)]
+
+    total_chars = sum(len(m) for m in messages)
+    print(f"Mensajes: {len(messages)} ({total_chars / 1024:.0f} KiB, {len(set(messages))} distintos)")
+
+    # Verificar equivalencia
+    engine = ErrorNormalizer(cache_size=0)
+    mismatches = sum(1 for m in messages if engine.normalize(m) != normalize_error_message_legacy(m))
+    print(f"Diferencias con la version original: {mismatches}")
+    print(f"Mensajes resueltos con la pasada secuencial: {engine.fallbacks}")
+
+    legacy_time = timed(normalize_error_message_legacy, messages, repeat)
+    engine_time = timed(engine.normalize, messages, repeat)
+
+    # Con cache: primera pasada en frio, el resto reutiliza resultados
+    def cached_run(batch):
+        cached = ErrorNormalizer()
+        for message in batch:
+            cached.normalize(message)
+    cached_time = timed(lambda batch: cached_run(batch), [messages], repeat)
+
+    print(f"\n{'Version':<28}{'Tiempo (ms)':>12}{'Speedup':>10}")
+    for name, elapsed in (('original (6 re.sub)', legacy_time),
+                          ('pasada unica', engine_time),
+                          ('pasada unica + cache', cached_time)):
+        print(f"{name:<28}{elapsed * 1000:>12.1f}{legacy_time / elapsed:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
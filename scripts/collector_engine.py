@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Motor de colectores concurrentes para update_data.py.
+
+Ejecuta en paralelo las consultas independientes (gcloud, gh, BigQuery) con:
+- Un limite de workers simultaneos
+- Un timeout por colector
+- Un presupuesto de tiempo para toda la ejecucion
+
+Un colector lento o con error solo degrada su propia seccion: el resultado
+se reemplaza por su valor por defecto y el estado queda registrado.
+"""
+
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+# Configuracion (sobrescribible por variables de entorno)
+DEFAULT_MAX_WORKERS = int(os.environ.get('COLLECTOR_MAX_WORKERS', '6'))
+DEFAULT_COLLECTOR_TIMEOUT = float(os.environ.get('COLLECTOR_TIMEOUT', '320'))
+DEFAULT_RUN_BUDGET = float(os.environ.get('COLLECTOR_RUN_BUDGET', '900'))
+
+
+@dataclass
+class Collector:
+    """Una consulta independiente que aporta una seccion de los datos."""
+    name: str
+    func: Callable[[], Any]
+    default: Callable[[], Any] = dict
+    timeout: Optional[float] = None
+
+
+@dataclass
+class CollectorResult:
+    """Resultado y estado de ejecucion de un colector."""
+    name: str
+    status: str = 'pending'  # ok | error | timeout | skipped
+    value: Any = None
+    duration: float = 0.0
+    error: Optional[str] = None
+    started_at: Optional[float] = field(default=None, repr=False)
+
+    def to_meta(self) -> dict:
+        meta = {'status': self.status, 'durationSec': round(self.duration, 2)}
+        if self.error:
+            meta['error'] = self.error
+        return meta
+
+
+def run_collectors(collectors: list, max_workers: Optional[int] = None,
+                   run_budget: Optional[float] = None) -> dict:
+    """
+    Ejecuta los colectores en paralelo y retorna {nombre: CollectorResult}.
+
+    Los workers son hilos daemon: un colector que excede su timeout se
+    abandona (su resultado se descarta) y se lanza un worker de reemplazo,
+    de modo que no bloquea al resto ni la salida del proceso.
+    """
+    max_workers = max(1, max_workers or DEFAULT_MAX_WORKERS)
+    run_budget = run_budget if run_budget is not None else DEFAULT_RUN_BUDGET
+
+    by_name = {c.name: c for c in collectors}
+    results = {c.name: CollectorResult(name=c.name) for c in collectors}
+    pending = queue.Queue()
+    for c in collectors:
+        pending.put(c)
+    finished = queue.Queue()
+    abandoned = set()
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            try:
+                collector = pending.get_nowait()
+            except queue.Empty:
+                return
+            with lock:
+                results[collector.name].started_at = time.monotonic()
+            try:
+                value = collector.func()
+                finished.put((collector.name, 'ok', value, None))
+            except Exception as e:
+                finished.put((collector.name, 'error', None, f"{type(e).__name__}: {e}"))
+            with lock:
+                if collector.name in abandoned:
+                    # Otro worker ya ocupa este cupo
+                    return
+
+    def start_worker():
+        threading.Thread(target=worker, daemon=True).start()
+
+    for _ in range(min(max_workers, len(collectors))):
+        start_worker()
+
+    run_start = time.monotonic()
+    deadline = run_start + run_budget
+    remaining = set(by_name)
+
+    while remaining:
+        now = time.monotonic()
+
+        # Marcar colectores que excedieron su timeout
+        with lock:
+            for name in list(remaining):
+                result = results[name]
+                timeout = by_name[name].timeout or DEFAULT_COLLECTOR_TIMEOUT
+                if result.started_at is not None and now - result.started_at > timeout:
+                    result.status = 'timeout'
+                    result.duration = now - result.started_at
+                    result.error = f"excedio {timeout:.0f}s"
+                    abandoned.add(name)
+                    remaining.discard(name)
+                    start_worker()
+
+        if not remaining:
+            break
+
+        if now >= deadline:
+            # Presupuesto agotado: lo que sigue corriendo o en cola se degrada
+            with lock:
+                for name in remaining:
+                    result = results[name]
+                    abandoned.add(name)
+                    if result.started_at is not None:
+                        result.status = 'timeout'
+                        result.duration = now - result.started_at
+                        result.error = f"presupuesto de {run_budget:.0f}s agotado"
+                    else:
+                        result.status = 'skipped'
+                        result.error = 'presupuesto agotado antes de iniciar'
+            while True:
+                try:
+                    pending.get_nowait()
+                except queue.Empty:
+                    break
+            break
+
+        try:
+            name, status, value, error = finished.get(timeout=min(0.5, deadline - now))
+        except queue.Empty:
+            continue
+
+        if name not in remaining:
+            continue  # Resultado tardio de un colector abandonado
+        result = results[name]
+        result.status = status
+        result.value = value
+        result.error = error
+        result.duration = time.monotonic() - (result.started_at or run_start)
+        remaining.discard(name)
+
+    # Valores por defecto para secciones degradadas
+    for name, result in results.items():
+        if result.status != 'ok':
+            result.value = by_name[name].default()
+
+    return results
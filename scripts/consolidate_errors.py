@@ -11,12 +11,24 @@ Funcionalidades:
 import json
 import os
 import re
-import hashlib
-import subprocess
 from datetime import datetime, timezone, timedelta
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional
 
+from analysis_pipeline import (MAX_CONCURRENCY as CLAUDE_MAX_CONCURRENCY,
+                               REQUESTS_PER_MINUTE as CLAUDE_REQUESTS_PER_MINUTE,
+                               TokenBucket, call_with_retry, run_concurrent)
+from analysis_cache import AnalysisCache
+from consolidation_state import ConsolidationState
+from error_clustering import build_families, cluster_groups
+from error_normalizer import default_normalizer, get_error_hash
+from error_warehouse import ERROR_STORE, ErrorWarehouse, warehouse_path
+from github_client import GitHubClient
+from issue_index import IssueIndex
+from issue_sync import apply_sync, load_records, plan_sync, seed_records, update_record
+from traceback_parser import build_frame_index, exception_name, parse_traceback
+
 # Intentar importar anthropic
 try:
     import anthropic
@@ -28,44 +40,22 @@ except ImportError:
 # Configuracion
 GITHUB_REPO = "mbrt26/indunnova-dashboard"
 MIN_OCCURRENCES_FOR_ISSUE = 3  # Minimo de ocurrencias para crear issue
+MAX_OCCURRENCES = 5  # Ocurrencias mas recientes guardadas por grupo
 MAX_ISSUES_PER_RUN = 10  # Maximo de issues a crear por ejecucion
+MAX_ANALYSES_PER_RUN = int(os.environ.get('MAX_ANALYSES_PER_RUN', str(MAX_ISSUES_PER_RUN)))
 
+# Consolidacion en paralelo (0 o 1 = serial)
+CONSOLIDATE_WORKERS = int(os.environ.get('CONSOLIDATE_WORKERS', str(os.cpu_count() or 1)))
+PARALLEL_MIN_ERRORS = 20000  # Debajo de esto el costo de los procesos no compensa
 
-def normalize_error_message(message: str) -> str:
-    """Normaliza un mensaje de error para comparacion."""
-    if not message:
-        return ""
-
-    # Remover timestamps
-    normalized = re.sub(r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}', '[TIMESTAMP]', message)
-
-    # Remover IDs numericos largos
-    normalized = re.sub(r'\b\d{10,}\b', '[ID]', normalized)
-
-    # Remover UUIDs
-    normalized = re.sub(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', '[UUID]', normalized, flags=re.IGNORECASE)
-
-    # Remover paths con IDs
-    normalized = re.sub(r'/\d+/', '/[ID]/', normalized)
-
-    # Remover direcciones IP
-    normalized = re.sub(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}', '[IP]', normalized)
-
-    # Remover hex addresses
-    normalized = re.sub(r'0x[0-9a-fA-F]+', '[HEX]', normalized)
-
-    # Normalizar espacios
-    normalized = ' '.join(normalized.split())
+# 'full': reconstruir desde errors.json; 'incremental': aplicar solo errores nuevos
+# (con ERROR_STORE=sqlite los grupos salen de la base, ver error_warehouse)
+CONSOLIDATE_MODE = os.environ.get('CONSOLIDATE_MODE', 'full')
 
-    return normalized
 
-
-def get_error_hash(service: str, message: str) -> str:
-    """Genera un hash unico para un tipo de error."""
-    normalized = normalize_error_message(message)
-    # Tomar las primeras 500 caracteres del mensaje normalizado
-    key = f"{service}:{normalized[:500]}"
-    return hashlib.md5(key.encode()).hexdigest()[:12]
+def normalize_error_message(message: str, service: Optional[str] = None) -> str:
+    """Normaliza un mensaje de error para comparacion (ver error_normalizer)."""
+    return default_normalizer.normalize(message, service)
 
 
 def extract_error_type(message: str) -> str:
@@ -73,6 +63,11 @@ def extract_error_type(message: str) -> str:
     if not message:
         return "Unknown Error"
 
+    # Tracebacks: la excepcion final, sin buscar en todo el mensaje
+    name = exception_name(parse_traceback(message))
+    if name:
+        return name
+
     # Patrones comunes de Python
     patterns = [
         r'(\w+Error):\s',
@@ -92,9 +87,8 @@ def extract_error_type(message: str) -> str:
     return first_line if first_line else "Unknown Error"
 
 
-def consolidate_errors(errors: list) -> dict:
-    """Agrupa errores similares."""
-    groups = defaultdict(lambda: {
+def _new_partial_group() -> dict:
+    return {
         'count': 0,
         'services': set(),
         'first_seen': None,
@@ -103,10 +97,22 @@ def consolidate_errors(errors: list) -> dict:
         'sample_http': None,
         'occurrences': [],
         'error_type': '',
-        'revisions': set()
-    })
+        'revisions': set(),
+        # Posiciones en la lista original: permiten fusionar grupos parciales
+        # de distintos bloques con el mismo resultado que el recorrido serial
+        'first_index': None,
+        'sample_index': None,
+    }
+
 
-    for error in errors:
+def build_partial_groups(errors: list, offset: int = 0) -> dict:
+    """
+    Agrupa un bloque de errores (que empieza en la posicion `offset` de la
+    lista completa) en grupos parciales fusionables con merge_partial_groups.
+    """
+    groups = defaultdict(_new_partial_group)
+
+    for index, error in enumerate(errors, start=offset):
         service = error.get('service', 'unknown')
         message = error.get('message', '')
         timestamp = error.get('timestamp', '')
@@ -114,6 +120,9 @@ def consolidate_errors(errors: list) -> dict:
         error_hash = get_error_hash(service, message)
         group = groups[error_hash]
 
+        if group['first_index'] is None:
+            group['first_index'] = index
+
         group['count'] += 1
         group['services'].add(service)
 
@@ -127,54 +136,230 @@ def consolidate_errors(errors: list) -> dict:
             if not group['last_seen'] or timestamp > group['last_seen']:
                 group['last_seen'] = timestamp
 
-        # Guardar muestra
+        # Guardar muestra (la primera con mensaje; si ninguno tiene, la ultima)
         if not group['sample_message']:
             group['sample_message'] = message
             group['sample_http'] = error.get('httpRequest')
             group['error_type'] = extract_error_type(message)
+            group['sample_index'] = index
+
+        # Guardar las ocurrencias mas recientes para contexto
+        # (la lista queda de la mas nueva a la mas antigua)
+        occurrences = group['occurrences']
+        if len(occurrences) < MAX_OCCURRENCES or timestamp > (occurrences[-1][1]['timestamp'] or ''):
+            group['occurrences'] = _most_recent(occurrences + [(index, _occurrence(error))])
+
+    return dict(groups)
+
+
+def _most_recent(occurrences: list, limit: int = MAX_OCCURRENCES) -> list:
+    """
+    Las `limit` ocurrencias (posicion, datos) mas recientes por timestamp,
+    de la mas nueva a la mas antigua; a igual timestamp, la de menor posicion.
+    No depende del orden de los lotes (modo incremental, shards paralelos).
+    """
+    ordered = sorted(occurrences, key=lambda o: o[0])
+    ordered.sort(key=lambda o: o[1].get('timestamp') or '', reverse=True)
+    return ordered[:limit]
+
+
+def _occurrence(error: dict) -> dict:
+    return {
+        'timestamp': error.get('timestamp', ''),
+        'service': error.get('service', 'unknown'),
+        'revision': error.get('revision', ''),
+        'http_status': error.get('httpRequest', {}).get('status') if error.get('httpRequest') else None
+    }
+
 
-        # Guardar algunas ocurrencias para contexto
-        if len(group['occurrences']) < 5:
-            group['occurrences'].append({
-                'timestamp': timestamp,
-                'service': service,
-                'revision': error.get('revision', ''),
-                'http_status': error.get('httpRequest', {}).get('status') if error.get('httpRequest') else None
-            })
+def _merge_group(a: dict, b: dict) -> dict:
+    """Fusiona dos grupos parciales del mismo hash (asociativo y conmutativo)."""
+    first_seen = [t for t in (a['first_seen'], b['first_seen']) if t]
+    last_seen = [t for t in (a['last_seen'], b['last_seen']) if t]
 
-    # Convertir sets a listas para JSON
+    # Muestra: la de menor posicion con mensaje; si ninguna tiene, la ultima
+    if a['sample_message'] and b['sample_message']:
+        sample = a if a['sample_index'] < b['sample_index'] else b
+    elif a['sample_message'] or b['sample_message']:
+        sample = a if a['sample_message'] else b
+    else:
+        sample = a if a['sample_index'] > b['sample_index'] else b
+
+    return {
+        'count': a['count'] + b['count'],
+        'services': a['services'] | b['services'],
+        'first_seen': min(first_seen) if first_seen else None,
+        'last_seen': max(last_seen) if last_seen else None,
+        'sample_message': sample['sample_message'],
+        'sample_http': sample['sample_http'],
+        'occurrences': _most_recent(a['occurrences'] + b['occurrences']),
+        'error_type': sample['error_type'],
+        'revisions': a['revisions'] | b['revisions'],
+        'first_index': min(a['first_index'], b['first_index']),
+        'sample_index': sample['sample_index'],
+    }
+
+
+def merge_partial_groups(a: dict, b: dict) -> dict:
+    """Fusiona dos resultados de build_partial_groups."""
+    merged = dict(a)
+    for error_hash, group in b.items():
+        merged[error_hash] = _merge_group(merged[error_hash], group) if error_hash in merged else group
+    return merged
+
+
+def finalize_groups(partial: dict) -> dict:
+    """Convierte grupos parciales al formato de consolidated_errors.json."""
     result = {}
-    for hash_id, group in groups.items():
+    # Mismo orden que el recorrido serial: por primera aparicion
+    for hash_id, group in sorted(partial.items(), key=lambda item: item[1]['first_index']):
         result[hash_id] = {
-            **group,
-            'services': list(group['services']),
-            'revisions': list(group['revisions'])
+            'count': group['count'],
+            'services': sorted(group['services']),
+            'first_seen': group['first_seen'],
+            'last_seen': group['last_seen'],
+            'sample_message': group['sample_message'],
+            'sample_http': group['sample_http'],
+            'occurrences': [occ for _, occ in group['occurrences']],
+            'error_type': group['error_type'],
+            # Convertir sets a listas para JSON (ordenadas: salida estable)
+            'revisions': sorted(group['revisions'])
         }
-
+        parsed = parse_traceback(group['sample_message'])
+        if parsed:
+            result[hash_id]['traceback'] = parsed
     return result
 
 
-def analyze_with_claude(consolidated_errors: dict, api_key: str) -> dict:
-    """Usa Claude para analizar errores y sugerir soluciones."""
-    if not ANTHROPIC_AVAILABLE:
-        return {}
-
-    client = anthropic.Anthropic(api_key=api_key)
-    analyses = {}
-
-    # Ordenar por cantidad de ocurrencias
-    sorted_errors = sorted(
-        consolidated_errors.items(),
-        key=lambda x: x[1]['count'],
-        reverse=True
-    )[:MAX_ISSUES_PER_RUN]  # Limitar para no exceder tokens
+def _build_chunk(args):
+    chunk, offset = args
+    return build_partial_groups(chunk, offset)
+
+
+def build_partial_groups_parallel(errors: list, workers: Optional[int] = None,
+                                  chunk_size: Optional[int] = None, offset: int = 0) -> dict:
+    """
+    build_partial_groups en paralelo: cada proceso normaliza, calcula hashes
+    y arma los grupos parciales de un bloque, que luego se fusionan en orden.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, -(-len(errors) // (workers * 4)))
+    chunks = [(errors[i:i + chunk_size], offset + i) for i in range(0, len(errors), chunk_size)]
+
+    partial = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for groups in executor.map(_build_chunk, chunks):
+            partial = merge_partial_groups(partial, groups)
+    return partial
+
+
+def consolidate_errors_parallel(errors: list, workers: Optional[int] = None,
+                                chunk_size: Optional[int] = None) -> dict:
+    """Agrupa errores en paralelo; el resultado es identico al serial."""
+    return finalize_groups(build_partial_groups_parallel(errors, workers, chunk_size))
+
+
+def _build_partial(errors: list, workers: Optional[int], offset: int = 0) -> dict:
+    workers = CONSOLIDATE_WORKERS if workers is None else workers
+    if workers > 1 and len(errors) >= PARALLEL_MIN_ERRORS:
+        return build_partial_groups_parallel(errors, workers, offset=offset)
+    return build_partial_groups(errors, offset)
+
+
+def consolidate_errors(errors: list, workers: Optional[int] = None) -> dict:
+    """
+    Agrupa errores similares.
+
+    Con workers > 1 y al menos PARALLEL_MIN_ERRORS errores se usa el modo
+    paralelo (mismo resultado, ver consolidate_errors_parallel).
+    """
+    return finalize_groups(_build_partial(errors, workers))
+
+
+def consolidate_errors_incremental(errors: list, state: ConsolidationState,
+                                   workers: Optional[int] = None) -> dict:
+    """
+    Aplica sobre los grupos guardados en state solo los errores cuyo id no
+    se habia visto, y retorna todos los grupos vigentes.
+    """
+    new_errors = state.new_errors(errors)
+    if new_errors:
+        partial = _build_partial(new_errors, workers, offset=state.next_index)
+        state.groups = merge_partial_groups(state.groups, partial)
+        state.next_index += len(new_errors)
+        state.mark_seen(new_errors)
+    state.expire()
+    print(f"  {len(new_errors)} errores nuevos de {len(errors)}")
+    return finalize_groups(state.groups)
+
+
+def consolidate_from_warehouse(warehouse: ErrorWarehouse) -> dict:
+    """
+    Grupos consolidados calculados con SQL sobre la base de errores; el
+    orden de insercion (seq) hace de posicion en la lista.
+    """
+    partial = {}
+    for error_hash, row in warehouse.group_rows().items():
+        sample = row.get('sample') or {}
+        message = sample.get('message', '')
+        partial[error_hash] = {
+            'count': row['count'],
+            'services': set(row['services']),
+            'first_seen': row['first_seen'],
+            'last_seen': row['last_seen'],
+            'sample_message': message,
+            'sample_http': sample.get('httpRequest'),
+            'occurrences': [(seq, _occurrence(error)) for seq, error in row['occurrences']],
+            'error_type': extract_error_type(message),
+            'revisions': set(row['revisions']),
+            'first_index': row['first_seq'],
+            'sample_index': row['sample_seq'],
+        }
+    return finalize_groups(partial)
+
+
+def assign_families(consolidated: dict, data_dir: str) -> dict:
+    """
+    Agrupa los grupos similares en familias: agrega `family` a cada grupo y
+    guarda el resumen en data/error_families.json.
+    """
+    assignment = cluster_groups(consolidated)
+    for error_hash, family_id in assignment.items():
+        consolidated[error_hash]['family'] = family_id
+    families = build_families(consolidated, assignment)
+    with open(os.path.join(data_dir, 'error_families.json'), 'w') as f:
+        json.dump(families, f, indent=2)
+    print(f"  {len(families)} familias de errores similares")
+    return families
+
+
+def consolidate_with_mode(errors: list, data_dir: str) -> dict:
+    """
+    Consolida segun ERROR_STORE / CONSOLIDATE_MODE ('full' o 'incremental'), asigna
+    familias a los grupos y guarda el indice de frames (data/error_frames.json).
+    """
+    if ERROR_STORE == 'sqlite':
+        warehouse = ErrorWarehouse(warehouse_path(data_dir))
+        inserted = warehouse.insert_errors(errors, get_error_hash)
+        expired = warehouse.expire()
+        print(f"  Base de errores: {inserted} nuevos, {expired} expirados, {warehouse.count()} en total")
+        consolidated = consolidate_from_warehouse(warehouse)
+        warehouse.close()
+    elif CONSOLIDATE_MODE != 'incremental':
+        consolidated = consolidate_errors(errors)
+    else:
+        state = ConsolidationState(data_dir)
+        consolidated = consolidate_errors_incremental(errors, state)
+        state.save()
+    assign_families(consolidated, data_dir)
+    with open(os.path.join(data_dir, 'error_frames.json'), 'w') as f:
+        json.dump(build_frame_index(consolidated), f, indent=2)
+    return consolidated
 
-    for error_hash, error_data in sorted_errors:
-        if error_data['count'] < MIN_OCCURRENCES_FOR_ISSUE:
-            continue
 
-        # Preparar contexto para Claude
-        prompt = f"""Analiza este error de una aplicacion Django en Google Cloud Run.
+def build_analysis_prompt(error_data: dict) -> str:
+    """Prompt de analisis para un grupo de errores."""
+    return f"""Analiza este error de una aplicacion Django en Google Cloud Run.
 
 SERVICIO(S): {', '.join(error_data['services'])}
 TIPO DE ERROR: {error_data['error_type']}
@@ -198,53 +383,88 @@ Por favor proporciona:
 
 Responde en formato estructurado y conciso."""
 
+
+def analyze_with_claude(consolidated_errors: dict, api_key: str, client=None,
+                        max_concurrency: Optional[int] = None,
+                        bucket: Optional[TokenBucket] = None,
+                        cache: Optional[AnalysisCache] = None) -> dict:
+    """
+    Usa Claude para analizar errores y sugerir soluciones.
+
+    Las llamadas se hacen en paralelo (max_concurrency), con limite de tasa
+    (token bucket) y reintentos ante 429/5xx. `client` permite inyectar un
+    cliente alternativo (p. ej. analysis_pipeline.FakeClient). Con `cache`
+    se reutilizan los analisis de grupos que no cambiaron.
+    """
+    if client is None:
+        if not ANTHROPIC_AVAILABLE:
+            return {}
+        # Los reintentos los maneja call_with_retry
+        client = anthropic.Anthropic(api_key=api_key, max_retries=0)
+    bucket = bucket or TokenBucket.per_minute(CLAUDE_REQUESTS_PER_MINUTE)
+
+    # Ordenar por cantidad de ocurrencias
+    sorted_errors = sorted(
+        consolidated_errors.items(),
+        key=lambda x: x[1]['count'],
+        reverse=True
+    )[:MAX_ANALYSES_PER_RUN]  # Limitar para no exceder tokens
+
+    prompts = {
+        error_hash: build_analysis_prompt(error_data)
+        for error_hash, error_data in sorted_errors
+        if error_data['count'] >= MIN_OCCURRENCES_FOR_ISSUE
+    }
+
+    def analyze(error_hash: str, prompt: str) -> dict:
+        error_data = consolidated_errors[error_hash]
+        if cache:
+            cached = cache.lookup(error_hash, error_data, prompt)
+            if cached:
+                return cached
         try:
-            response = client.messages.create(
+            response = call_with_retry(lambda: client.messages.create(
                 model="claude-sonnet-4-20250514",
                 max_tokens=1000,
                 messages=[{"role": "user", "content": prompt}]
-            )
+            ), bucket)
 
-            analyses[error_hash] = {
+            result = {
                 'analysis': response.content[0].text,
                 'analyzed_at': datetime.now(timezone.utc).isoformat()
             }
+            if cache:
+                cache.store(error_hash, error_data, result)
+            return result
 
         except Exception as e:
             print(f"Error analizando con Claude: {e}")
-            analyses[error_hash] = {
+            return {
                 'analysis': None,
                 'error': str(e)
             }
 
-    return analyses
+    return run_concurrent(prompts, analyze, max_concurrency or CLAUDE_MAX_CONCURRENCY)
 
 
-def check_existing_issues(error_hash: str) -> Optional[str]:
-    """Verifica si ya existe un issue para este error."""
+def check_existing_issues(error_hash: str, index: Optional[IssueIndex] = None,
+                          client: Optional[GitHubClient] = None) -> Optional[str]:
+    """Verifica si ya existe un issue para este error (en el indice, si hay)."""
+    if index is not None:
+        entry = index.lookup(error_hash)
+        return entry['url'] if entry else None
     try:
-        result = subprocess.run(
-            f'gh issue list --repo {GITHUB_REPO} --search "ERROR-{error_hash}" --json number,url --limit 1',
-            shell=True, capture_output=True, text=True, timeout=30
-        )
-        if result.stdout.strip():
-            issues = json.loads(result.stdout)
-            if issues:
-                return issues[0]['url']
+        client = client or GitHubClient(GITHUB_REPO)
+        issues = client.search_issues(f'"ERROR-{error_hash}"')
+        if issues:
+            return issues[0]['html_url']
     except Exception as e:
         print(f"Error verificando issues existentes: {e}")
     return None
 
 
-def create_github_issue(error_hash: str, error_data: dict, analysis: Optional[dict] = None) -> Optional[str]:
-    """Crea un issue en GitHub para el error."""
-
-    # Verificar si ya existe
-    existing = check_existing_issues(error_hash)
-    if existing:
-        print(f"  Issue ya existe: {existing}")
-        return existing
-
+def build_issue(error_hash: str, error_data: dict, analysis: Optional[dict] = None) -> dict:
+    """Titulo, cuerpo y labels del issue de un grupo de errores."""
     # Construir titulo
     services = ', '.join(error_data['services'][:3])
     if len(error_data['services']) > 3:
@@ -267,8 +487,10 @@ def create_github_issue(error_hash: str, error_data: dict, analysis: Optional[di
         f"| **Primera vez** | {error_data['first_seen']} |",
         f"| **Ultima vez** | {error_data['last_seen']} |",
         f"| **Revisions** | {', '.join(error_data['revisions'][:5])} |",
-        f"",
     ]
+    if error_data.get('family') and error_data['family'] != error_hash:
+        body_parts.append(f"| **Familia** | `ERROR-{error_data['family']}` |")
+    body_parts.append("")
 
     # Agregar analisis de Claude si existe
     if analysis and analysis.get('analysis'):
@@ -337,27 +559,40 @@ def create_github_issue(error_hash: str, error_data: dict, analysis: Optional[di
     else:
         labels.append("priority-low")
 
-    # Crear issue
-    try:
-        labels_str = ','.join(labels)
-        cmd = f'''gh issue create --repo {GITHUB_REPO} --title "{title}" --body "$(cat <<'EOFBODY'
-{body}
-EOFBODY
-)" --label "{labels_str}"'''
-
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=60)
-
-        if result.returncode == 0:
-            issue_url = result.stdout.strip()
-            print(f"  Issue creado: {issue_url}")
-            return issue_url
+    return {'title': title, 'body': body, 'labels': labels}
+
+
+def _record_created(error_hash: str, issue: dict, index: Optional[IssueIndex]) -> str:
+    issue_url = issue['html_url']
+    print(f"  Issue creado: {issue_url}")
+    if index is not None:
+        index.add(error_hash, issue.get('number'), issue_url)
+    return issue_url
+
+
+def create_github_issues(errors: list, analyses: dict, index: Optional[IssueIndex],
+                         client: GitHubClient) -> dict:
+    """
+    Crea los issues de varios grupos ([(hash, datos)]) en paralelo, con
+    concurrencia acotada. Retorna {hash: url} (incluye los ya existentes).
+    """
+    urls = {}
+    pending = {}
+    for error_hash, error_data in errors:
+        print(f"\nProcesando ERROR-{error_hash} ({error_data['count']} ocurrencias)...")
+        existing = check_existing_issues(error_hash, index, client)
+        if existing:
+            print(f"  Issue ya existe: {existing}")
+            urls[error_hash] = existing
         else:
-            print(f"  Error creando issue: {result.stderr}")
-            return None
+            pending[error_hash] = build_issue(error_hash, error_data, analyses.get(error_hash))
 
-    except Exception as e:
-        print(f"  Error creando issue: {e}")
-        return None
+    for error_hash, result in client.create_issues(pending).items():
+        if isinstance(result, Exception):
+            print(f"  Error creando issue ERROR-{error_hash}: {result}")
+        else:
+            urls[error_hash] = _record_created(error_hash, result, index)
+    return urls
 
 
 def main():
@@ -379,7 +614,7 @@ def main():
 
     # Consolidar errores
     print("\nConsolidando errores...")
-    consolidated = consolidate_errors(errors)
+    consolidated = consolidate_with_mode(errors, data_dir)
     print(f"  {len(consolidated)} grupos de errores unicos")
 
     # Filtrar por minimo de ocurrencias
@@ -401,8 +636,13 @@ def main():
 
     if api_key and ANTHROPIC_AVAILABLE:
         print("\nAnalizando con Claude...")
-        analyses = analyze_with_claude(significant_errors, api_key)
-        print(f"  {len(analyses)} errores analizados")
+        cache = AnalysisCache(os.path.join(data_dir, 'analysis_cache.json'))
+        analyses = analyze_with_claude(significant_errors, api_key, cache=cache)
+        cache.save()
+        stats = cache.stats()
+        print(f"  {len(analyses)} errores analizados "
+              f"(cache: {stats['hits']} hits, {stats['misses']} misses {stats['missReasons']}, "
+              f"~{stats['estimatedTokensSaved']} tokens ahorrados)")
 
         # Guardar analisis
         analyses_path = os.path.join(data_dir, 'error_analyses.json')
@@ -412,6 +652,30 @@ def main():
     else:
         print("\nSaltando analisis con Claude (ANTHROPIC_API_KEY no configurada)")
 
+    # Registro de issues: una entrada por hash (las entradas repetidas se fusionan)
+    issues_log_path = os.path.join(data_dir, 'created_issues.json')
+    records = {}
+    if os.path.exists(issues_log_path):
+        with open(issues_log_path, 'r') as f:
+            records = load_records(json.load(f))
+
+    github = GitHubClient(GITHUB_REPO)
+
+    # Un solo listado (paginado e incremental) en lugar de una busqueda por grupo
+    issue_index = IssueIndex(os.path.join(data_dir, 'issue_index.json'), github)
+    if not issue_index.refresh():
+        print("  No se pudo actualizar el indice de issues; se busca por grupo")
+        issue_index = None
+
+    # Sincronizar issues existentes: comentar, reabrir o cerrar segun los grupos actuales
+    synced = {}
+    if issue_index is not None:
+        print("\nSincronizando issues existentes...")
+        seed_records(records, issue_index, consolidated)
+        actions = plan_sync(consolidated, issue_index, records)
+        synced = apply_sync(actions, github, issue_index, records, consolidated)
+        print(f"  {len(actions)} cambios: {synced or 'ninguno'}")
+
     # Crear issues
     print("\nCreando issues en GitHub...")
     created_issues = []
@@ -423,30 +687,29 @@ def main():
         reverse=True
     )[:MAX_ISSUES_PER_RUN]
 
+    issue_urls = create_github_issues(sorted_errors, analyses, issue_index, github)
     for error_hash, error_data in sorted_errors:
-        print(f"\nProcesando ERROR-{error_hash} ({error_data['count']} ocurrencias)...")
-        analysis = analyses.get(error_hash)
-        issue_url = create_github_issue(error_hash, error_data, analysis)
-
-        if issue_url:
-            created_issues.append({
-                'hash': error_hash,
-                'url': issue_url,
-                'count': error_data['count'],
-                'services': error_data['services']
-            })
-
-    # Guardar registro de issues creados
-    issues_log_path = os.path.join(data_dir, 'created_issues.json')
-    existing_issues = []
-    if os.path.exists(issues_log_path):
-        with open(issues_log_path, 'r') as f:
-            existing_issues = json.load(f)
+        if error_hash in issue_urls and error_hash not in records:
+            created_issues.append(error_hash)
+            update_record(records, error_hash, error_data, {'url': issue_urls[error_hash], 'state': 'open'})
+
+    # Estado actual de cada issue registrado
+    if issue_index is not None:
+        for error_hash, record in records.items():
+            issue = issue_index.lookup(error_hash)
+            if issue:
+                record['state'] = issue['state']
 
-    existing_issues.extend(created_issues)
+    github.close()
+    if issue_index is not None:
+        issue_index.save()
 
     with open(issues_log_path, 'w') as f:
-        json.dump(existing_issues, f, indent=2)
+        json.dump(list(records.values()), f, indent=2)
+    if ERROR_STORE == 'sqlite':
+        warehouse = ErrorWarehouse(warehouse_path(data_dir))
+        warehouse.save_issue_records(records)
+        warehouse.close()
 
     print(f"\n{'='*50}")
     print(f"Resumen:")
@@ -454,6 +717,7 @@ def main():
     print(f"  Grupos consolidados: {len(consolidated)}")
     print(f"  Grupos significativos: {len(significant_errors)}")
     print(f"  Issues creados: {len(created_issues)}")
+    print(f"  Issues sincronizados: {sum(synced.values())}")
     print(f"{'='*50}")
 
 
@@ -10,7 +10,7 @@ import sys
 
 # Add scripts directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from consolidate_errors import consolidate_errors
+from consolidate_errors import consolidate_with_mode
 
 def main():
     data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
@@ -23,7 +23,7 @@ def main():
     with open(errors_file, 'r') as f:
         errors = json.load(f)
 
-    consolidated = consolidate_errors(errors)
+    consolidated = consolidate_with_mode(errors, data_dir)
 
     with open(os.path.join(data_dir, 'consolidated_errors.json'), 'w') as f:
         json.dump(consolidated, f, indent=2)
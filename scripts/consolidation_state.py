@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Estado persistido de la consolidacion incremental de errores.
+
+Guarda los grupos parciales (el formato de build_partial_groups, con las
+posiciones de cada error) y los ids (insertId, o un digest del contenido
+para los errores sin id) ya aplicados, de modo que
+cada ejecucion solo procesa los errores nuevos de errors.json y los grupos
+pueden abarcar mas que la ventana de 7 dias de la consulta de logs.
+
+Archivo: data/consolidation_state.json
+{
+  'nextIndex': posicion global del proximo error,
+  'groups': {hash: grupo parcial},
+  'seen': {'YYYY-MM-DD': [ids]}   # por dia del timestamp del error
+}
+"""
+
+import json
+import os
+from datetime import datetime, timezone, timedelta
+from typing import Optional
+
+from log_ingest import entry_id
+
+# Los ids se recuerdan algo mas que la ventana de errors.json (7 dias)
+SEEN_RETENTION_DAYS = int(os.environ.get('CONSOLIDATE_SEEN_RETENTION_DAYS', '10'))
+# Grupos sin ocurrencias en este periodo se descartan
+GROUP_RETENTION_DAYS = int(os.environ.get('CONSOLIDATE_GROUP_RETENTION_DAYS', '90'))
+
+
+def error_key(error: dict) -> str:
+    """id del error (insertId) o, si no tiene, un digest de su contenido."""
+    return error.get('id') or entry_id(error)
+
+
+def _dump_group(group: dict) -> dict:
+    data = dict(group)
+    data['services'] = sorted(group['services'])
+    data['revisions'] = sorted(group['revisions'])
+    data['occurrences'] = [[index, occ] for index, occ in group['occurrences']]
+    return data
+
+
+def _load_group(data: dict) -> dict:
+    group = dict(data)
+    group['services'] = set(data.get('services', []))
+    group['revisions'] = set(data.get('revisions', []))
+    group['occurrences'] = [(index, occ) for index, occ in data.get('occurrences', [])]
+    return group
+
+
+class ConsolidationState:
+    """Grupos parciales e ids aplicados, persistidos entre ejecuciones."""
+
+    def __init__(self, data_dir: str):
+        self.path = os.path.join(data_dir, 'consolidation_state.json')
+        self.next_index = 0
+        self.groups = {}
+        self.seen = {}
+        self._seen_ids = set()
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                self.next_index = data.get('nextIndex', 0)
+                self.groups = {k: _load_group(v) for k, v in data.get('groups', {}).items()}
+                self.seen = {day: list(ids) for day, ids in data.get('seen', {}).items()}
+            except (OSError, json.JSONDecodeError, ValueError) as e:
+                print(f"  Estado de consolidacion ilegible, se reconstruye: {e}")
+                self.next_index, self.groups, self.seen = 0, {}, {}
+        for ids in self.seen.values():
+            self._seen_ids.update(ids)
+
+    def new_errors(self, errors: list) -> list:
+        """Errores cuyo id (o digest, ver error_key) no fue aplicado antes."""
+        result = []
+        batch_ids = set()
+        for error in errors:
+            key = error_key(error)
+            if key in self._seen_ids or key in batch_ids:
+                continue
+            batch_ids.add(key)
+            result.append(error)
+        return result
+
+    def mark_seen(self, errors: list):
+        for error in errors:
+            key = error_key(error)
+            day = (error.get('timestamp') or '')[:10] or datetime.now(timezone.utc).strftime('%Y-%m-%d')
+            self.seen.setdefault(day, []).append(key)
+            self._seen_ids.add(key)
+
+    def expire(self, now: Optional[datetime] = None):
+        """Olvida ids y grupos fuera de la retencion."""
+        now = now or datetime.now(timezone.utc)
+        oldest_day = (now - timedelta(days=SEEN_RETENTION_DAYS)).strftime('%Y-%m-%d')
+        for day in [d for d in self.seen if d < oldest_day]:
+            self._seen_ids.difference_update(self.seen.pop(day))
+
+        oldest_group = (now - timedelta(days=GROUP_RETENTION_DAYS)).strftime('%Y-%m-%d')
+        for error_hash in [h for h, g in self.groups.items()
+                           if g.get('last_seen') and g['last_seen'][:10] < oldest_group]:
+            del self.groups[error_hash]
+
+    def save(self):
+        data = {
+            'nextIndex': self.next_index,
+            'groups': {k: _dump_group(v) for k, v in self.groups.items()},
+            'seen': {day: sorted(ids) for day, ids in sorted(self.seen.items())}
+        }
+        with open(self.path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
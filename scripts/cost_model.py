@@ -0,0 +1,566 @@
+#!/usr/bin/env python3
+"""
+Modelo de costos de Cloud Run sobre todos los servicios a la vez.
+
+Las entradas de cada servicio (CPU, memoria, requests del mes, duracion media
+de las requests, concurrencia, instancias minimas y maximas y modo de
+asignacion de CPU) se guardan en columnas y la estimacion se calcula en una
+sola pasada vectorizada con NumPy. Sin NumPy se evalua la misma formula fila
+por fila.
+
+Tiempo de instancia: las requests que estan en curso en un instante siguen
+una distribucion de Poisson con media requests/s * duracion media (cola
+M/G/inf, vale para cualquier distribucion de latencias), y cada instancia
+atiende hasta `concurrency` a la vez. De ahi salen los segundos con al menos
+una instancia ocupada, los periodos de actividad (redondeados a 100 ms) y los
+cold starts: una request llega sin instancias vivas cuando no hubo otra en
+los ultimos IDLE_TIMEOUT_SECONDS.
+
+Facturacion:
+- CPU solo durante requests (default): se cobra el tiempo activo, las
+  requests y las instancias minimas ociosas a la tarifa de inactividad
+- CPU siempre asignada (run.googleapis.com/cpu-throttling: false): se cobra
+  toda la vida de la instancia, sin cargo por request
+El tier gratuito es por cuenta de facturacion: se aplica al total del
+proyecto y el credito se reparte entre servicios segun su uso.
+
+El factor de calibracion (calibrate) ajusta el modelo al costo real de Cloud
+Run de BigQuery; overprovisioned() marca los servicios que pagan capacidad
+que no usan.
+
+Uso (lee data/services.json):
+    python scripts/cost_model.py                              # costo actual
+    python scripts/cost_model.py cpu=0.5 service=crm-gyt      # escenario
+    python scripts/cost_model.py sensitivity cpu 0.25,0.5,1,2 [servicio,...]
+    python scripts/cost_model.py overprovisioned
+"""
+
+import json
+import math
+import os
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Precios de Cloud Run (us-central1, tier 1)
+# CPU solo durante requests
+CPU_PRICE_PER_VCPU_SECOND = 0.00002400
+MEMORY_PRICE_PER_GIB_SECOND = 0.00000250
+REQUEST_PRICE_PER_MILLION = 0.40
+# Instancias minimas ociosas
+IDLE_CPU_PRICE_PER_VCPU_SECOND = 0.00000250
+IDLE_MEMORY_PRICE_PER_GIB_SECOND = 0.00000250
+# CPU siempre asignada
+ALWAYS_CPU_PRICE_PER_VCPU_SECOND = 0.00001800
+ALWAYS_MEMORY_PRICE_PER_GIB_SECOND = 0.00000200
+
+# Tier gratuito mensual por cuenta de facturacion
+FREE_TIER = {
+    'vcpu_request': 180_000,      # vCPU-segundos (CPU durante requests)
+    'gib_request': 360_000,       # GiB-segundos
+    'requests_billable': 2_000_000,
+    'vcpu_always': 240_000,       # vCPU-segundos (CPU siempre asignada)
+    'gib_always': 450_000
+}
+UNIT_PRICES = {
+    'vcpu_request': CPU_PRICE_PER_VCPU_SECOND,
+    'gib_request': MEMORY_PRICE_PER_GIB_SECOND,
+    'requests_billable': REQUEST_PRICE_PER_MILLION / 1_000_000,
+    'vcpu_always': ALWAYS_CPU_PRICE_PER_VCPU_SECOND,
+    'gib_always': ALWAYS_MEMORY_PRICE_PER_GIB_SECOND
+}
+
+SECONDS_PER_MONTH = 730 * 3600
+DAYS_PER_MONTH = SECONDS_PER_MONTH / 86400  # ~30.4 dias: el mes del modelo
+DEFAULT_LATENCY_MS = 350          # Duracion tipica de una request Django sin datos
+DEFAULT_CONCURRENCY = 80
+DEFAULT_MAX_INSTANCES = 100
+BILLING_ROUNDING_SECONDS = 0.05   # Cada periodo activo se redondea a 100 ms (en promedio +50 ms)
+IDLE_TIMEOUT_SECONDS = 900        # Una instancia sin requests se apaga a los ~15 minutos
+COLD_START_SECONDS = float(os.environ.get('COST_COLD_START_SECONDS', '3'))
+# Sobre esta media de requests simultaneas se usa la aproximacion normal
+POISSON_EXACT_LIMIT = 500
+
+CALIBRATION_MIN_DAYS = int(os.environ.get('COST_CALIBRATION_MIN_DAYS', '5'))
+CALIBRATION_BOUNDS = (0.2, 5.0)
+# Dias con que get_real_billing_data proyecta el mes ('projected' = promedio diario x 31)
+BILLING_PROJECTION_DAYS = 31
+OVERPROVISION_MIN_SAVINGS = float(os.environ.get('COST_OVERPROVISION_MIN_SAVINGS', '1'))
+MIN_INSTANCE_BUSY_THRESHOLD = 0.05  # Instancias ocupadas en promedio bajo las que se sugiere 0
+
+INPUT_FIELDS = ('cpu', 'memory_gib', 'requests', 'mean_ms', 'concurrency',
+                'min_instances', 'max_instances', 'cpu_always')
+# Parametros de Scenario que admiten tablas de sensibilidad
+SCENARIO_PARAMETERS = ('cpu', 'memory_gib', 'concurrency', 'min_instances', 'max_instances',
+                       'cpu_always', 'requests_factor', 'latency_factor')
+
+
+def _expected_instances_scalar(load, concurrency, max_instances):
+    """E[min(ceil(N / concurrency), max)] con N ~ Poisson(load)."""
+    if load > POISSON_EXACT_LIMIT:
+        return min(load / concurrency + (concurrency - 1) / (2 * concurrency), max_instances)
+    pmf = math.exp(-load)
+    expected = 0.0
+    for k in range(1, int(load + 10 * math.sqrt(load) + 20) + 1):
+        pmf *= load / k
+        expected += pmf * min(math.ceil(k / concurrency), max_instances)
+    return expected
+
+
+def _expected_instances_numpy(load, concurrency, max_instances):
+    load, concurrency, max_instances = np.broadcast_arrays(
+        np.asarray(load, dtype=float), concurrency, max_instances)
+    exact = load <= POISSON_EXACT_LIMIT
+    exact_load = np.where(exact, load, 0.0)
+    peak = float(exact_load.max()) if exact_load.size else 0.0
+    k = np.arange(1, int(peak + 10 * math.sqrt(peak) + 20) + 1, dtype=float)
+    log_factorial = np.asarray([math.lgamma(i + 1) for i in k])
+    pmf = np.exp(k * np.log(np.maximum(exact_load, 1e-300))[..., None]
+                 - exact_load[..., None] - log_factorial)
+    instances = np.minimum(np.ceil(k / concurrency[..., None]), max_instances[..., None])
+    approx = np.minimum(load / concurrency + (concurrency - 1) / (2 * concurrency), max_instances)
+    return np.where(exact, (pmf * instances).sum(axis=-1), approx)
+
+
+class _ScalarOps:
+    """Las funciones de NumPy que usa la formula, para evaluar fila por fila."""
+    maximum = staticmethod(max)
+    minimum = staticmethod(min)
+    exp = staticmethod(math.exp)
+    expected_instances = staticmethod(_expected_instances_scalar)
+
+    @staticmethod
+    def where(condition, a, b):
+        return a if condition else b
+
+
+class _NumpyOps:
+    where = staticmethod(lambda condition, a, b: np.where(condition, a, b))
+    maximum = staticmethod(lambda a, b: np.maximum(a, b))
+    minimum = staticmethod(lambda a, b: np.minimum(a, b))
+    exp = staticmethod(lambda a: np.exp(a))
+    expected_instances = staticmethod(_expected_instances_numpy)
+
+
+@dataclass
+class Scenario:
+    """
+    Cambios hipoteticos sobre las entradas actuales. Los valores None dejan
+    la entrada como esta; services limita el cambio a esos servicios.
+    cpu_always: 1 = CPU siempre asignada, 0 = CPU solo durante requests.
+    """
+    cpu: Optional[float] = None
+    memory_gib: Optional[float] = None
+    concurrency: Optional[float] = None
+    min_instances: Optional[float] = None
+    max_instances: Optional[float] = None
+    cpu_always: Optional[float] = None
+    requests_factor: float = 1.0
+    latency_factor: float = 1.0
+    services: Optional[list] = None
+
+
+def monthly_requests(interactions: dict) -> int:
+    """Requests del mes a partir de los conteos de 7 y 30 dias."""
+    requests_7d = interactions.get('requests7d', 0)
+    requests_30d = interactions.get('requests30d', 0)
+    # Si el conteo no es exacto y 7d y 30d son iguales, la lectura se corto
+    # dentro de los ultimos 7 dias: proyectar a 30 dias multiplicando por ~4.3 (30/7)
+    if not interactions.get('exact') and requests_7d > 0 and requests_7d == requests_30d:
+        return int(requests_7d * 4.3)
+    return requests_30d
+
+
+def mean_request_ms(service: dict) -> float:
+    """
+    Duracion media de las requests. Sin media medida se estima desde p50 y
+    p90 suponiendo una distribucion log-normal; la muestra de requests 5xx
+    solo como respaldo.
+    """
+    latency = (service.get('interactions') or {}).get('latency') or {}
+    metrics = service.get('metrics') or {}
+    if latency.get('meanMs'):
+        return latency['meanMs']
+    p50 = latency.get('p50Ms') or metrics.get('p50Ms') or metrics.get('avgLatencyMs', 0)
+    p90 = latency.get('p90Ms') or metrics.get('p90Ms') or 0
+    if p50 and p90 > p50:
+        sigma = math.log(p90 / p50) / 1.2816
+        return p50 * math.exp(sigma ** 2 / 2)
+    return p50 or DEFAULT_LATENCY_MS
+
+
+def service_inputs(config: dict, interactions: dict, mean_ms: float) -> dict:
+    """Fila de entradas del modelo para un servicio."""
+    return {
+        'cpu': config.get('cpu', 1),
+        'memory_gib': config.get('memoryGiB', 0.5),
+        'requests': monthly_requests(interactions),
+        'mean_ms': mean_ms or DEFAULT_LATENCY_MS,
+        'concurrency': max(config.get('concurrency') or DEFAULT_CONCURRENCY, 1),
+        'min_instances': config.get('minInstances', 0),
+        'max_instances': max(config.get('maxInstances') or DEFAULT_MAX_INSTANCES, 1),
+        'cpu_always': 1 if config.get('cpuAlwaysAllocated') else 0
+    }
+
+
+def _usage(xp, columns: dict, mask, scenario: Scenario) -> dict:
+    """
+    Uso facturable del mes por servicio. xp es _NumpyOps (columnas como
+    arrays) o _ScalarOps (valores de un servicio); mask indica a que
+    servicios aplica el escenario.
+    """
+    def override(field, value):
+        return columns[field] if value is None else xp.where(mask, value, columns[field])
+
+    cpu = override('cpu', scenario.cpu)
+    memory_gib = override('memory_gib', scenario.memory_gib)
+    concurrency = override('concurrency', scenario.concurrency)
+    min_instances = override('min_instances', scenario.min_instances)
+    max_instances = override('max_instances', scenario.max_instances)
+    cpu_always = override('cpu_always', scenario.cpu_always) > 0.5
+    requests = xp.where(mask, columns['requests'] * scenario.requests_factor, columns['requests'])
+    duration = xp.where(mask, columns['mean_ms'] * scenario.latency_factor, columns['mean_ms']) / 1000
+
+    rate = requests / SECONDS_PER_MONTH
+    load = rate * duration                                   # Requests simultaneas en promedio
+    busy_instances = xp.expected_instances(load, concurrency, max_instances)
+    empty = xp.exp(-load)                                    # P(ninguna request en curso)
+    busy_seconds = busy_instances * SECONDS_PER_MONTH
+    # Las instancias minimas evitan los cold starts
+    cold_starts = xp.where(min_instances > 0, 0.0, requests * xp.exp(-rate * IDLE_TIMEOUT_SECONDS))
+    cold_seconds = cold_starts * COLD_START_SECONDS
+
+    # CPU durante requests: tiempo activo + instancias minimas ociosas
+    active_seconds = busy_seconds + requests * empty * BILLING_ROUNDING_SECONDS + cold_seconds
+    idle_seconds = xp.maximum(min_instances - busy_instances, 0.0) * SECONDS_PER_MONTH
+    # CPU siempre asignada: la primera instancia sigue viva hasta IDLE_TIMEOUT
+    # despues de la ultima request
+    alive = 1 - xp.exp(-rate * (IDLE_TIMEOUT_SECONDS + duration))
+    always_seconds = xp.maximum(min_instances, busy_instances - (1 - empty) + alive) * SECONDS_PER_MONTH \
+        + cold_seconds
+
+    request_seconds = xp.where(cpu_always, 0.0, active_seconds)
+    idle_seconds = xp.where(cpu_always, 0.0, idle_seconds)
+    always_seconds = xp.where(cpu_always, always_seconds, 0.0)
+    billed_seconds = request_seconds + idle_seconds + always_seconds
+    return {
+        'cpu': cpu, 'memory_gib': memory_gib, 'requests': requests, 'mean_ms': duration * 1000,
+        'concurrency': concurrency, 'min_instances': min_instances, 'max_instances': max_instances,
+        'cpu_always': cpu_always, 'busy_instances': busy_instances, 'cold_starts': cold_starts,
+        'busy_seconds': busy_seconds, 'idle_seconds': idle_seconds, 'billed_seconds': billed_seconds,
+        'utilization': xp.where(billed_seconds > 0, busy_seconds / xp.maximum(billed_seconds, 1e-9), 0.0),
+        'vcpu_request': cpu * request_seconds,
+        'gib_request': memory_gib * request_seconds,
+        'requests_billable': xp.where(cpu_always, 0.0, requests),
+        'vcpu_always': cpu * always_seconds,
+        'gib_always': memory_gib * always_seconds,
+        'vcpu_idle': cpu * idle_seconds,
+        'gib_idle': memory_gib * idle_seconds
+    }
+
+
+def _free_tier_shares(xp, totals: dict) -> dict:
+    """Fraccion del uso del proyecto que cubre el tier gratuito, por recurso."""
+    return {key: xp.where(totals[key] > 0, xp.minimum(1.0, free / xp.maximum(totals[key], 1e-9)), 0.0)
+            for key, free in FREE_TIER.items()}
+
+
+def _costs(usage: dict, shares: dict, factor: float) -> dict:
+    """Costos del servicio: tarifas de lista, credito gratuito y factor de calibracion."""
+    gross = {key: usage[key] * price for key, price in UNIT_PRICES.items()}
+    cpu_cost = gross['vcpu_request'] + gross['vcpu_always']
+    memory_cost = gross['gib_request'] + gross['gib_always']
+    request_cost = gross['requests_billable']
+    min_instance_cost = usage['vcpu_idle'] * IDLE_CPU_PRICE_PER_VCPU_SECOND \
+        + usage['gib_idle'] * IDLE_MEMORY_PRICE_PER_GIB_SECOND
+    credit = sum(gross[key] * shares[key] for key in UNIT_PRICES)
+    return {
+        'cpu_cost': cpu_cost * factor,
+        'memory_cost': memory_cost * factor,
+        'request_cost': request_cost * factor,
+        'min_instance_cost': min_instance_cost * factor,
+        'free_tier_credit': credit * factor,
+        'total': (cpu_cost + memory_cost + request_cost + min_instance_cost - credit) * factor
+    }
+
+
+def _as_list(values) -> list:
+    return values.tolist() if hasattr(values, 'tolist') else list(values)
+
+
+class CostEstimates:
+    """Resultado de una evaluacion: uso y costos, una columna por campo."""
+
+    def __init__(self, names: list, columns: dict, calibration: float = 1.0):
+        self.names = names
+        self.columns = columns
+        self.calibration = calibration
+
+    def column(self, field: str) -> list:
+        return _as_list(self.columns[field])
+
+    def total(self) -> float:
+        return float(sum(self.column('total')))
+
+    def by_service(self) -> dict:
+        """{servicio: costEstimate} con el formato de services.json."""
+        columns = {field: self.column(field) for field in self.columns}
+        estimates = {}
+        for i, name in enumerate(self.names):
+            estimates[name] = {
+                'estimatedMonthly': round(columns['total'][i], 2),
+                'cpuCost': round(columns['cpu_cost'][i], 2),
+                'memoryCost': round(columns['memory_cost'][i], 2),
+                'requestCost': round(columns['request_cost'][i], 2),
+                'minInstanceCost': round(columns['min_instance_cost'][i], 2),
+                'freeTierCredit': round(columns['free_tier_credit'][i], 2),
+                'estimatedRequests': int(columns['requests'][i]),
+                'avgLatencyMs': int(round(columns['mean_ms'][i])),
+                'cpuCores': columns['cpu'][i],
+                'memoryGiB': columns['memory_gib'][i],
+                'concurrency': int(columns['concurrency'][i]),
+                'minInstances': int(columns['min_instances'][i]),
+                'maxInstances': int(columns['max_instances'][i]),
+                'cpuAlwaysAllocated': bool(columns['cpu_always'][i]),
+                'instanceSeconds': int(round(columns['billed_seconds'][i])),
+                'coldStarts': int(round(columns['cold_starts'][i])),
+                'utilization': round(columns['utilization'][i], 3),
+                'calibrationFactor': self.calibration,
+                'note': 'Modelo por instancia (concurrencia, instancias minimas, tier gratuito del proyecto)'
+            }
+        return estimates
+
+
+class CostModel:
+    """Entradas de costo de todos los servicios, en columnas."""
+
+    def __init__(self, names: list, rows: list, use_numpy: bool = NUMPY_AVAILABLE,
+                 calibration: float = 1.0):
+        self.names = list(names)
+        self.rows = rows
+        self.use_numpy = use_numpy and NUMPY_AVAILABLE
+        self.calibration = calibration
+        if self.use_numpy:
+            self.columns = {field: np.asarray([row[field] for row in rows], dtype=float)
+                            for field in INPUT_FIELDS}
+
+    @classmethod
+    def from_services(cls, services: list, configs: dict, **kwargs) -> 'CostModel':
+        """services con 'interactions' y 'metrics' ya combinados (update_data.main)."""
+        rows = [service_inputs(configs.get(s['name'], {'cpu': 1, 'memoryGiB': 0.5}),
+                               s.get('interactions') or {}, mean_request_ms(s))
+                for s in services]
+        return cls([s['name'] for s in services], rows, **kwargs)
+
+    @classmethod
+    def from_published(cls, services: list, **kwargs) -> 'CostModel':
+        """Desde data/services.json ya publicado (la configuracion sale de costEstimate)."""
+        configs = {}
+        for s in services:
+            estimate = s.get('costEstimate') or {}
+            configs[s['name']] = {'cpu': estimate.get('cpuCores', 1),
+                                  'memoryGiB': estimate.get('memoryGiB', 0.5),
+                                  'concurrency': estimate.get('concurrency'),
+                                  'minInstances': estimate.get('minInstances', 0),
+                                  'maxInstances': estimate.get('maxInstances'),
+                                  'cpuAlwaysAllocated': estimate.get('cpuAlwaysAllocated', False)}
+        kwargs.setdefault('calibration', next(
+            (s['costEstimate'].get('calibrationFactor', 1.0) for s in services if s.get('costEstimate')), 1.0))
+        return cls.from_services(services, configs, **kwargs)
+
+    def _mask(self, services: Optional[list]):
+        if self.use_numpy:
+            names = np.asarray(self.names, dtype=object)
+            return np.ones(len(self.names), dtype=bool) if services is None else np.isin(names, list(services))
+        return [services is None or name in services for name in self.names]
+
+    def estimate(self, scenario: Optional[Scenario] = None) -> CostEstimates:
+        scenario = scenario or Scenario()
+        mask = self._mask(scenario.services)
+        if self.use_numpy:
+            usage = _usage(_NumpyOps, self.columns, mask, scenario)
+            # Sumas sobre el eje de servicios (tambien para la matriz de sensitivity)
+            shares = _free_tier_shares(_NumpyOps, {key: np.sum(usage[key], axis=-1, keepdims=True)
+                                                   for key in FREE_TIER})
+            return CostEstimates(self.names, {**usage, **_costs(usage, shares, self.calibration)},
+                                 self.calibration)
+
+        rows = [_usage(_ScalarOps, row, applies, scenario) for row, applies in zip(self.rows, mask)]
+        shares = _free_tier_shares(_ScalarOps, {key: sum(row[key] for row in rows) for key in FREE_TIER})
+        rows = [{**row, **_costs(row, shares, self.calibration)} for row in rows]
+        fields = rows[0].keys() if rows else ('total',)
+        return CostEstimates(self.names, {field: [row[field] for row in rows] for field in fields},
+                             self.calibration)
+
+    def sensitivity(self, parameter: str, values: list, services: Optional[list] = None) -> dict:
+        """
+        Costo total del proyecto para cada valor de un parametro de Scenario.
+        Con NumPy todos los valores se evaluan en una sola pasada
+        (matriz valores x servicios).
+        """
+        if parameter not in SCENARIO_PARAMETERS:
+            raise ValueError(f"Parametro desconocido: {parameter}")
+        baseline = self.estimate().total()
+        affected = [name for name in self.names if services is None or name in services]
+
+        if self.use_numpy and values and self.names:
+            grid = np.asarray(values, dtype=float)[:, None]
+            result = self.estimate(Scenario(services=services, **{parameter: grid})).columns['total']
+            result = np.broadcast_to(result, (len(values), len(self.names)))
+            totals = result.sum(axis=1).tolist()
+            by_service = result[:, [self.names.index(n) for n in affected]].tolist()
+        else:
+            totals, by_service = [], []
+            for value in values:
+                column = self.estimate(Scenario(services=services, **{parameter: value})).column('total')
+                totals.append(sum(column))
+                by_service.append([column[self.names.index(n)] for n in affected])
+
+        return {
+            'parameter': parameter,
+            'services': services,
+            'baseline': round(baseline, 2),
+            'rows': [{
+                'value': value,
+                'total': round(total, 2),
+                'delta': round(total - baseline, 2),
+                'byService': {name: round(cost, 2) for name, cost in zip(affected, service_costs)}
+            } for value, total, service_costs in zip(values, totals, by_service)]
+        }
+
+    def overprovisioned(self, estimates: Optional[CostEstimates] = None,
+                        min_savings: float = OVERPROVISION_MIN_SAVINGS) -> list:
+        """
+        Servicios que pagan capacidad que no usan, con el ahorro mensual del
+        cambio sugerido (evaluado con el tier gratuito del proyecto):
+        - minInstances: instancias minimas ociosas la mayor parte del mes
+        - cpuAlwaysAllocated: CPU siempre asignada con poca utilizacion
+        - concurrency: concurrencia baja que obliga a levantar mas instancias
+        """
+        estimates = estimates or self.estimate()
+        baseline = estimates.total()
+        columns = {field: estimates.column(field) for field in
+                   ('min_instances', 'busy_instances', 'cpu_always', 'utilization', 'concurrency')}
+        findings = []
+        for i, name in enumerate(self.names):
+            candidates = []
+            min_instances = columns['min_instances'][i]
+            busy = columns['busy_instances'][i]
+            # Casi sin trafico conviene aceptar cold starts antes que pagar una instancia
+            needed = math.ceil(busy - 1e-9) if busy >= MIN_INSTANCE_BUSY_THRESHOLD else 0
+            if min_instances > needed and busy < 0.5 * min_instances:
+                detail = f"{int(min_instances)} instancias minimas, en promedio {busy:.2f} ocupadas: bajar a {needed}"
+                scenario = Scenario(min_instances=needed, services=[name])
+                if not needed:
+                    cold_starts = self.estimate(scenario).column('cold_starts')[i]
+                    detail += f" (~{int(round(cold_starts))} cold starts/mes)"
+                candidates.append(('minInstances', scenario, detail))
+            if columns['cpu_always'][i] and columns['utilization'][i] < 0.25:
+                candidates.append(('cpuAlwaysAllocated', Scenario(cpu_always=0, services=[name]),
+                                   f"CPU siempre asignada con {columns['utilization'][i]:.0%} de utilizacion: "
+                                   "facturar CPU solo durante requests"))
+            if columns['concurrency'][i] < DEFAULT_CONCURRENCY and columns['busy_instances'][i] > 1:
+                candidates.append(('concurrency', Scenario(concurrency=DEFAULT_CONCURRENCY, services=[name]),
+                                   f"concurrencia {int(columns['concurrency'][i])}: subir a {DEFAULT_CONCURRENCY} "
+                                   "si la aplicacion lo tolera"))
+            for kind, scenario, detail in candidates:
+                savings = baseline - self.estimate(scenario).total()
+                if savings >= min_savings:
+                    findings.append({'service': name, 'type': kind, 'detail': detail,
+                                     'monthlySavings': round(savings, 2)})
+        return sorted(findings, key=lambda f: -f['monthlySavings'])
+
+
+def calibrate(model_monthly: float, real_costs: Optional[dict], previous: Optional[dict] = None,
+              now: Optional[datetime] = None) -> dict:
+    """
+    Factor que lleva el total del modelo (sin calibrar) al costo real
+    proyectado de Cloud Run en BigQuery. Sin datos reales suficientes se
+    mantiene la calibracion anterior (meta.json) o 1.0.
+
+    El costo real se lleva al mismo mes que el modelo (730 h). Si el factor
+    queda fuera de CALIBRATION_BOUNDS se recorta y se marca 'clamped' (source
+    'bigquery-clamped', con el factor sin recortar en 'rawFactor'): el modelo
+    no explica el costo real y el factor no se debe leer como una medicion.
+    """
+    actual = (real_costs or {}).get('Cloud Run') or {}
+    daily = actual.get('avgDaily') or actual.get('projected', 0) / BILLING_PROJECTION_DAYS
+    actual_monthly = daily * DAYS_PER_MONTH
+    if actual.get('days', 0) >= CALIBRATION_MIN_DAYS and actual_monthly > 0 and model_monthly > 0:
+        low, high = CALIBRATION_BOUNDS
+        raw = actual_monthly / model_monthly
+        clamped = not low <= raw <= high
+        calibration = {
+            'factor': round(min(max(raw, low), high), 3),
+            'source': 'bigquery-clamped' if clamped else 'bigquery',
+            'modelMonthly': round(model_monthly, 2),
+            'actualMonthly': round(actual_monthly, 2),
+            'days': actual['days'],
+            'calibratedAt': (now or datetime.now(timezone.utc)).isoformat()
+        }
+        if clamped:
+            calibration.update({'clamped': True, 'rawFactor': round(raw, 3)})
+        return calibration
+    if previous and previous.get('factor'):
+        return {**previous, 'source': 'previous', 'modelMonthly': round(model_monthly, 2)}
+    return {'factor': 1.0, 'source': 'none', 'modelMonthly': round(model_monthly, 2)}
+
+
+def _parse_scenario(args: list) -> Scenario:
+    scenario = Scenario()
+    for arg in args:
+        key, _, value = arg.partition('=')
+        key = key.replace('-', '_')
+        if key in ('service', 'services'):
+            scenario.services = value.split(',')
+        elif key in SCENARIO_PARAMETERS:
+            setattr(scenario, key, float(value))
+        else:
+            raise ValueError(f"Argumento desconocido: {arg}")
+    return scenario
+
+
+def main():
+    data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+    with open(os.path.join(data_dir, 'services.json'), 'r') as f:
+        model = CostModel.from_published(json.load(f))
+    print(f"Motor: {'numpy' if model.use_numpy else 'python'} ({len(model.names)} servicios, "
+          f"calibracion x{model.calibration})")
+
+    if sys.argv[1:2] == ['overprovisioned']:
+        for finding in model.overprovisioned():
+            print(f"  {finding['service']:<30} ${finding['monthlySavings']:>8.2f}/mes  {finding['detail']}")
+        return
+
+    if sys.argv[1:2] == ['sensitivity']:
+        if len(sys.argv) < 4:
+            print("Uso: python scripts/cost_model.py sensitivity <parametro> <v1,v2,...> [servicio,...]")
+            return
+        services = sys.argv[4].split(',') if len(sys.argv) > 4 else None
+        table = model.sensitivity(sys.argv[2], [float(v) for v in sys.argv[3].split(',')], services)
+        print(f"Costo actual: ${table['baseline']:.2f}/mes")
+        for row in table['rows']:
+            print(f"  {table['parameter']}={row['value']:<8g} ${row['total']:>10.2f}  ({row['delta']:+.2f})")
+        return
+
+    baseline = model.estimate()
+    scenario = _parse_scenario(sys.argv[1:])
+    result = model.estimate(scenario)
+    before, after = baseline.by_service(), result.by_service()
+    for name in model.names:
+        if scenario.services is None or name in scenario.services:
+            print(f"  {name:<30} ${before[name]['estimatedMonthly']:>9.2f} -> ${after[name]['estimatedMonthly']:>9.2f}")
+    print(f"Total: ${baseline.total():.2f} -> ${result.total():.2f}/mes "
+          f"({result.total() - baseline.total():+.2f})")
+
+
+if __name__ == '__main__':
+    main()
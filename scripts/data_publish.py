@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Publicacion compacta de los datos del frontend estatico.
+
+Los errores detallados se publican en shards de JSON minificado:
+- data/errors/day/<YYYY-MM-DD>.<digest>.json      (por dia UTC)
+- data/errors/service/<servicio>.<digest>.json    (por servicio)
+- data/errors/manifest.json                       (indice pequeno)
+
+El digest del contenido va en el nombre del archivo, por lo que un shard
+nunca cambia: el navegador lo puede cachear indefinidamente y solo el
+manifiesto se pide con cache buster. Con PUBLISH_GZIP=1 se escribe ademas
+una copia .gz precomprimida de cada archivo.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import Optional
+
+from log_ingest import parse_timestamp
+
+PUBLISH_GZIP = os.environ.get('PUBLISH_GZIP', '0') == '1'
+ERRORS_DIR = 'errors'
+MANIFEST_VERSION = 1
+
+
+def dumps_compact(data) -> bytes:
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def write_compact(path: str, data, gzip_copy: bool = PUBLISH_GZIP) -> bytes:
+    """Escribe JSON minificado (y opcionalmente su .gz). Retorna el contenido."""
+    payload = dumps_compact(data)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(payload)
+    if gzip_copy:
+        # mtime=0: el .gz es reproducible y no cambia si el contenido no cambia
+        with open(path + '.gz', 'wb') as f:
+            f.write(gzip.compress(payload, 9, mtime=0))
+    return payload
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', name or 'unknown')
+
+
+def write_content_addressed(data_dir: str, relative_dir: str, name: str, data,
+                            gzip_copy: bool = PUBLISH_GZIP) -> dict:
+    """
+    Escribe <relative_dir>/<name>.<digest>.json bajo data_dir. Retorna
+    {'file' (relativo a data_dir), 'bytes', 'sha256'}.
+    """
+    payload = dumps_compact(data)
+    digest = hashlib.sha256(payload).hexdigest()
+    relative = f'{relative_dir}/{_safe_name(name)}.{digest[:12]}.json'
+    path = os.path.join(data_dir, relative)
+    # Contenido direccionado: si el archivo existe ya tiene este contenido
+    if not os.path.exists(path) or (gzip_copy and not os.path.exists(path + '.gz')):
+        write_compact(path, data, gzip_copy)
+    return {'file': relative, 'bytes': len(payload), 'sha256': digest}
+
+
+def prune_directory(data_dir: str, relative_dir: str, keep: set):
+    """Elimina los archivos de relative_dir (y sus .gz) que no estan en keep."""
+    directory = os.path.join(data_dir, relative_dir)
+    if not os.path.isdir(directory):
+        return
+    for filename in os.listdir(directory):
+        relative = f'{relative_dir}/{filename}'
+        if os.path.isfile(os.path.join(directory, filename)) and relative.removesuffix('.gz') not in keep:
+            os.remove(os.path.join(directory, filename))
+
+
+def load_manifest(path: str) -> Optional[dict]:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _write_shard(data_dir: str, subdir: str, name: str, items: list, gzip_copy: bool) -> dict:
+    entry = write_content_addressed(data_dir, f'{ERRORS_DIR}/{subdir}', name, items, gzip_copy)
+    return {'file': entry['file'], 'count': len(items), 'bytes': entry['bytes'], 'sha256': entry['sha256']}
+
+
+def _manifest_files(manifest: Optional[dict]) -> set:
+    if not manifest:
+        return set()
+    return {entry['file'] for section in ('days', 'services')
+            for entry in manifest.get(section, {}).values()}
+
+
+def _newest_first(items: list) -> list:
+    oldest = datetime.min.replace(tzinfo=timezone.utc)
+    return sorted(items, key=lambda e: parse_timestamp(e.get('timestamp', '')) or oldest, reverse=True)
+
+
+def publish_error_shards(errors: list, data_dir: str, gzip_copy: bool = PUBLISH_GZIP) -> dict:
+    """
+    Publica los errores en shards por dia y por servicio y escribe el
+    manifiesto. Conserva los shards del manifiesto anterior (una pagina
+    abierta antes de la actualizacion todavia puede pedirlos).
+    """
+    manifest_path = os.path.join(data_dir, ERRORS_DIR, 'manifest.json')
+    previous = load_manifest(manifest_path)
+
+    by_day = {}
+    by_service = {}
+    for error in errors:
+        day = (error.get('timestamp') or '')[:10] or 'unknown'
+        by_day.setdefault(day, []).append(error)
+        by_service.setdefault(error.get('service') or 'unknown', []).append(error)
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'generatedAt': datetime.now(timezone.utc).isoformat(),
+        'total': len(errors),
+        'gzip': gzip_copy,
+        # Cada dia ordenado del mas reciente al mas antiguo (el indice de
+        # busqueda numera los errores en ese orden)
+        'days': {day: _write_shard(data_dir, 'day', day, _newest_first(items), gzip_copy)
+                 for day, items in sorted(by_day.items())},
+        'services': {service: _write_shard(data_dir, 'service', service, items, gzip_copy)
+                     for service, items in sorted(by_service.items())}
+    }
+
+    keep = _manifest_files(manifest) | _manifest_files(previous)
+    for subdir in ('day', 'service'):
+        prune_directory(data_dir, f'{ERRORS_DIR}/{subdir}', keep)
+    write_compact(manifest_path, manifest, gzip_copy=False)
+    return manifest
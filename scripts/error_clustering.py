@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Agrupacion de errores similares en familias (MinHash + LSH).
+
+get_error_hash solo junta mensajes cuyo texto normalizado coincide
+exactamente, por lo que un mismo traceback con pequenas variaciones (p. ej.
+el spawn_worker de gunicorn con distinto modulo final) queda en varios
+grupos. Aqui cada grupo se describe con un conjunto de rasgos (frames del
+traceback y shingles de palabras), se resume con una firma MinHash y las
+firmas se reparten en bandas LSH: solo se comparan los grupos que comparten
+alguna banda, lo que mantiene el costo casi lineal en la cantidad de grupos.
+
+El hash de cada grupo no cambia; la familia es un nivel adicional
+(`family` en consolidated_errors.json y data/error_families.json).
+"""
+
+import hashlib
+import os
+import random
+import re
+
+NUM_PERM = 64
+BANDS = 16  # 16 bandas de 4 filas: candidatos desde ~50% de similitud
+SIMILARITY_THRESHOLD = float(os.environ.get('ERROR_FAMILY_THRESHOLD', '0.6'))
+SHINGLE_SIZE = 3
+MAX_FEATURE_CHARS = 4000
+
+_PRIME = (1 << 61) - 1
+_FRAME_PATTERN = re.compile(r'File "([^"]+)", line \d+, in (\S+)')
+_WORD_PATTERN = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+
+def message_features(message: str) -> set:
+    """Rasgos de un mensaje: frames 'archivo:funcion' y shingles de palabras."""
+    text = (message or '')[:MAX_FEATURE_CHARS]
+    features = {f'frame:{path}:{func}' for path, func in _FRAME_PATTERN.findall(text)}
+    words = _WORD_PATTERN.findall(text)
+    if len(words) < SHINGLE_SIZE:
+        features.update(f'word:{w}' for w in words)
+    for i in range(len(words) - SHINGLE_SIZE + 1):
+        features.add('shingle:' + ' '.join(words[i:i + SHINGLE_SIZE]))
+    return features
+
+
+class MinHasher:
+    """Firmas MinHash con permutaciones (a*x + b) mod p de semilla fija."""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = random.Random(seed)
+        self.params = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+    def signature(self, features: set) -> tuple:
+        hashes = [int.from_bytes(hashlib.blake2b(f.encode('utf-8'), digest_size=8).digest(), 'big')
+                  for f in features]
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in self.params)
+
+
+def estimated_similarity(sig_a: tuple, sig_b: tuple) -> float:
+    """Estimacion de la similitud de Jaccard a partir de dos firmas."""
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+
+def _find(parent: dict, key: str) -> str:
+    while parent[key] != key:
+        parent[key] = parent[parent[key]]
+        key = parent[key]
+    return key
+
+
+def cluster_groups(groups: dict, threshold: float = SIMILARITY_THRESHOLD,
+                   hasher: MinHasher = None, bands: int = BANDS) -> dict:
+    """
+    Asigna cada grupo ({hash: grupo}) a una familia.
+
+    Retorna {hash: id_familia}. El id de una familia es el menor hash de sus
+    miembros, estable mientras ese grupo siga existiendo.
+    """
+    hasher = hasher or MinHasher()
+    rows = len(hasher.params) // bands
+    parent = {h: h for h in groups}
+    signatures = {}
+    for error_hash, group in groups.items():
+        features = message_features(group.get('sample_message', ''))
+        # Sin rasgos (mensaje vacio) no hay similitud que medir: familia propia
+        if features:
+            signatures[error_hash] = hasher.signature(features)
+
+    for band in range(bands):
+        buckets = {}
+        for error_hash in sorted(signatures):
+            key = signatures[error_hash][band * rows:(band + 1) * rows]
+            buckets.setdefault(key, []).append(error_hash)
+        # Comparar cada miembro con el primero del bucket (lineal, no cuadratico);
+        # la transitividad entre bandas completa las familias
+        for members in buckets.values():
+            head = members[0]
+            for other in members[1:]:
+                if estimated_similarity(signatures[head], signatures[other]) >= threshold:
+                    root_a, root_b = _find(parent, head), _find(parent, other)
+                    if root_a != root_b:
+                        parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    return {h: _find(parent, h) for h in groups}
+
+
+def build_families(groups: dict, assignment: dict) -> dict:
+    """Resumen por familia para data/error_families.json."""
+    families = {}
+    for error_hash, family_id in assignment.items():
+        families.setdefault(family_id, []).append(error_hash)
+
+    result = {}
+    for family_id, members in families.items():
+        members.sort(key=lambda h: (-groups[h]['count'], h))
+        top = groups[members[0]]
+        first_seen = [groups[h]['first_seen'] for h in members if groups[h].get('first_seen')]
+        last_seen = [groups[h]['last_seen'] for h in members if groups[h].get('last_seen')]
+        result[family_id] = {
+            'members': members,
+            'count': sum(groups[h]['count'] for h in members),
+            'services': sorted({s for h in members for s in groups[h]['services']}),
+            'first_seen': min(first_seen) if first_seen else None,
+            'last_seen': max(last_seen) if last_seen else None,
+            'error_type': top.get('error_type', ''),
+            'sample_message': top.get('sample_message', '')
+        }
+    return dict(sorted(result.items(), key=lambda item: -item[1]['count']))
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Motor de normalizacion de mensajes de error.
+
+Reemplaza las seis pasadas de re.sub de la version original por una sola
+pasada: todas las reglas se compilan una vez en una expresion con grupos
+nombrados y una tabla de despacho decide el reemplazo de cada coincidencia.
+Los espacios se colapsan al final con split/join, como antes. Ademas:
+- Reglas adicionales por servicio (se aplican despues de las reglas base)
+- Cache de resultados para mensajes crudos repetidos
+
+La semantica de referencia es la secuencial (cada regla sobre el resultado
+de la anterior), que es la que define los hashes de get_error_hash. La
+pasada unica solo difiere de ella cuando dos coincidencias se pisan; en ese
+caso, que se detecta durante la misma pasada, el mensaje se normaliza con
+las reglas secuenciales ya compiladas.
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+from typing import Optional
+
+# Reglas base en orden de prioridad: (nombre, patron, reemplazo)
+# El reemplazo puede ser un texto o una funcion que recibe el re.Match
+DEFAULT_RULES = [
+    ('timestamp', r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}', '[TIMESTAMP]'),
+    ('id', r'\b\d{10,}\b', '[ID]'),
+    ('uuid', r'(?i:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})', '[UUID]'),
+    ('path_id', r'/\d+/', '/[ID]/'),
+    ('ip', r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}', '[IP]'),
+    ('hex', r'0x[0-9a-fA-F]+', '[HEX]'),
+]
+
+# Toda regla base empieza con uno de estos caracteres: la expresion combinada
+# descarta el resto de posiciones sin probar cada alternativa
+DEFAULT_FIRST_CHARS = r'[\da-fA-F/]'
+
+CACHE_SIZE = 4096
+
+
+def _is_context_sensitive(pattern: str) -> bool:
+    """Reglas cuyo resultado depende de los caracteres vecinos."""
+    return any(token in pattern for token in (r'\b', r'\B', '(?=', '(?!', '(?<'))
+
+
+class _CompiledRules:
+    """Reglas de un servicio compiladas para la pasada unica y la secuencial."""
+
+    def __init__(self, rules: list, first_chars: Optional[str] = None):
+        self.rules = rules
+        self.single = [re.compile(pattern) for _, pattern, _ in rules]
+        alternatives = '|'.join(f'(?P<r{i}>{pattern})' for i, (_, pattern, _) in enumerate(rules))
+        if first_chars:
+            alternatives = f'(?={first_chars})(?:{alternatives})'
+        self.combined = re.compile(alternatives)
+        # Tabla de despacho: indice de grupo -> (prioridad, reemplazo)
+        self.dispatch = {self.combined.groupindex[f'r{i}']: (i, rule[2]) for i, rule in enumerate(rules)}
+        # Prioridad desde la cual hay reglas sensibles al contexto
+        sensitive = [i for i, (_, pattern, _) in enumerate(rules) if _is_context_sensitive(pattern)]
+        self.last_sensitive = max(sensitive) if sensitive else -1
+
+    def overlaps_higher_rule(self, message: str, priority: int, start: int, end: int) -> bool:
+        """Una regla de mayor prioridad empieza dentro de la coincidencia."""
+        for pos in range(start + 1, end):
+            for pattern in self.single[:priority]:
+                if pattern.match(message, pos):
+                    return True
+        return False
+
+    def touches_digit(self, message: str, priority: int, start: int, end: int) -> bool:
+        """
+        El reemplazo queda junto a un digito y una regla posterior depende del
+        contexto: en la version secuencial el reemplazo podria crear un limite
+        de palabra nuevo (p. ej. '[TIMESTAMP]123...' para la regla 'id').
+        """
+        if priority >= self.last_sensitive:
+            return False
+        before = message[start - 1:start]
+        after = message[end:end + 1]
+        return before.isdigit() or after.isdigit()
+
+    def sequential(self, message: str) -> str:
+        """Semantica de referencia: cada regla sobre el resultado de la anterior."""
+        for pattern, (_, _, replacement) in zip(self.single, self.rules):
+            message = pattern.sub(replacement, message)
+        return ' '.join(message.split())
+
+
+class ErrorNormalizer:
+    """Normalizador de una sola pasada con reglas base y reglas por servicio."""
+
+    def __init__(self, rules: Optional[list] = None, cache_size: int = CACHE_SIZE):
+        self.base_rules = list(DEFAULT_RULES if rules is None else rules)
+        self.service_rules = {}
+        self._compiled = {}
+        self._normalize_cached = lru_cache(maxsize=cache_size)(self._normalize)
+        self.fallbacks = 0
+
+    def register_service_rules(self, service: str, rules: list):
+        """Agrega reglas (nombre, patron, reemplazo) que solo aplican a service."""
+        self.service_rules.setdefault(service, []).extend(rules)
+        self._compiled.pop(service, None)
+        self._normalize_cached.cache_clear()
+
+    def _compile(self, service: Optional[str]) -> _CompiledRules:
+        if service not in self._compiled:
+            extra = self.service_rules.get(service, [])
+            first_chars = DEFAULT_FIRST_CHARS if self.base_rules == DEFAULT_RULES and not extra else None
+            self._compiled[service] = _CompiledRules(self.base_rules + extra, first_chars)
+        return self._compiled[service]
+
+    def _normalize(self, message: str, service: Optional[str]) -> str:
+        compiled = self._compile(service)
+        parts = []
+        last = 0
+
+        for match in compiled.combined.finditer(message):
+            priority, replacement = compiled.dispatch[match.lastindex]
+            start, end = match.span()
+            if (compiled.overlaps_higher_rule(message, priority, start, end)
+                    or compiled.touches_digit(message, priority, start, end)):
+                self.fallbacks += 1
+                return compiled.sequential(message)
+            parts.append(message[last:start])
+            parts.append(replacement(match) if callable(replacement) else replacement)
+            last = end
+
+        parts.append(message[last:])
+        return ' '.join(''.join(parts).split())
+
+    def normalize(self, message: str, service: Optional[str] = None) -> str:
+        """Normaliza un mensaje de error para comparacion."""
+        if not message:
+            return ""
+        # Servicios sin reglas propias comparten las entradas del cache
+        key = service if service in self.service_rules else None
+        return self._normalize_cached(message, key)
+
+    def cache_info(self):
+        return self._normalize_cached.cache_info()
+
+    def cache_clear(self):
+        self._normalize_cached.cache_clear()
+
+
+# Instancia compartida usada por consolidate_errors
+default_normalizer = ErrorNormalizer()
+
+
+def get_error_hash(service: str, message: str) -> str:
+    """Genera un hash unico para un tipo de error."""
+    normalized = default_normalizer.normalize(message, service)
+    # Tomar las primeras 500 caracteres del mensaje normalizado
+    key = f"{service}:{normalized[:500]}"
+    return hashlib.md5(key.encode()).hexdigest()[:12]
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Almacen SQLite opcional de errores (ERROR_STORE=sqlite).
+
+Guarda cada error una sola vez (insertId unico) con indices por servicio,
+timestamp, hash de grupo y revision, y resuelve con SQL indexado lo que los
+consumidores de los JSON hacen recorriendo listas: grupos por hash, top N
+por cantidad, limites de tiempo y ventanas por fecha. Tambien guarda el
+registro de issues (created_issues.json).
+
+El orden de insercion (seq) cumple el papel de la posicion en errors.json,
+asi consolidate_errors.consolidate_from_warehouse produce los mismos grupos
+que el recorrido de la lista.
+
+Exportar los JSON actuales desde la base:
+    python scripts/error_warehouse.py export
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime, timezone, timedelta
+from typing import Callable, Iterable, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from data_publish import write_compact
+from error_normalizer import get_error_hash
+from log_ingest import entry_id, parse_timestamp
+
+ERROR_STORE = os.environ.get('ERROR_STORE', 'json')
+WAREHOUSE_FILENAME = 'errors.db'
+RETENTION_DAYS = int(os.environ.get('ERROR_WAREHOUSE_RETENTION_DAYS', '90'))
+EXPORT_WINDOW_DAYS = 7  # Ventana de errors.json (la misma de la consulta de logs)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS errors (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    insert_id TEXT UNIQUE,
+    service TEXT NOT NULL,
+    revision TEXT,
+    timestamp TEXT,
+    ts REAL,
+    severity TEXT,
+    error_hash TEXT NOT NULL,
+    has_message INTEGER NOT NULL,
+    http_status INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_errors_service ON errors(service, ts);
+CREATE INDEX IF NOT EXISTS idx_errors_ts ON errors(ts);
+CREATE INDEX IF NOT EXISTS idx_errors_hash ON errors(error_hash, seq);
+CREATE INDEX IF NOT EXISTS idx_errors_revision ON errors(revision);
+CREATE TABLE IF NOT EXISTS issues (
+    error_hash TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+
+def warehouse_path(data_dir: str) -> str:
+    return os.environ.get('ERROR_WAREHOUSE_PATH') or os.path.join(data_dir, WAREHOUSE_FILENAME)
+
+
+def _epoch(timestamp: str, now: datetime) -> float:
+    # Sin timestamp valido cuenta la hora de insercion, asi la retencion lo expira
+    return (parse_timestamp(timestamp) or now).timestamp()
+
+
+def _insert_id(error: dict) -> str:
+    # Sin id (insertId) se usa un digest del contenido, como en log_ingest:
+    # un NULL no choca con el indice UNIQUE y el error se insertaria repetido
+    return error.get('id') or entry_id(error)
+
+
+class ErrorWarehouse:
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Errores
+    # ------------------------------------------------------------------
+
+    def insert_errors(self, errors: Iterable[dict],
+                      hash_fn: Optional[Callable[[str, str], str]] = None,
+                      now: Optional[datetime] = None) -> int:
+        """Inserta los errores no vistos (por insertId). Retorna cuantos se agregaron."""
+        hash_fn = hash_fn or get_error_hash
+        now = now or datetime.now(timezone.utc)
+        rows = []
+        for error in errors:
+            service = error.get('service', 'unknown')
+            message = error.get('message', '')
+            timestamp = error.get('timestamp', '')
+            rows.append((
+                _insert_id(error),
+                service,
+                error.get('revision'),
+                timestamp,
+                _epoch(timestamp, now),
+                error.get('severity'),
+                hash_fn(service, message),
+                1 if message else 0,
+                (error.get('httpRequest') or {}).get('status'),
+                json.dumps(error, separators=(',', ':'))
+            ))
+        before = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO errors (insert_id, service, revision, timestamp, ts, severity, '
+                'error_hash, has_message, http_status, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        return self.conn.total_changes - before
+
+    def expire(self, days: int = RETENTION_DAYS, now: Optional[datetime] = None) -> int:
+        """Elimina los errores mas antiguos que la retencion."""
+        now = now or datetime.now(timezone.utc)
+        with self.conn:
+            # ts NULL: filas de versiones anteriores sin timestamp valido
+            cursor = self.conn.execute('DELETE FROM errors WHERE ts < ? OR ts IS NULL',
+                                       ((now - timedelta(days=days)).timestamp(),))
+        return cursor.rowcount
+
+    def errors_between(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                       service: Optional[str] = None) -> list:
+        """Errores en [start, end) en orden de insercion."""
+        clauses, params = [], []
+        if start:
+            clauses.append('ts >= ?')
+            params.append(start.timestamp())
+        if end:
+            clauses.append('ts < ?')
+            params.append(end.timestamp())
+        if service:
+            clauses.append('service = ?')
+            params.append(service)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        return [json.loads(data) for (data,) in
+                self.conn.execute(f'SELECT data FROM errors {where} ORDER BY seq', params)]
+
+    def count(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM errors').fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Grupos
+    # ------------------------------------------------------------------
+
+    def top_groups(self, limit: int = 10, min_count: int = 1) -> list:
+        """[(hash, cantidad)] de los grupos con mas ocurrencias."""
+        return self.conn.execute(
+            'SELECT error_hash, COUNT(*) AS n FROM errors GROUP BY error_hash '
+            'HAVING n >= ? ORDER BY n DESC, MIN(seq) LIMIT ?', (min_count, limit)).fetchall()
+
+    def time_bounds(self, error_hash: str) -> tuple:
+        """(primera, ultima) ocurrencia de un grupo."""
+        return self.conn.execute(
+            "SELECT MIN(NULLIF(timestamp, '')), MAX(NULLIF(timestamp, '')) FROM errors WHERE error_hash = ?",
+            (error_hash,)).fetchone()
+
+    def group_rows(self, occurrences: int = 5) -> dict:
+        """
+        Datos por hash para armar los grupos consolidados: cantidad, primera
+        posicion, limites de tiempo, servicios, revisiones, muestra (el primer
+        error con mensaje o, si ninguno tiene, el ultimo) y ocurrencias mas
+        recientes.
+        """
+        groups = {}
+        for error_hash, count, first_seq, first_seen, last_seen, sample_seq in self.conn.execute(
+                "SELECT error_hash, COUNT(*), MIN(seq), MIN(NULLIF(timestamp, '')), "
+                "MAX(NULLIF(timestamp, '')), COALESCE(MIN(CASE WHEN has_message THEN seq END), MAX(seq)) "
+                "FROM errors GROUP BY error_hash"):
+            groups[error_hash] = {
+                'count': count, 'first_seq': first_seq, 'first_seen': first_seen,
+                'last_seen': last_seen, 'sample_seq': sample_seq,
+                'services': [], 'revisions': [], 'occurrences': []
+            }
+
+        for error_hash, service in self.conn.execute(
+                'SELECT DISTINCT error_hash, service FROM errors ORDER BY error_hash, service'):
+            groups[error_hash]['services'].append(service)
+        for error_hash, revision in self.conn.execute(
+                "SELECT DISTINCT error_hash, revision FROM errors WHERE revision IS NOT NULL AND revision != '' "
+                "ORDER BY error_hash, revision"):
+            groups[error_hash]['revisions'].append(revision)
+
+        samples = {g['sample_seq']: error_hash for error_hash, g in groups.items()}
+        for seq, data in self.conn.execute(
+                'SELECT seq, data FROM errors WHERE seq IN (SELECT value FROM json_each(?))',
+                (json.dumps(list(samples)),)):
+            groups[samples[seq]]['sample'] = json.loads(data)
+
+        for error_hash, seq, data in self.conn.execute(
+                'SELECT error_hash, seq, data FROM ('
+                '  SELECT error_hash, seq, data, '
+                '         ROW_NUMBER() OVER (PARTITION BY error_hash ORDER BY timestamp DESC, seq) AS n '
+                '  FROM errors'
+                ') WHERE n <= ? ORDER BY error_hash, n', (occurrences,)):
+            groups[error_hash]['occurrences'].append((seq, json.loads(data)))
+        return groups
+
+    # ------------------------------------------------------------------
+    # Registro de issues
+    # ------------------------------------------------------------------
+
+    def save_issue_records(self, records: dict):
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO issues (error_hash, data) VALUES (?, ?)',
+                [(error_hash, json.dumps(record)) for error_hash, record in records.items()])
+
+    def issue_records(self) -> list:
+        return [json.loads(data) for (data,) in
+                self.conn.execute('SELECT data FROM issues ORDER BY error_hash')]
+
+    # ------------------------------------------------------------------
+    # Exportacion a los JSON del dashboard
+    # ------------------------------------------------------------------
+
+    def export_json(self, data_dir: str, now: Optional[datetime] = None) -> dict:
+        """Escribe errors.json, consolidated_errors.json y created_issues.json desde la base."""
+        from consolidate_errors import consolidate_from_warehouse
+
+        now = now or datetime.now(timezone.utc)
+        errors = self.errors_between(now - timedelta(days=EXPORT_WINDOW_DAYS))
+        consolidated = consolidate_from_warehouse(self)
+        records = self.issue_records()
+        # Mismo formato que escriben update_data.py y consolidate_errors.py
+        write_compact(os.path.join(data_dir, 'errors.json'), errors, gzip_copy=False)
+        for filename, data in (('consolidated_errors.json', consolidated), ('created_issues.json', records)):
+            with open(os.path.join(data_dir, filename), 'w') as f:
+                json.dump(data, f, indent=2)
+        return {'errors.json': len(errors), 'consolidated_errors.json': len(consolidated),
+                'created_issues.json': len(records)}
+
+
+def main():
+    data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+    path = warehouse_path(data_dir)
+    if len(sys.argv) < 2 or sys.argv[1] != 'export':
+        print("Uso: python scripts/error_warehouse.py export")
+        return
+    if not os.path.exists(path):
+        print(f"Base no encontrada: {path}")
+        return
+    warehouse = ErrorWarehouse(path)
+    for filename, count in warehouse.export_json(data_dir).items():
+        print(f"  {filename}: {count}")
+    warehouse.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Cliente HTTP de la API REST de GitHub (sin el CLI `gh`).
+
+- Pool de conexiones keep-alive (http.client) compartido entre hilos
+- Requests condicionales con ETag / If-None-Match: una respuesta 304 no
+  consume rate limit y reutiliza el contenido guardado (el cache de ETags
+  se puede persistir entre ejecuciones)
+- Paginacion siguiendo el header Link (rel="next")
+- Creacion de issues en paralelo con concurrencia acotada
+
+GITHUB_API_URL permite apuntar el cliente a un servidor local de pruebas.
+El token se toma de GITHUB_TOKEN / GH_TOKEN o, si no estan, de `gh auth token`.
+"""
+
+import http.client
+import json
+import os
+import queue
+import re
+import subprocess
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+GITHUB_API_URL = os.environ.get('GITHUB_API_URL', 'https://api.github.com')
+POOL_SIZE = int(os.environ.get('GITHUB_POOL_SIZE', '4'))
+MAX_CONCURRENCY = int(os.environ.get('GITHUB_MAX_CONCURRENCY', '3'))
+
+_LINK_NEXT = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+# Metodos que se pueden repetir si el servidor corta la conexion sin responder
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'})
+
+# Campos de /user/repos que usa el dashboard (lo unico que se guarda en el cache)
+REPO_FIELDS = ('name', 'html_url', 'description', 'updated_at')
+
+
+class GitHubError(Exception):
+    """Respuesta de error de la API (status_code >= 400)."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"GitHub API {status_code}: {message}")
+        self.status_code = status_code
+
+
+class GitHubResponse:
+    def __init__(self, status: int, headers: dict, data, from_cache: bool = False):
+        self.status = status
+        self.headers = headers
+        self.data = data
+        self.from_cache = from_cache
+
+
+def default_token() -> Optional[str]:
+    token = os.environ.get('GITHUB_TOKEN') or os.environ.get('GH_TOKEN')
+    if token:
+        return token
+    try:
+        result = subprocess.run('gh auth token 2>/dev/null', shell=True,
+                                capture_output=True, text=True, timeout=15)
+        return result.stdout.strip() or None
+    except Exception:
+        return None
+
+
+class ConnectionPool:
+    """Conexiones keep-alive reutilizables hacia un mismo host."""
+
+    def __init__(self, base_url: str, size: int = POOL_SIZE, timeout: int = 30):
+        parsed = urllib.parse.urlsplit(base_url)
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.base_path = parsed.path.rstrip('/')
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.created = 0
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        self.created += 1
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    @contextmanager
+    def connection(self, fresh: bool = False):
+        self._slots.acquire()
+        conn = None
+        reusable = False
+        try:
+            if not fresh:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    pass
+            conn = conn or self._new_connection()
+            yield conn
+            reusable = True
+        finally:
+            if conn is not None:
+                if reusable:
+                    self._idle.put(conn)
+                else:
+                    conn.close()
+            self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def project_items(data, fields: Optional[tuple]):
+    """Reduce cada elemento de una pagina a los campos indicados."""
+    if not fields or not isinstance(data, list):
+        return data
+    return [{k: item[k] for k in fields if k in item} if isinstance(item, dict) else item
+            for item in data]
+
+
+class ETagCache:
+    """Cache {url: {'etag', 'data', 'link'}} opcionalmente persistido en disco."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.entries = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"  Cache de ETags ilegible, se reinicia: {e}")
+
+    def get(self, url: str) -> Optional[dict]:
+        with self._lock:
+            return self.entries.get(url)
+
+    def put(self, url: str, etag: str, data, link: Optional[str]):
+        with self._lock:
+            self.entries[url] = {'etag': etag, 'data': data, 'link': link}
+
+    def save(self):
+        if self.path:
+            with self._lock:
+                with open(self.path, 'w') as f:
+                    json.dump(self.entries, f, separators=(',', ':'))
+
+
+class GitHubClient:
+    """Cliente minimo de la API REST v3 de GitHub."""
+
+    def __init__(self, repo: Optional[str] = None, token: Optional[str] = None,
+                 base_url: Optional[str] = None, pool_size: int = POOL_SIZE,
+                 etag_cache: Optional[ETagCache] = None, timeout: int = 30):
+        self.repo = repo
+        self.token = token if token is not None else default_token()
+        self.pool = ConnectionPool(base_url or GITHUB_API_URL, pool_size, timeout)
+        self.etags = etag_cache or ETagCache()
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+
+    def _headers(self, extra: Optional[dict] = None) -> dict:
+        headers = {
+            'Accept': 'application/vnd.github+json',
+            'User-Agent': 'indunnova-dashboard',
+            'X-GitHub-Api-Version': '2022-11-28',
+            'Connection': 'keep-alive'
+        }
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        headers.update(extra or {})
+        return headers
+
+    def _target(self, path: str, params: Optional[dict] = None) -> str:
+        """Ruta relativa al host (acepta tambien URLs absolutas de Link)."""
+        if path.startswith('http'):
+            parsed = urllib.parse.urlsplit(path)
+            return parsed.path + (f'?{parsed.query}' if parsed.query else '')
+        target = f"{self.pool.base_path}/{path.lstrip('/')}"
+        if params:
+            target += '?' + urllib.parse.urlencode(params)
+        return target
+
+    def request(self, method: str, path: str, params: Optional[dict] = None,
+                body: Optional[dict] = None, fields: Optional[tuple] = None) -> GitHubResponse:
+        """
+        Ejecuta una request. Si se pasan fields, los elementos de la respuesta
+        se reducen a esos campos antes de guardarlos en el cache de ETags.
+        """
+        target = self._target(path, params)
+        cached = self.etags.get(target) if method == 'GET' else None
+        headers = self._headers({'If-None-Match': cached['etag']} if cached else None)
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        if payload is not None:
+            headers['Content-Type'] = 'application/json'
+
+        for attempt in range(2):
+            try:
+                with self.pool.connection(fresh=attempt > 0) as conn:
+                    conn.request(method, target, body=payload, headers=headers)
+                    response = conn.getresponse()
+                    # Leer todo el cuerpo para poder reutilizar la conexion
+                    raw = response.read()
+                    status = response.status
+                    response_headers = {k.lower(): v for k, v in response.getheaders()}
+                break
+            except (BrokenPipeError, http.client.CannotSendRequest):
+                # La request no llego a enviarse: reintentar con una conexion nueva
+                if attempt:
+                    raise
+            except (http.client.RemoteDisconnected, ConnectionResetError, http.client.BadStatusLine):
+                # Conexion keep-alive cerrada por el servidor. Si la request se
+                # envio, el servidor pudo procesarla: solo se repite si es idempotente
+                if attempt or method not in IDEMPOTENT_METHODS:
+                    raise
+
+        with self._lock:
+            self.requests += 1
+
+        if status == 304 and cached:
+            with self._lock:
+                self.not_modified += 1
+            headers_cached = dict(response_headers)
+            if cached.get('link'):
+                headers_cached['link'] = cached['link']
+            data = project_items(cached['data'], fields)
+            if data != cached['data']:
+                # Entradas guardadas antes de proyectar: se reducen al reutilizarlas
+                self.etags.put(target, cached['etag'], data, cached.get('link'))
+            return GitHubResponse(200, headers_cached, data, from_cache=True)
+
+        data = json.loads(raw.decode('utf-8')) if raw else None
+        if status >= 400:
+            message = data.get('message', '') if isinstance(data, dict) else raw[:200]
+            raise GitHubError(status, message)
+        data = project_items(data, fields)
+
+        if method == 'GET' and response_headers.get('etag'):
+            self.etags.put(target, response_headers['etag'], data, response_headers.get('link'))
+        return GitHubResponse(status, response_headers, data)
+
+    def paginate(self, path: str, params: Optional[dict] = None,
+                 max_items: Optional[int] = None, fields: Optional[tuple] = None) -> Iterator[dict]:
+        """Itera los elementos de todas las paginas (header Link rel="next")."""
+        url = path
+        page_params = dict(params or {})
+        page_params.setdefault('per_page', 100)
+        count = 0
+        while url:
+            response = self.request('GET', url, page_params, fields=fields)
+            items = response.data or []
+            if isinstance(items, dict):
+                items = items.get('items', [])
+            for item in items:
+                yield item
+                count += 1
+                if max_items and count >= max_items:
+                    return
+            match = _LINK_NEXT.search(response.headers.get('link', '') or '')
+            url = match.group(1) if match else None
+            page_params = None  # La URL de Link ya trae los parametros
+
+    # ------------------------------------------------------------------
+    # Operaciones usadas por el dashboard
+    # ------------------------------------------------------------------
+
+    def list_issues(self, labels: str, state: str = 'all', since: Optional[str] = None) -> list:
+        params = {'labels': labels, 'state': state}
+        if since:
+            params['since'] = since
+        return list(self.paginate(f'repos/{self.repo}/issues', params))
+
+    def search_issues(self, query: str, limit: int = 1) -> list:
+        params = {'q': f'{query} repo:{self.repo} is:issue', 'per_page': limit}
+        return list(self.paginate('search/issues', params, max_items=limit))
+
+    def create_issue(self, title: str, body: str, labels: list) -> dict:
+        response = self.request('POST', f'repos/{self.repo}/issues',
+                                body={'title': title, 'body': body, 'labels': labels})
+        return response.data
+
+    def comment_issue(self, number: int, body: str) -> dict:
+        return self.request('POST', f'repos/{self.repo}/issues/{number}/comments', body={'body': body}).data
+
+    def set_issue_state(self, number: int, state: str, reason: Optional[str] = None) -> dict:
+        body = {'state': state}
+        if reason:
+            body['state_reason'] = reason
+        return self.request('PATCH', f'repos/{self.repo}/issues/{number}', body=body).data
+
+    def run_batch(self, calls: dict, max_concurrency: int = MAX_CONCURRENCY) -> dict:
+        """
+        Ejecuta varias operaciones ({clave: funcion sin argumentos}) con
+        concurrencia acotada. Retorna {clave: resultado o excepcion}.
+        """
+        def run(call):
+            try:
+                return call()
+            except Exception as e:
+                return e
+
+        if not calls:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(calls)))) as executor:
+            futures = {key: executor.submit(run, call) for key, call in calls.items()}
+            return {key: future.result() for key, future in futures.items()}
+
+    def create_issues(self, issues: dict, max_concurrency: int = MAX_CONCURRENCY) -> dict:
+        """
+        Crea varios issues ({clave: {'title', 'body', 'labels'}}) con
+        concurrencia acotada. Retorna {clave: issue o excepcion}.
+        """
+        return self.run_batch({
+            key: (lambda issue=issue: self.create_issue(issue['title'], issue['body'], issue['labels']))
+            for key, issue in issues.items()
+        }, max_concurrency)
+
+    def list_user_repos(self, limit: int = 100) -> list:
+        params = {'affiliation': 'owner', 'sort': 'updated'}
+        return list(self.paginate('user/repos', params, max_items=limit, fields=REPO_FIELDS))
+
+    def close(self):
+        self.pool.close()
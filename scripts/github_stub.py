@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Servidor HTTP local que imita los endpoints de GitHub usados por el
+dashboard (issues, search, user/repos), para probar github_client sin red.
+
+- Respuestas paginadas con header Link
+- ETag en los GET; responde 304 si coincide If-None-Match
+- HTTP/1.1 keep-alive (cuenta las conexiones abiertas)
+- drop_responses: corta la conexion sin responder (despues de procesar la request)
+
+Uso como verificacion rapida:
+    python scripts/github_stub.py
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+class StubGitHub:
+    """Estado del servidor falso."""
+
+    def __init__(self, repo: str = 'owner/repo', issues: int = 0, repos: int = 5, latency: float = 0.0):
+        self.repo = repo
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.issues = []
+        self.repos = [{'name': f'repo-{i}', 'html_url': f'https://github.com/owner/repo-{i}',
+                       'description': None, 'updated_at': '2026-01-01T00:00:00Z'} for i in range(repos)]
+        self.connections = 0
+        self.requests = 0
+        self.not_modified = 0
+        self.drop_responses = 0
+        for i in range(issues):
+            self.add_issue(f'[ERROR-{i:012x}] Error {i}', ['bug', 'auto-generated'])
+
+    def add_issue(self, title: str, labels: list) -> dict:
+        with self.lock:
+            number = len(self.issues) + 1
+            issue = {
+                'number': number,
+                'title': title,
+                'state': 'open',
+                'labels': [{'name': name} for name in labels],
+                'html_url': f'https://github.com/{self.repo}/issues/{number}',
+                'updated_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                'closed_at': None,
+                'comments': []
+            }
+            self.issues.append(issue)
+            return issue
+
+
+def make_handler(stub: StubGitHub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def setup(self):
+            super().setup()
+            with stub.lock:
+                stub.connections += 1
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, data=None, headers: dict = None):
+            with stub.lock:
+                drop = stub.drop_responses > 0
+                stub.drop_responses -= drop
+            if drop:
+                self.close_connection = True
+                return
+            body = json.dumps(data).encode('utf-8') if data is not None else b''
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _paged(self, items: list, query: dict, path: str):
+            per_page = int(query.get('per_page', ['30'])[0])
+            page = int(query.get('page', ['1'])[0])
+            chunk = items[(page - 1) * per_page:page * per_page]
+            headers = {}
+            if page * per_page < len(items):
+                next_query = {k: v[0] for k, v in query.items()}
+                next_query['page'] = page + 1
+                headers['Link'] = (f'<http://{self.headers["Host"]}{path}?'
+                                   f'{urllib.parse.urlencode(next_query)}>; rel="next"')
+            etag = '"' + hashlib.md5(json.dumps(chunk, sort_keys=True).encode()).hexdigest() + '"'
+            headers['ETag'] = etag
+            if self.headers.get('If-None-Match') == etag:
+                with stub.lock:
+                    stub.not_modified += 1
+                self._send(304, headers=headers)
+            else:
+                self._send(200, chunk, headers)
+
+        def do_GET(self):
+            with stub.lock:
+                stub.requests += 1
+            if stub.latency:
+                time.sleep(stub.latency)
+            parsed = urllib.parse.urlsplit(self.path)
+            query = urllib.parse.parse_qs(parsed.query)
+            if parsed.path == f'/repos/{stub.repo}/issues':
+                label = query.get('labels', [''])[0]
+                since = query.get('since', [''])[0]
+                items = [i for i in stub.issues
+                         if (not label or label in [l['name'] for l in i['labels']])
+                         and (not since or i['updated_at'] >= since)]
+                self._paged([{k: v for k, v in i.items() if k != 'comments'} for i in items], query, parsed.path)
+            elif parsed.path == '/search/issues':
+                q = query.get('q', [''])[0]
+                term = q.split('"')[1] if '"' in q else q
+                items = [i for i in stub.issues if term in i['title']]
+                self._send(200, {'total_count': len(items), 'items': items[:int(query.get('per_page', ['30'])[0])]})
+            elif parsed.path == '/user/repos':
+                self._paged(stub.repos, query, parsed.path)
+            else:
+                self._send(404, {'message': 'Not Found'})
+
+        def _body(self) -> dict:
+            length = int(self.headers.get('Content-Length', 0))
+            return json.loads(self.rfile.read(length) or b'{}')
+
+        def do_POST(self):
+            with stub.lock:
+                stub.requests += 1
+            if stub.latency:
+                time.sleep(stub.latency)
+            parsed = urllib.parse.urlsplit(self.path)
+            body = self._body()
+            parts = parsed.path.strip('/').split('/')
+            if parsed.path == f'/repos/{stub.repo}/issues':
+                issue = stub.add_issue(body['title'], body.get('labels', []))
+                self._send(201, {k: v for k, v in issue.items() if k != 'comments'})
+            elif len(parts) == 6 and parts[3] == 'issues' and parts[5] == 'comments':
+                issue = stub.issues[int(parts[4]) - 1]
+                issue['comments'].append(body.get('body', ''))
+                self._send(201, {'id': len(issue['comments']), 'body': body.get('body', '')})
+            else:
+                self._send(404, {'message': 'Not Found'})
+
+        def do_PATCH(self):
+            with stub.lock:
+                stub.requests += 1
+            parsed = urllib.parse.urlsplit(self.path)
+            parts = parsed.path.strip('/').split('/')
+            body = self._body()
+            if len(parts) == 5 and parts[3] == 'issues':
+                issue = stub.issues[int(parts[4]) - 1]
+                if 'state' in body:
+                    issue['state'] = body['state']
+                    issue['closed_at'] = time.strftime('%Y-%m-%dT%H:%M:%SZ') if body['state'] == 'closed' else None
+                issue['updated_at'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+                self._send(200, {k: v for k, v in issue.items() if k != 'comments'})
+            else:
+                self._send(404, {'message': 'Not Found'})
+
+    return Handler
+
+
+def start_stub(stub: StubGitHub) -> ThreadingHTTPServer:
+    """Inicia el servidor en un puerto libre (server.server_address) en segundo plano."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(stub))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    from github_client import GitHubClient
+
+    stub = StubGitHub(issues=250, latency=0.05)
+    server = start_stub(stub)
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    client = GitHubClient('owner/repo', token='test', base_url=base_url)
+
+    issues = client.list_issues('auto-generated')
+    print(f"Issues listados: {len(issues)} en {client.requests} paginas")
+    client.list_issues('auto-generated')
+    print(f"Segunda lectura: {client.not_modified} respuestas 304 (ETag)")
+
+    payloads = {str(i): {'title': f'[ERROR-{i:012x}] Nuevo', 'body': 'x', 'labels': ['auto-generated']}
+                for i in range(1000, 1012)}
+    start = time.perf_counter()
+    created = client.create_issues(payloads, max_concurrency=4)
+    elapsed = time.perf_counter() - start
+    ok = sum(1 for r in created.values() if not isinstance(r, Exception))
+    print(f"Issues creados: {ok}/{len(payloads)} en {elapsed:.2f}s (latencia simulada {stub.latency}s)")
+    print(f"Requests: {stub.requests}, conexiones TCP: {stub.connections}")
+
+    client.close()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Historial de metricas por servicio (data/history/), alimentado por cada
+ejecucion de update_data.py.
+
+Almacenamiento columnar y solo de agregado:
+- raw/<YYYY-MM-DD>.json: una fila por servicio por ejecucion (mas una fila
+  '_project' con los totales de meta.json). Se conservan
+  HISTORY_RAW_RETENTION_DAYS dias.
+- daily/<YYYY-MM>.json: rollups diarios (muestras, promedio, maximo, ultimo
+  valor y cambios de estado de salud) materializados al cerrar cada dia. Se
+  conservan HISTORY_DAILY_RETENTION_DAYS dias.
+
+Cada archivo guarda columnas ({'ts': [...], 'service': [...], metrica: [...]})
+con los timestamps en codificacion delta y los servicios como indices de un
+diccionario. Los rollups por hora salen de los datos crudos, los diarios de
+los archivos mensuales y los semanales de los diarios: una consulta de meses
+lee unos pocos archivos sin importar cuantas ejecuciones (o commits) hubo.
+
+Uso:
+    python scripts/history_store.py errors24h day [servicio]
+"""
+
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone, timedelta
+from typing import Optional
+
+from data_publish import write_compact
+
+RAW_RETENTION_DAYS = int(os.environ.get('HISTORY_RAW_RETENTION_DAYS', '35'))
+DAILY_RETENTION_DAYS = int(os.environ.get('HISTORY_DAILY_RETENTION_DAYS', '730'))
+PROJECT = '_project'
+FORMAT_VERSION = 1
+
+METRICS = ('healthy', 'errors24h', 'errors7d', 'deploys24h', 'deploys7d',
+           'requests7d', 'requests30d', 'errors5xx', 'latencyMs', 'cost')
+ROLLUP_STATS = ('avg', 'max', 'last')
+RESOLUTIONS = {'hour': 3600, 'day': 86400, 'week': 7 * 86400}
+
+
+def service_row(service: dict) -> dict:
+    interactions = service.get('interactions') or {}
+    latency = (interactions.get('latency') or {}).get('p50Ms') or (service.get('metrics') or {}).get('avgLatencyMs', 0)
+    return {
+        'healthy': 1 if service.get('status') == 'True' else 0,
+        'errors24h': service['errors'].get('last24h', 0),
+        'errors7d': service['errors'].get('last7d', 0),
+        'deploys24h': service['deployments'].get('last24h', 0),
+        'deploys7d': service['deployments'].get('last7d', 0),
+        'requests7d': interactions.get('requests7d', 0) or 0,
+        'requests30d': interactions.get('requests30d', 0) or 0,
+        'errors5xx': (service.get('metrics') or {}).get('errors5xx', 0),
+        'latencyMs': latency or 0,
+        'cost': (service.get('costEstimate') or {}).get('totalWithSql', 0)
+    }
+
+
+def project_row(meta: dict) -> dict:
+    """Totales del proyecto; en esta fila 'healthy' es la cantidad de servicios sanos."""
+    return {
+        'healthy': meta.get('healthyServices', 0),
+        'errors24h': meta.get('totalErrors24h', 0),
+        'errors7d': meta.get('totalErrors7d', 0),
+        'deploys24h': meta.get('totalDeployments24h', 0),
+        'deploys7d': meta.get('totalDeployments7d', 0),
+        'requests7d': 0,
+        'requests30d': 0,
+        'errors5xx': 0,
+        'latencyMs': 0,
+        'cost': (meta.get('costs') or {}).get('total', 0)
+    }
+
+
+class Segment:
+    """Tabla columnar: ts (epoch), service y una columna por campo."""
+
+    def __init__(self, fields: tuple):
+        self.fields = fields
+        self.services = []
+        self._service_ids = {}
+        self.ts = []
+        self.service = []
+        self.columns = {name: [] for name in fields}
+
+    def __len__(self):
+        return len(self.ts)
+
+    def append(self, ts: int, service: str, values: dict):
+        if service not in self._service_ids:
+            self._service_ids[service] = len(self.services)
+            self.services.append(service)
+        self.ts.append(ts)
+        self.service.append(self._service_ids[service])
+        for name in self.fields:
+            self.columns[name].append(values.get(name, 0))
+
+    def rows(self, service: Optional[str] = None, start: Optional[int] = None, end: Optional[int] = None):
+        """Filas (ts, servicio, {campo: valor}) filtradas, en orden de insercion."""
+        wanted = self._service_ids.get(service) if service else None
+        if service and wanted is None:
+            return
+        for i, ts in enumerate(self.ts):
+            if (wanted is not None and self.service[i] != wanted) or \
+               (start is not None and ts < start) or (end is not None and ts >= end):
+                continue
+            yield ts, self.services[self.service[i]], {name: self.columns[name][i] for name in self.fields}
+
+    def to_dict(self) -> dict:
+        deltas = [b - a for a, b in zip([0] + self.ts, self.ts)]
+        return {'version': FORMAT_VERSION, 'services': self.services, 'ts': deltas,
+                'service': self.service, 'columns': self.columns}
+
+    @classmethod
+    def from_dict(cls, data: dict, fields: tuple) -> 'Segment':
+        segment = cls(fields)
+        segment.services = data['services']
+        segment._service_ids = {name: i for i, name in enumerate(segment.services)}
+        total = 0
+        for delta in data['ts']:
+            total += delta
+            segment.ts.append(total)
+        segment.service = data['service']
+        for name in fields:
+            segment.columns[name] = data['columns'].get(name, [0] * len(segment.ts))
+        return segment
+
+
+ROLLUP_FIELDS = ('samples', 'flaps') + tuple(f'{m}.{s}' for m in METRICS for s in ROLLUP_STATS)
+
+
+def _bucket_start(ts: int, resolution: str) -> int:
+    if resolution == 'week':
+        # Semanas ISO: empiezan el lunes (1970-01-01 fue jueves)
+        return ts - (ts - 4 * 86400) % RESOLUTIONS['week']
+    return ts - ts % RESOLUTIONS[resolution]
+
+
+def rollup_rows(rows, resolution: str) -> dict:
+    """Rollup de filas crudas: {(bucket, servicio): {campo de ROLLUP_FIELDS: valor}}."""
+    result = {}
+    for ts, service, values in rows:
+        key = (_bucket_start(ts, resolution), service)
+        acc = result.get(key)
+        if acc is None:
+            acc = result[key] = {'samples': 0, 'flaps': 0, '_sum': dict.fromkeys(METRICS, 0)}
+            for metric in METRICS:
+                acc[f'{metric}.max'] = values[metric]
+        elif acc['healthy.last'] != values['healthy']:
+            acc['flaps'] += 1
+        acc['samples'] += 1
+        for metric in METRICS:
+            acc['_sum'][metric] += values[metric]
+            acc[f'{metric}.max'] = max(acc[f'{metric}.max'], values[metric])
+            acc[f'{metric}.last'] = values[metric]
+    for acc in result.values():
+        sums = acc.pop('_sum')
+        for metric in METRICS:
+            acc[f'{metric}.avg'] = round(sums[metric] / acc['samples'], 4)
+    return result
+
+
+def merge_rollups(rows, resolution: str) -> dict:
+    """Rollup de rollups (p. ej. semanas a partir de dias), ponderado por muestras."""
+    result = {}
+    for ts, service, values in rows:
+        key = (_bucket_start(ts, resolution), service)
+        acc = result.get(key)
+        if acc is None:
+            result[key] = dict(values)
+            continue
+        samples = acc['samples'] + values['samples']
+        for metric in METRICS:
+            acc[f'{metric}.avg'] = round((acc[f'{metric}.avg'] * acc['samples']
+                                          + values[f'{metric}.avg'] * values['samples']) / samples, 4)
+            acc[f'{metric}.max'] = max(acc[f'{metric}.max'], values[f'{metric}.max'])
+            acc[f'{metric}.last'] = values[f'{metric}.last']
+        acc['flaps'] += values['flaps']
+        acc['samples'] = samples
+    return result
+
+
+def _day(ts: int) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%d')
+
+
+def _epoch(day: str) -> int:
+    return int(datetime.strptime(day, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp())
+
+
+class HistoryStore:
+    def __init__(self, root: str):
+        self.root = root
+        self.raw_dir = os.path.join(root, 'raw')
+        self.daily_dir = os.path.join(root, 'daily')
+        self._cache = {}
+
+    def _load(self, path: str, fields: tuple) -> Segment:
+        if path not in self._cache:
+            segment = Segment(fields)
+            if os.path.exists(path):
+                try:
+                    with open(path, 'r') as f:
+                        segment = Segment.from_dict(json.load(f), fields)
+                except (OSError, json.JSONDecodeError, KeyError) as e:
+                    print(f"  Segmento de historial ilegible ({os.path.basename(path)}): {e}")
+            self._cache[path] = segment
+        return self._cache[path]
+
+    def _raw(self, day: str) -> Segment:
+        return self._load(os.path.join(self.raw_dir, f'{day}.json'), METRICS)
+
+    def _daily(self, month: str) -> Segment:
+        return self._load(os.path.join(self.daily_dir, f'{month}.json'), ROLLUP_FIELDS)
+
+    def _save(self, path: str, segment: Segment):
+        write_compact(path, segment.to_dict(), gzip_copy=False)
+
+    @staticmethod
+    def _files(directory: str) -> list:
+        if not os.path.isdir(directory):
+            return []
+        return sorted(f[:-5] for f in os.listdir(directory) if f.endswith('.json'))
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+
+    def record(self, services: list, meta: dict, now: Optional[datetime] = None) -> int:
+        """Agrega las filas de una ejecucion. Retorna la cantidad de filas agregadas."""
+        now = now or datetime.now(timezone.utc)
+        ts = int(now.timestamp())
+        day = _day(ts)
+        segment = self._raw(day)
+        if segment.ts and segment.ts[-1] >= ts:
+            return 0
+        for service in services:
+            segment.append(ts, service['name'], service_row(service))
+        segment.append(ts, PROJECT, project_row(meta))
+        self._save(os.path.join(self.raw_dir, f'{day}.json'), segment)
+        self.compact(now)
+        return len(services) + 1
+
+    def compact(self, now: Optional[datetime] = None):
+        """Materializa los rollups de los dias cerrados y aplica la retencion."""
+        now = now or datetime.now(timezone.utc)
+        today = now.strftime('%Y-%m-%d')
+        changed = set()
+        for day in self._files(self.raw_dir):
+            if day >= today:
+                continue
+            month = day[:7]
+            daily = self._daily(month)
+            start = _epoch(day)
+            if any(ts == start for ts in daily.ts):
+                continue
+            for (bucket, service), values in sorted(rollup_rows(self._raw(day).rows(), 'day').items()):
+                daily.append(bucket, service, values)
+            changed.add(month)
+        for month in sorted(changed):
+            self._save(os.path.join(self.daily_dir, f'{month}.json'), self._daily(month))
+
+        raw_limit = (now - timedelta(days=RAW_RETENTION_DAYS)).strftime('%Y-%m-%d')
+        for day in self._files(self.raw_dir):
+            if day < raw_limit:
+                os.remove(os.path.join(self.raw_dir, f'{day}.json'))
+                self._cache.pop(os.path.join(self.raw_dir, f'{day}.json'), None)
+        daily_limit = (now - timedelta(days=DAILY_RETENTION_DAYS)).strftime('%Y-%m')
+        for month in self._files(self.daily_dir):
+            if month < daily_limit:
+                os.remove(os.path.join(self.daily_dir, f'{month}.json'))
+                self._cache.pop(os.path.join(self.daily_dir, f'{month}.json'), None)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def raw_rows(self, service: Optional[str] = None, start: Optional[int] = None, end: Optional[int] = None):
+        for day in self._files(self.raw_dir):
+            day_start = _epoch(day)
+            if (end is not None and day_start >= end) or (start is not None and day_start + 86400 <= start):
+                continue
+            yield from self._raw(day).rows(service, start, end)
+
+    def daily_rows(self, service: Optional[str] = None, start: Optional[int] = None, end: Optional[int] = None):
+        """Rollups diarios materializados mas el dia en curso (desde los datos crudos)."""
+        last = None
+        for month in self._files(self.daily_dir):
+            for row in self._daily(month).rows(service, start, end):
+                last = row[0] if last is None else max(last, row[0])
+                yield row
+        pending = self.raw_rows(service, max(start or 0, (last or -86400) + 86400), end)
+        for (bucket, name), values in sorted(rollup_rows(pending, 'day').items()):
+            yield bucket, name, values
+
+    def query(self, metric: str, resolution: str = 'day', service: Optional[str] = None,
+              start: Optional[datetime] = None, end: Optional[datetime] = None) -> list:
+        """
+        Serie de una metrica: [{'bucket', 'service', 'samples', 'avg', 'max',
+        'last', 'flaps'}] ordenada por bucket. resolution: raw, hour, day o week.
+        """
+        start_ts = int(start.timestamp()) if start else None
+        end_ts = int(end.timestamp()) if end else None
+        if resolution == 'raw':
+            return [{'bucket': ts, 'service': name, 'samples': 1, 'avg': v[metric], 'max': v[metric],
+                     'last': v[metric], 'flaps': 0}
+                    for ts, name, v in self.raw_rows(service, start_ts, end_ts)]
+        if resolution == 'hour':
+            rolled = rollup_rows(self.raw_rows(service, start_ts, end_ts), 'hour')
+        elif resolution == 'day':
+            rolled = {(ts, name): v for ts, name, v in self.daily_rows(service, start_ts, end_ts)}
+        elif resolution == 'week':
+            rolled = merge_rollups(self.daily_rows(service, start_ts, end_ts), 'week')
+        else:
+            raise ValueError(f"Resolucion desconocida: {resolution}")
+        return [{'bucket': bucket, 'service': name, 'samples': v['samples'],
+                 'avg': v[f'{metric}.avg'], 'max': v[f'{metric}.max'], 'last': v[f'{metric}.last'],
+                 'flaps': v['flaps']}
+                for (bucket, name), v in sorted(rolled.items())]
+
+
+def main():
+    root = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'history')
+    metric = sys.argv[1] if len(sys.argv) > 1 else 'errors24h'
+    resolution = sys.argv[2] if len(sys.argv) > 2 else 'day'
+    service = sys.argv[3] if len(sys.argv) > 3 else PROJECT
+    started = time.perf_counter()
+    series = HistoryStore(root).query(metric, resolution, service)
+    elapsed = (time.perf_counter() - started) * 1000
+    for point in series:
+        bucket = datetime.fromtimestamp(point['bucket'], timezone.utc).strftime('%Y-%m-%d %H:%M')
+        print(f"{bucket}  {point['service']:<30} avg={point['avg']:<10} max={point['max']:<10} "
+              f"last={point['last']:<10} n={point['samples']} flaps={point['flaps']}")
+    print(f"{len(series)} puntos en {elapsed:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Indice local de los issues generados automaticamente (data/issue_index.json).
+
+En lugar de una busqueda de issues por grupo, se listan una vez por
+ejecucion los issues con label `auto-generated` (paginados) y se arma el mapa ERROR-<hash> -> {numero, url, estado}. El
+indice se persiste y las ejecuciones siguientes solo piden los issues
+actualizados desde la ultima lectura (parametro `since` de la API).
+"""
+
+import json
+import re
+from datetime import datetime, timezone, timedelta
+from typing import Optional
+
+from github_client import GitHubClient
+
+ISSUE_LABEL = 'auto-generated'
+_HASH_PATTERN = re.compile(r'\[ERROR-([0-9a-f]{12})\]')
+
+# Margen al pedir 'since' para no perder issues editados durante la lectura anterior
+SINCE_OVERLAP = timedelta(minutes=5)
+
+
+def issue_hash(title: str) -> Optional[str]:
+    match = _HASH_PATTERN.search(title or '')
+    return match.group(1) if match else None
+
+
+class IssueIndex:
+    """Mapa hash de error -> issue, persistido y actualizado incrementalmente."""
+
+    def __init__(self, path: str, client: GitHubClient):
+        self.path = path
+        self.client = client
+        self.issues = {}
+        self.updated_since = None
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            self.issues = data.get('issues', {})
+            self.updated_since = data.get('updatedSince')
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"  Indice de issues ilegible, se reconstruye: {e}")
+
+    def refresh(self, now: Optional[datetime] = None) -> bool:
+        """Trae los issues nuevos o modificados desde la ultima lectura."""
+        now = now or datetime.now(timezone.utc)
+        since = None
+        if self.updated_since:
+            since_dt = datetime.fromisoformat(self.updated_since.replace('Z', '+00:00')) - SINCE_OVERLAP
+            since = since_dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+        try:
+            issues = self.client.list_issues(ISSUE_LABEL, since=since)
+        except Exception as e:
+            print(f"  Error listando issues: {e}")
+            return False
+
+        changed = 0
+        for issue in issues:
+            if 'pull_request' in issue:
+                continue
+            error_hash = issue_hash(issue.get('title', ''))
+            if error_hash:
+                self._merge(error_hash, issue)
+                changed += 1
+        self.updated_since = now.strftime('%Y-%m-%dT%H:%M:%SZ')
+        print(f"  Indice de issues: {changed} {'actualizados' if since else 'leidos'}, {len(self.issues)} en total")
+        return True
+
+    def _merge(self, error_hash: str, issue: dict):
+        entry = {
+            'number': issue.get('number'),
+            'url': issue.get('html_url') or issue.get('url'),
+            'state': (issue.get('state') or 'open').lower(),
+            'updated_at': issue.get('updated_at'),
+            'closed_at': issue.get('closed_at')
+        }
+        current = self.issues.get(error_hash)
+        # Issues duplicados del mismo hash: se prefiere el abierto y luego el mas antiguo
+        if (current and current['number'] != entry['number']
+                and (current['state'] == 'open', -current['number']) > (entry['state'] == 'open', -entry['number'])):
+            return
+        self.issues[error_hash] = entry
+
+    def lookup(self, error_hash: str) -> Optional[dict]:
+        return self.issues.get(error_hash)
+
+    def add(self, error_hash: str, number: Optional[int], url: str, state: str = 'open'):
+        """Registra un issue recien creado."""
+        self.issues[error_hash] = {
+            'number': number,
+            'url': url,
+            'state': state,
+            'updated_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'closed_at': None
+        }
+
+    def save(self):
+        with open(self.path, 'w') as f:
+            json.dump({'updatedSince': self.updated_since,
+                       'issues': dict(sorted(self.issues.items()))}, f, indent=2)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Reconciliacion de issues con los grupos de errores consolidados.
+
+Compara los grupos actuales con los issues conocidos (issue_index) y con lo
+ultimo que se reporto en cada uno (data/created_issues.json), y aplica solo
+los cambios necesarios:
+- comment: el issue esta abierto y el grupo tuvo nuevas ocurrencias
+- reopen:  el issue esta cerrado y el error volvio a aparecer despues del cierre
+- close:   el issue esta abierto y el error no aparece hace ISSUE_CLOSE_AFTER_DAYS dias
+
+created_issues.json pasa a tener una entrada por hash, actualizada en cada
+sincronizacion (conteo reportado, ultima ocurrencia, estado).
+"""
+
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone, timedelta
+from typing import Optional
+
+from github_client import GitHubClient
+from issue_index import IssueIndex
+from log_ingest import parse_timestamp
+
+CLOSE_AFTER_DAYS = int(os.environ.get('ISSUE_CLOSE_AFTER_DAYS', '7'))
+# Ocurrencias nuevas minimas para comentar (evita un comentario por cada error suelto)
+COMMENT_MIN_NEW = int(os.environ.get('ISSUE_COMMENT_MIN_NEW', '5'))
+
+
+@dataclass
+class SyncAction:
+    kind: str  # 'comment', 'reopen' o 'close'
+    error_hash: str
+    number: int
+    body: str
+
+
+def load_records(entries: list) -> dict:
+    """Registros por hash a partir de created_issues.json (la ultima entrada gana)."""
+    records = {}
+    for entry in entries:
+        if entry.get('hash'):
+            records[entry['hash']] = {**records.get(entry['hash'], {}), **entry}
+    return records
+
+
+def seed_records(records: dict, index: IssueIndex, consolidated: dict):
+    """
+    Issues conocidos sin registro (p. ej. creados antes) y registros del
+    formato anterior (sin reported_count): se toma el estado actual como
+    reportado, asi solo las ocurrencias posteriores generan comentarios.
+    """
+    for error_hash, issue in index.issues.items():
+        if error_hash not in records and error_hash in consolidated:
+            update_record(records, error_hash, consolidated[error_hash], issue)
+    for error_hash, record in records.items():
+        if 'reported_count' not in record:
+            group = consolidated.get(error_hash)
+            record['reported_count'] = group['count'] if group else record.get('count', 0)
+
+
+def plan_sync(consolidated: dict, index: IssueIndex, records: dict,
+              now: Optional[datetime] = None) -> list:
+    """Acciones necesarias para que los issues reflejen los grupos actuales."""
+    now = now or datetime.now(timezone.utc)
+    actions = []
+
+    for error_hash, record in records.items():
+        issue = index.lookup(error_hash)
+        if not issue or not issue.get('number'):
+            continue
+        group = consolidated.get(error_hash)
+        last_seen = (group or {}).get('last_seen') or record.get('last_seen')
+        last_seen_dt = parse_timestamp(last_seen)
+        reported = record.get('reported_count', record.get('count', 0))
+        new_occurrences = (group['count'] - reported) if group else 0
+
+        quiet = last_seen_dt is not None and now - last_seen_dt >= timedelta(days=CLOSE_AFTER_DAYS)
+
+        if issue['state'] == 'closed':
+            closed_at = parse_timestamp(issue.get('closed_at'))
+            if group and not quiet and last_seen_dt and closed_at and last_seen_dt > closed_at:
+                actions.append(SyncAction('reopen', error_hash, issue['number'],
+                    f"El error volvio a ocurrir despues del cierre.\n\n"
+                    f"- **Ocurrencias**: {group['count']}\n"
+                    f"- **Ultima vez**: {last_seen}\n"
+                    f"- **Servicios**: {', '.join(group['services'])}"))
+            continue
+
+        if quiet:
+            actions.append(SyncAction('close', error_hash, issue['number'],
+                f"Sin ocurrencias desde {last_seen} ({CLOSE_AFTER_DAYS}+ dias). "
+                f"Se cierra automaticamente; se reabrira si el error vuelve a aparecer."))
+        elif new_occurrences >= COMMENT_MIN_NEW:
+            actions.append(SyncAction('comment', error_hash, issue['number'],
+                f"**{new_occurrences} nuevas ocurrencias** desde el ultimo reporte "
+                f"(total: {group['count']}).\n\n"
+                f"- **Ultima vez**: {last_seen}\n"
+                f"- **Servicios**: {', '.join(group['services'])}\n"
+                f"- **Revisions**: {', '.join(group['revisions'][:5])}"))
+
+    return actions
+
+
+def apply_sync(actions: list, client: GitHubClient, index: IssueIndex, records: dict,
+               consolidated: dict, now: Optional[datetime] = None) -> dict:
+    """Aplica las acciones en lote y actualiza registros e indice. Retorna conteos por tipo."""
+    now = now or datetime.now(timezone.utc)
+
+    def run(action: SyncAction):
+        client.comment_issue(action.number, action.body)
+        if action.kind == 'reopen':
+            client.set_issue_state(action.number, 'open')
+        elif action.kind == 'close':
+            client.set_issue_state(action.number, 'closed', 'completed')
+
+    results = client.run_batch({a.error_hash: (lambda a=a: run(a)) for a in actions})
+
+    applied = {}
+    for action in actions:
+        result = results.get(action.error_hash)
+        if isinstance(result, Exception):
+            print(f"  Error sincronizando ERROR-{action.error_hash} ({action.kind}): {result}")
+            continue
+        applied[action.kind] = applied.get(action.kind, 0) + 1
+        issue = index.lookup(action.error_hash)
+        if action.kind in ('reopen', 'close'):
+            issue['state'] = 'open' if action.kind == 'reopen' else 'closed'
+            issue['closed_at'] = now.strftime('%Y-%m-%dT%H:%M:%SZ') if action.kind == 'close' else None
+        group = consolidated.get(action.error_hash)
+        if group:
+            update_record(records, action.error_hash, group, issue, now)
+        records[action.error_hash]['state'] = issue['state']
+    return applied
+
+
+def update_record(records: dict, error_hash: str, group: dict, issue: Optional[dict],
+                  now: Optional[datetime] = None):
+    """Registra lo reportado en el issue de un grupo."""
+    now = now or datetime.now(timezone.utc)
+    record = records.setdefault(error_hash, {'hash': error_hash})
+    record.update({
+        'url': (issue or {}).get('url') or record.get('url'),
+        'count': group['count'],
+        'services': group['services'],
+        'reported_count': group['count'],
+        'last_seen': group.get('last_seen'),
+        'state': (issue or {}).get('state', record.get('state', 'open')),
+        'synced_at': now.isoformat()
+    })
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Sketches de latencia fusionables para percentiles por servicio y revision.
+
+LatencySketch es un histograma logaritmico (estilo DDSketch / HDR): cada
+latencia cae en el bucket ceil(log_gamma(ms)), lo que acota el error
+relativo de cualquier percentil a `relative_accuracy` con memoria
+proporcional al rango de valores (no a la cantidad de muestras). Dos
+sketches se fusionan sumando sus buckets, por lo que las ejecuciones
+horarias se pueden combinar en vistas diarias y semanales.
+
+LatencySketchStore persiste sketches por hora en data/latency_sketches.json
+y consolida las horas antiguas en dias.
+"""
+
+import json
+import math
+import os
+import threading
+from datetime import datetime, timezone, timedelta
+from typing import Optional
+
+DEFAULT_RELATIVE_ACCURACY = 0.02
+
+# Retencion del almacen de sketches
+HOURLY_RETENTION_HOURS = 48
+DAILY_RETENTION_DAYS = 35
+
+
+class LatencySketch:
+    """Histograma logaritmico de latencias (ms) con error relativo acotado."""
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value_ms: float, count: int = 1):
+        """Agrega una latencia en milisegundos."""
+        if value_ms < 0 or count <= 0:
+            return
+        if value_ms < 1:
+            # Sub-milisegundo: se agrupa en un bucket de ceros
+            self.zero_count += count
+        else:
+            index = math.ceil(math.log(value_ms) / self._log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.sum += value_ms * count
+        self.min = value_ms if self.min is None else min(self.min, value_ms)
+        self.max = value_ms if self.max is None else max(self.max, value_ms)
+
+    def merge(self, other: 'LatencySketch') -> 'LatencySketch':
+        """Fusiona otro sketch en este (asociativo y conmutativo)."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError('No se pueden fusionar sketches con distinta precision')
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Percentil q (0-1); None si el sketch esta vacio."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # Punto medio del bucket (en escala logaritmica)
+                value = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def summary(self) -> dict:
+        """Resumen en milisegundos (mismo formato que monitoring.summarize_latency)."""
+        result = {'meanMs': int(self.mean), 'count': self.count}
+        for name, q in (('p50Ms', 0.50), ('p90Ms', 0.90), ('p99Ms', 0.99)):
+            value = self.quantile(q)
+            result[name] = int(round(value)) if value is not None else 0
+        return result
+
+    def to_dict(self) -> dict:
+        return {
+            'a': self.relative_accuracy,
+            'b': {str(k): v for k, v in self.buckets.items()},
+            'z': self.zero_count,
+            'n': self.count,
+            's': round(self.sum, 3),
+            'min': self.min,
+            'max': self.max
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'LatencySketch':
+        sketch = cls(data.get('a', DEFAULT_RELATIVE_ACCURACY))
+        sketch.buckets = {int(k): v for k, v in data.get('b', {}).items()}
+        sketch.zero_count = data.get('z', 0)
+        sketch.count = data.get('n', 0)
+        sketch.sum = data.get('s', 0.0)
+        sketch.min = data.get('min')
+        sketch.max = data.get('max')
+        return sketch
+
+
+def parse_latency_ms(latency: str) -> Optional[float]:
+    """Convierte la latencia de httpRequest ("0.123456s") a milisegundos."""
+    if not latency:
+        return None
+    try:
+        return float(latency.rstrip('s')) * 1000
+    except (ValueError, AttributeError):
+        return None
+
+
+def hour_key(timestamp: datetime) -> str:
+    return timestamp.astimezone(timezone.utc).strftime('%Y-%m-%dT%H')
+
+
+class LatencySketchStore:
+    """
+    Sketches persistidos por hora y por dia, con la forma
+    {'hours': {'YYYY-MM-DDTHH': bucket}, 'days': {'YYYY-MM-DD': bucket}}
+    donde bucket = {'services': {svc: sketch}, 'revisions': {rev: sketch}}.
+
+    Cada ejecucion reemplaza las horas que vio completas dentro de la
+    retencion horaria (es idempotente: volver a ver una hora no la duplica).
+    Las horas que salen de la retencion se fusionan en su dia.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.hours = {}
+        self.days = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                self.hours = {k: _load_bucket(v) for k, v in data.get('hours', {}).items()}
+                self.days = {k: _load_bucket(v) for k, v in data.get('days', {}).items()}
+            except (OSError, json.JSONDecodeError, ValueError) as e:
+                print(f"  Sketches de latencia ilegibles, se reinician: {e}")
+
+    def update_hours(self, hourly: dict, now: Optional[datetime] = None):
+        """Reemplaza las horas recibidas ({hora: bucket}) dentro de la retencion."""
+        now = now or datetime.now(timezone.utc)
+        oldest = hour_key(now - timedelta(hours=HOURLY_RETENTION_HOURS))
+        with self._lock:
+            for key, bucket in hourly.items():
+                # Las horas fuera de la retencion ya estan consolidadas en su dia
+                if key >= oldest:
+                    self.hours[key] = bucket
+            self._compact(now)
+
+    def _compact(self, now: datetime):
+        oldest_hour = hour_key(now - timedelta(hours=HOURLY_RETENTION_HOURS))
+        oldest_day = (now - timedelta(days=DAILY_RETENTION_DAYS)).strftime('%Y-%m-%d')
+        for key in [k for k in self.hours if k < oldest_hour]:
+            day = self.days.setdefault(key[:10], {'services': {}, 'revisions': {}})
+            _merge_bucket(day, self.hours.pop(key))
+        for key in [k for k in self.days if k < oldest_day]:
+            del self.days[key]
+
+    def view(self, days: int, now: Optional[datetime] = None) -> dict:
+        """Fusiona horas y dias de los ultimos `days` dias en un solo bucket."""
+        now = now or datetime.now(timezone.utc)
+        since = now - timedelta(days=days)
+        merged = {'services': {}, 'revisions': {}}
+        with self._lock:
+            for key, bucket in self.hours.items():
+                if key >= hour_key(since):
+                    _merge_bucket(merged, bucket)
+            for key, bucket in self.days.items():
+                if key >= since.strftime('%Y-%m-%d'):
+                    _merge_bucket(merged, bucket)
+        return merged
+
+    def save(self):
+        with self._lock:
+            data = {
+                'hours': {k: _dump_bucket(v) for k, v in sorted(self.hours.items())},
+                'days': {k: _dump_bucket(v) for k, v in sorted(self.days.items())}
+            }
+        with open(self.path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+
+
+def _merge_bucket(target: dict, source: dict):
+    for section in ('services', 'revisions'):
+        for name, sketch in source.get(section, {}).items():
+            if name in target[section]:
+                target[section][name].merge(sketch)
+            else:
+                target[section][name] = LatencySketch.from_dict(sketch.to_dict())
+
+
+def _load_bucket(data: dict) -> dict:
+    return {section: {k: LatencySketch.from_dict(v) for k, v in data.get(section, {}).items()}
+            for section in ('services', 'revisions')}
+
+
+def _dump_bucket(bucket: dict) -> dict:
+    return {section: {k: v.to_dict() for k, v in bucket.get(section, {}).items()}
+            for section in ('services', 'revisions')}
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Ingestion incremental de logs de Cloud Logging.
+
+En lugar de volver a leer toda la ventana (7 o 30 dias) en cada ejecucion,
+se guarda un cursor por consulta (ultimo timestamp e insertId) y solo se
+piden las entradas posteriores. Las entradas nuevas se agregan a una ventana
+movil persistida en data/log_windows/, donde se expiran las mas antiguas.
+
+Archivos:
+- data/log_cursors.json: {consulta: {'timestamp': ..., 'insertId': ...}}
+- data/log_windows/<consulta>/<YYYY-MM-DD>.json: entradas de cada dia (JSON compacto)
+- data/log_windows/<consulta>/index.json: insertIds ordenados por dia
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone, timedelta
+from typing import Callable, Iterable, Iterator, Optional
+
+
+# Paginacion: tamano de pagina acotado y sin tope de entradas por defecto
+DEFAULT_PAGE_SIZE = int(os.environ.get('LOG_PAGE_SIZE', '1000'))
+DEFAULT_MAX_ENTRIES = int(os.environ.get('LOG_MAX_ENTRIES', '0'))  # 0 = sin tope
+# Entradas nuevas que se acumulan antes de escribirlas en sus dias
+FLUSH_ENTRIES = int(os.environ.get('LOG_WINDOW_FLUSH_ENTRIES', '20000'))
+
+
+@dataclass(frozen=True)
+class LogQuery:
+    """Consulta de Cloud Logging con su ventana de tiempo."""
+    key: str
+    filter: str
+    window_days: int
+    timeout: int = 180
+    # Campos que se conservan en la ventana persistida; 'a.b' conserva solo
+    # la clave b del objeto a (p. ej. 'httpRequest.status')
+    fields: tuple = ()
+    page_size: int = DEFAULT_PAGE_SIZE
+    # Tope de seguridad; si se alcanza, los conteos quedan marcados como muestreados
+    max_entries: int = DEFAULT_MAX_ENTRIES
+
+    def command(self, cursor: Optional[dict] = None) -> str:
+        """Comando gcloud para la ventana completa o para lo posterior al cursor."""
+        if cursor and cursor.get('timestamp'):
+            # Orden ascendente: si la lectura se corta, el cursor avanza hasta
+            # la ultima entrada leida y la siguiente ejecucion continua
+            log_filter = f'{self.filter} AND timestamp>="{cursor["timestamp"]}"'
+            order = ' --order=asc'
+        else:
+            log_filter = self.filter
+            order = ''
+        # gcloud recorre todas las paginas de page_size entradas
+        limit = f' --limit={self.max_entries}' if self.max_entries else ''
+        return (f"gcloud logging read '{log_filter}' --page-size={self.page_size}{limit}"
+                f" --format=\"json\"{order} --freshness={self.window_days}d 2>/dev/null")
+
+    def project(self, entry: dict) -> dict:
+        """Reduce una entrada a los campos que usan las vistas derivadas."""
+        if not self.fields:
+            return entry
+        projected = {}
+        for field in self.fields:
+            _copy_path(entry, projected, field.split('.'))
+        return projected
+
+    def is_truncated(self, fetched: int) -> bool:
+        """Indica si la lectura se detuvo por el tope de entradas."""
+        return bool(self.max_entries) and fetched >= self.max_entries
+
+
+def _copy_path(source: dict, target: dict, path: list):
+    """Copia source[a][b]... en target conservando la estructura anidada."""
+    head = path[0]
+    if not isinstance(source, dict) or head not in source:
+        return
+    if len(path) == 1:
+        target[head] = source[head]
+        return
+    child = target.setdefault(head, {})
+    _copy_path(source[head], child, path[1:])
+    if not child:
+        del target[head]
+
+
+def iter_json_values(chunks: Iterable[str]) -> Iterator:
+    """
+    Parser JSON incremental: recibe fragmentos de texto y produce cada
+    elemento de un arreglo ('[{...}, {...}]') o cada objeto de NDJSON en
+    cuanto esta completo, sin acumular toda la salida en memoria.
+    """
+    decoder = json.JSONDecoder()
+    chunks = iter(chunks)
+    buffer = ''
+    pos = 0
+    started = False
+
+    def read_more() -> bool:
+        nonlocal buffer, pos
+        for chunk in chunks:
+            if chunk:
+                # Descartar lo ya parseado para mantener el buffer acotado
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                return True
+        return False
+
+    while True:
+        # Saltar espacios y separadores entre elementos
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos < len(buffer) or not read_more():
+                break
+        if pos >= len(buffer):
+            return
+
+        char = buffer[pos]
+        if not started:
+            started = True
+            if char == '[':
+                pos += 1
+                continue
+        if char == ']':
+            return
+
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # Elemento incompleto: leer mas datos y reintentar
+            if read_more():
+                continue
+            raise
+        pos = end
+        yield value
+
+
+def parse_timestamp(timestamp_str: str) -> Optional[datetime]:
+    """Parsea un timestamp RFC3339 de Cloud Logging."""
+    if not timestamp_str:
+        return None
+    try:
+        return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+    except ValueError:
+        # Python < 3.11 no acepta mas de 6 decimales
+        try:
+            base, _, frac = timestamp_str.rstrip('Z').partition('.')
+            return datetime.fromisoformat(f"{base}.{frac[:6].ljust(6, '0')}+00:00")
+        except ValueError:
+            return None
+
+
+def _entry_key(entry: dict):
+    return (parse_timestamp(entry.get('timestamp', '')) or datetime.min.replace(tzinfo=timezone.utc),
+            entry.get('insertId', ''))
+
+
+def entry_id(entry: dict) -> str:
+    """insertId de la entrada (o un digest de su contenido si no tiene)."""
+    insert_id = entry.get('insertId')
+    if insert_id:
+        return insert_id
+    payload = json.dumps(entry, sort_keys=True, separators=(',', ':'), default=str)
+    return '~' + hashlib.sha1(payload.encode('utf-8')).hexdigest()[:20]
+
+
+class DayPartitionedWindow:
+    """
+    Ventana movil de una consulta particionada por dia UTC:
+    - <dir>/<YYYY-MM-DD>.json: entradas del dia, de mas reciente a mas antigua
+    - <dir>/index.json: {dia: [insertIds ordenados]}
+
+    El indice de ids (sin las entradas) alcanza para descartar lo que una
+    lectura solapada repite: solo se abren y reescriben los dias que reciben
+    entradas nuevas. Expirar un dia es borrar su archivo, y las entradas
+    nuevas se escriben en bloques de FLUSH_ENTRIES (memoria acotada).
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.index = {}
+        path = os.path.join(directory, 'index.json')
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.index = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"  Indice de ventana ilegible ({directory}), se reconstruye: {e}")
+                self.clear()
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self.index.values())
+
+    def _path(self, day: str) -> str:
+        return os.path.join(self.directory, f'{day}.json')
+
+    def contains(self, day: str, key: str) -> bool:
+        ids = self.index.get(day, [])
+        position = bisect.bisect_left(ids, key)
+        return position < len(ids) and ids[position] == key
+
+    def load_day(self, day: str) -> list:
+        try:
+            with open(self._path(day), 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return []
+
+    def clear(self):
+        if os.path.isdir(self.directory):
+            for filename in os.listdir(self.directory):
+                if filename.endswith('.json'):
+                    os.remove(os.path.join(self.directory, filename))
+        self.index = {}
+
+    def add(self, entries: Iterable[dict], now: datetime) -> tuple:
+        """Agrega entradas (deduplicando por insertId). Retorna (nuevas, leidas)."""
+        added = 0
+        fetched = 0
+        buffer = {}
+        buffered = 0
+        for entry in entries:
+            fetched += 1
+            day = (parse_timestamp(entry.get('timestamp', '')) or now).strftime('%Y-%m-%d')
+            key = entry_id(entry)
+            if self.contains(day, key):
+                continue
+            buffer.setdefault(day, {})[key] = entry
+            buffered += 1
+            if buffered >= FLUSH_ENTRIES:
+                added += self._flush(buffer)
+                buffer, buffered = {}, 0
+        added += self._flush(buffer)
+        return added, fetched
+
+    def _flush(self, buffer: dict) -> int:
+        os.makedirs(self.directory, exist_ok=True)
+        added = 0
+        for day, new in buffer.items():
+            merged = {entry_id(e): e for e in self.load_day(day)} if day in self.index else {}
+            before = len(merged)
+            merged.update(new)
+            added += len(merged) - before
+            entries = sorted(merged.values(), key=_entry_key, reverse=True)
+            with open(self._path(day), 'w') as f:
+                json.dump(entries, f, separators=(',', ':'))
+            self.index[day] = sorted(merged)
+        return added
+
+    def expire(self, cutoff: datetime):
+        """Borra los dias completos anteriores al corte."""
+        cutoff_day = cutoff.strftime('%Y-%m-%d')
+        for day in [d for d in self.index if d < cutoff_day]:
+            del self.index[day]
+            if os.path.exists(self._path(day)):
+                os.remove(self._path(day))
+
+    def save_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, 'index.json'), 'w') as f:
+            json.dump(dict(sorted(self.index.items())), f, separators=(',', ':'))
+
+    def view(self, cutoff: datetime, now: datetime) -> 'WindowView':
+        return WindowView(self, cutoff, now)
+
+
+class WindowView:
+    """
+    Entradas vigentes de una ventana, de la mas reciente a la mas antigua.
+    Se puede recorrer varias veces; cada recorrido lee un dia a la vez.
+    """
+
+    def __init__(self, window: DayPartitionedWindow, cutoff: datetime, now: datetime):
+        self.window = window
+        self.cutoff = cutoff
+        self.now = now
+        self._days = sorted(window.index, reverse=True)
+        self._length = None
+
+    def _current(self, entry: dict) -> bool:
+        return (parse_timestamp(entry.get('timestamp', '')) or self.now) > self.cutoff
+
+    def __iter__(self) -> Iterator[dict]:
+        cutoff_day = self.cutoff.strftime('%Y-%m-%d')
+        for day in self._days:
+            entries = self.window.load_day(day)
+            if day > cutoff_day:
+                yield from entries
+            else:
+                yield from (e for e in entries if self._current(e))
+
+    def __len__(self) -> int:
+        if self._length is None:
+            # Solo el dia del corte puede tener entradas vencidas
+            cutoff_day = self.cutoff.strftime('%Y-%m-%d')
+            self._length = sum(len(self.window.index[day]) for day in self._days if day > cutoff_day)
+            self._length += sum(1 for day in self._days if day <= cutoff_day
+                                for e in self.window.load_day(day) if self._current(e))
+        return self._length
+
+    def first(self) -> Optional[dict]:
+        return next(iter(self), None)
+
+    def last(self) -> Optional[dict]:
+        """Entrada vigente mas antigua: abre solo los dias mas antiguos."""
+        for day in reversed(self._days):
+            current = [e for e in self.window.load_day(day) if self._current(e)]
+            if current:
+                return current[-1]
+        return None
+
+
+class LogIngestState:
+    """Cursores y ventanas moviles persistidas bajo data/."""
+
+    def __init__(self, data_dir: str):
+        self.cursors_path = os.path.join(data_dir, 'log_cursors.json')
+        self.windows_dir = os.path.join(data_dir, 'log_windows')
+        self._lock = threading.Lock()
+        self.cursors = {}
+        # {consulta: {'entries': n, 'exact': bool}} de esta ejecucion
+        self.coverage = {}
+        if os.path.exists(self.cursors_path):
+            try:
+                with open(self.cursors_path, 'r') as f:
+                    self.cursors = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"  Cursores de logs ilegibles, se reinician: {e}")
+
+    def _window(self, key: str) -> DayPartitionedWindow:
+        window = DayPartitionedWindow(os.path.join(self.windows_dir, key))
+        # Ventana de un solo archivo (formato anterior): se reparte por dia
+        legacy = os.path.join(self.windows_dir, f'{key}.json')
+        if os.path.exists(legacy):
+            try:
+                with open(legacy, 'r') as f:
+                    window.add(json.load(f), datetime.now(timezone.utc))
+                window.save_index()
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"  Ventana de logs '{key}' ilegible, se reconstruye: {e}")
+            os.remove(legacy)
+        return window
+
+    def ingest(self, query: LogQuery, stream: Callable[[str, int], Iterable[dict]],
+               now: Optional[datetime] = None) -> Optional[WindowView]:
+        """
+        Trae las entradas nuevas de query, las agrega a su ventana (por dia,
+        deduplicadas por insertId) y retorna la ventana completa ordenada de
+        mas reciente a mas antigua (el mismo orden que 'gcloud logging
+        read'). Retorna None si la consulta falla y no hay ventana previa.
+
+        stream(cmd, timeout) retorna un iterable de entradas; si expone un
+        atributo `ok` falso al terminar, la consulta se considera fallida.
+        """
+        now = now or datetime.now(timezone.utc)
+        cutoff = now - timedelta(days=query.window_days)
+
+        with self._lock:
+            cursor = self.cursors.get(query.key)
+        window = self._window(query.key)
+        if cursor and not len(window):
+            cursor = None  # Cursor sin ventana: volver a leer todo
+        if cursor is None:
+            window.clear()
+
+        new_entries = stream(query.command(cursor), query.timeout)
+        # El filtro >= repite las entradas del timestamp del cursor: el indice las descarta
+        added, fetched = window.add((query.project(e) for e in new_entries), now)
+
+        stream_ok = getattr(new_entries, 'ok', True)
+        window.expire(cutoff)
+        window.save_index()
+        entries = window.view(cutoff, now)
+        if added == 0 and not stream_ok:
+            with self._lock:
+                self.coverage[query.key] = {'entries': len(entries), 'exact': False}
+            return entries if len(entries) else None
+
+        # Exactitud de la ventana:
+        # - 'complete': la ultima lectura llego hasta el presente
+        # - 'gapBefore': una primera lectura (descendente) cortada deja un hueco
+        #   anterior a su entrada mas antigua, que desaparece al expirar
+        truncated = query.is_truncated(fetched) or not stream_ok
+        gap_before = (cursor or {}).get('gapBefore')
+        if cursor is None and truncated and len(entries):
+            gap_before = entries.last().get('timestamp')
+        if gap_before and (parse_timestamp(gap_before) or now) <= cutoff:
+            gap_before = None
+        exact = not truncated and gap_before is None
+
+        with self._lock:
+            newest = entries.first()
+            if newest:
+                self.cursors[query.key] = {
+                    'timestamp': newest.get('timestamp', ''),
+                    'insertId': newest.get('insertId', ''),
+                    'complete': not truncated,
+                    'gapBefore': gap_before,
+                    'updatedAt': now.isoformat()
+                }
+            self.coverage[query.key] = {'entries': len(entries), 'exact': exact}
+
+        print(f"  Logs '{query.key}': {added} nuevas, {len(entries)} en ventana de {query.window_days}d")
+        return entries
+
+    def save(self):
+        """Persiste los cursores (las ventanas se escriben al ingerir)."""
+        with self._lock:
+            with open(self.cursors_path, 'w') as f:
+                json.dump(self.cursors, f, indent=2)
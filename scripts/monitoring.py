@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Cliente de Cloud Monitoring para metricas pre-agregadas de Cloud Run.
+
+En lugar de descargar logs de requests y contarlos en Python, consulta las
+series de tiempo que Cloud Run ya publica:
+- run.googleapis.com/request_count (DELTA, INT64)
+- run.googleapis.com/request_latencies (DELTA, DISTRIBUTION)
+- run.googleapis.com/container/billable_instance_time (DELTA, DOUBLE)
+
+Usa la API REST v3 (sin dependencias adicionales). La URL base y el
+proveedor de token son configurables, de modo que el cliente puede
+apuntarse a un servidor local falso.
+"""
+
+import json
+import os
+import subprocess
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime, timezone, timedelta
+from typing import Callable, Iterator, Optional
+
+MONITORING_API_URL = os.environ.get('MONITORING_API_URL', 'https://monitoring.googleapis.com/v3')
+
+REQUEST_COUNT_METRIC = 'run.googleapis.com/request_count'
+REQUEST_LATENCIES_METRIC = 'run.googleapis.com/request_latencies'
+BILLABLE_TIME_METRIC = 'run.googleapis.com/container/billable_instance_time'
+
+
+def gcloud_access_token() -> str:
+    """Obtiene un token de acceso con las credenciales activas de gcloud."""
+    result = subprocess.run('gcloud auth print-access-token 2>/dev/null', shell=True,
+                            capture_output=True, text=True, timeout=30)
+    return result.stdout.strip()
+
+
+def _rfc3339(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def distribution_percentile(distribution: dict, q: float) -> Optional[float]:
+    """
+    Estima el percentil q (0-1) de un valor Distribution de Monitoring
+    interpolando dentro del bucket que lo contiene.
+    """
+    counts = [int(c) for c in distribution.get('bucketCounts', [])]
+    total = sum(counts)
+    if not total:
+        return None
+
+    bounds = _bucket_bounds(distribution.get('bucketOptions', {}), len(counts))
+    rank = q * total
+    seen = 0
+    for i, count in enumerate(counts):
+        if count and seen + count >= rank:
+            lower, upper = bounds[i]
+            if upper is None:
+                return lower
+            return lower + (upper - lower) * ((rank - seen) / count)
+        seen += count
+    return bounds[-1][0]
+
+
+def _bucket_bounds(options: dict, num_buckets: int) -> list:
+    """Limites [inferior, superior) de cada bucket (el ultimo es abierto)."""
+    if 'exponentialBuckets' in options:
+        opts = options['exponentialBuckets']
+        scale = float(opts.get('scale', 1))
+        growth = float(opts.get('growthFactor', 2))
+        edges = [scale * growth ** i for i in range(int(opts.get('numFiniteBuckets', 0)) + 1)]
+    elif 'linearBuckets' in options:
+        opts = options['linearBuckets']
+        offset = float(opts.get('offset', 0))
+        width = float(opts.get('width', 1))
+        edges = [offset + width * i for i in range(int(opts.get('numFiniteBuckets', 0)) + 1)]
+    else:
+        edges = [float(b) for b in options.get('explicitBuckets', {}).get('bounds', [])]
+
+    bounds = []
+    for i in range(num_buckets):
+        lower = edges[i - 1] if 0 < i <= len(edges) else (0.0 if i == 0 else edges[-1])
+        upper = edges[i] if i < len(edges) else None
+        bounds.append((lower, upper))
+    return bounds
+
+
+class MonitoringClient:
+    """Cliente minimo de projects.timeSeries.list."""
+
+    def __init__(self, project_id: str, base_url: Optional[str] = None,
+                 token_provider: Optional[Callable[[], str]] = None, timeout: int = 60):
+        self.project_id = project_id
+        self.base_url = (base_url or MONITORING_API_URL).rstrip('/')
+        self.token_provider = token_provider or gcloud_access_token
+        self.timeout = timeout
+        self._token = None
+
+    def _get(self, path: str, params: list) -> dict:
+        if self._token is None:
+            self._token = self.token_provider()
+        url = f"{self.base_url}/{path}?{urllib.parse.urlencode(params)}"
+        request = urllib.request.Request(url, headers={
+            'Authorization': f'Bearer {self._token}',
+            'Accept': 'application/json'
+        })
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+
+    def list_time_series(self, metric_type: str, days: int, aligner: str,
+                         reducer: Optional[str] = None, group_by: tuple = (),
+                         now: Optional[datetime] = None) -> Iterator[dict]:
+        """
+        Itera las series de metric_type para los ultimos `days` dias, alineadas
+        en un solo punto por serie (alignmentPeriod = toda la ventana).
+        """
+        now = now or datetime.now(timezone.utc)
+        params = [
+            ('filter', f'metric.type="{metric_type}" AND resource.type="cloud_run_revision"'),
+            ('interval.startTime', _rfc3339(now - timedelta(days=days))),
+            ('interval.endTime', _rfc3339(now)),
+            ('aggregation.alignmentPeriod', f'{days * 86400}s'),
+            ('aggregation.perSeriesAligner', aligner),
+        ]
+        if reducer:
+            params.append(('aggregation.crossSeriesReducer', reducer))
+            params.extend(('aggregation.groupByFields', field) for field in group_by)
+
+        page_token = None
+        while True:
+            page_params = params + ([('pageToken', page_token)] if page_token else [])
+            page = self._get(f'projects/{self.project_id}/timeSeries', page_params)
+            yield from page.get('timeSeries', [])
+            page_token = page.get('nextPageToken')
+            if not page_token:
+                return
+
+    def sum_by_service(self, metric_type: str, days: int) -> dict:
+        """Suma una metrica DELTA escalar por servicio en la ventana."""
+        totals = {}
+        for series in self.list_time_series(metric_type, days, 'ALIGN_DELTA', 'REDUCE_SUM',
+                                            ('resource.label.service_name',)):
+            service = series.get('resource', {}).get('labels', {}).get('service_name', 'unknown')
+            for point in series.get('points', []):
+                value = point.get('value', {})
+                number = value.get('int64Value', value.get('doubleValue', 0))
+                totals[service] = totals.get(service, 0) + float(number)
+        return totals
+
+    def request_counts(self, days: int) -> dict:
+        """Requests por servicio en los ultimos `days` dias."""
+        return {k: int(v) for k, v in self.sum_by_service(REQUEST_COUNT_METRIC, days).items()}
+
+    def latency_distributions(self, days: int) -> dict:
+        """Distribucion de latencias (ms) por servicio, fusionada entre revisiones."""
+        distributions = {}
+        for series in self.list_time_series(REQUEST_LATENCIES_METRIC, days, 'ALIGN_DELTA',
+                                            'REDUCE_SUM', ('resource.label.service_name',)):
+            service = series.get('resource', {}).get('labels', {}).get('service_name', 'unknown')
+            for point in series.get('points', []):
+                dist = point.get('value', {}).get('distributionValue')
+                if dist and int(dist.get('count', 0)):
+                    distributions[service] = dist
+        return distributions
+
+    def billable_instance_seconds(self, days: int) -> dict:
+        """Segundos de instancia facturables por servicio."""
+        return self.sum_by_service(BILLABLE_TIME_METRIC, days)
+
+
+def summarize_latency(distribution: dict) -> dict:
+    """Resumen de una distribucion de latencias en milisegundos."""
+    summary = {'meanMs': int(float(distribution.get('mean', 0)))}
+    for name, q in (('p50Ms', 0.50), ('p90Ms', 0.90), ('p99Ms', 0.99)):
+        value = distribution_percentile(distribution, q)
+        summary[name] = int(value) if value is not None else 0
+    return summary
+
+
+class MonitoringError(RuntimeError):
+    """La API de Cloud Monitoring no respondio o su respuesta es invalida."""
+
+
+def get_request_stats(client: MonitoringClient) -> dict:
+    """
+    Conteo de requests (7 y 30 dias) y latencias por servicio desde Cloud
+    Monitoring, con el mismo formato que get_user_interactions.
+
+    Lanza MonitoringError si la API no responde: un resultado vacio se
+    publicaria como 0 requests en todos los servicios.
+    """
+    try:
+        counts_30d = client.request_counts(30)
+        counts_7d = client.request_counts(7)
+        latencies = client.latency_distributions(7)
+        billable = client.billable_instance_seconds(30)
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        print(f"  Cloud Monitoring: Error - {e}")
+        raise MonitoringError(str(e)) from e
+
+    stats = {}
+    for service in set(counts_30d) | set(counts_7d):
+        stats[service] = {
+            'requests7d': counts_7d.get(service, 0),
+            'requests30d': counts_30d.get(service, 0),
+            'exact': True,
+            'source': 'monitoring'
+        }
+        if service in latencies:
+            stats[service]['latency'] = summarize_latency(latencies[service])
+        if service in billable:
+            stats[service]['billableInstanceSeconds30d'] = int(billable[service])
+    return stats
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Servidor HTTP local que imita projects.timeSeries.list de Cloud Monitoring
+para las metricas de Cloud Run que usa el dashboard, para probar
+monitoring.py sin credenciales ni red.
+
+- Una serie por servicio (agrupada por resource.label.service_name)
+- Valores proporcionales a la ventana pedida (aggregation.alignmentPeriod)
+- Paginacion con nextPageToken (pageSize)
+- Modo de falla: responde 500 a todas las consultas
+
+Uso como verificacion rapida:
+    python scripts/monitoring_stub.py
+"""
+
+import json
+import os
+import sys
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from monitoring import (BILLABLE_TIME_METRIC, REQUEST_COUNT_METRIC,  # noqa: E402
+                        REQUEST_LATENCIES_METRIC)
+
+# Buckets exponenciales como los de run.googleapis.com/request_latencies (ms)
+LATENCY_BUCKETS = {'numFiniteBuckets': 20, 'growthFactor': 2.0, 'scale': 1.0}
+
+
+class StubMonitoring:
+    """Estado del servidor falso: metricas diarias por servicio."""
+
+    def __init__(self, project_id: str = 'test-project', services: dict = None,
+                 page_size: int = 2):
+        # {servicio: {'requestsPerDay': n, 'billableSecondsPerDay': s, 'latenciesMs': [...]}}
+        self.project_id = project_id
+        self.services = services or {}
+        self.page_size = page_size
+        self.failing = False
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    def series(self, metric_type: str, days: int) -> list:
+        """Series de metric_type para una ventana de `days` dias."""
+        result = []
+        for name, spec in sorted(self.services.items()):
+            if metric_type == REQUEST_COUNT_METRIC:
+                value = {'int64Value': str(spec.get('requestsPerDay', 0) * days)}
+            elif metric_type == BILLABLE_TIME_METRIC:
+                value = {'doubleValue': spec.get('billableSecondsPerDay', 0.0) * days}
+            elif metric_type == REQUEST_LATENCIES_METRIC:
+                value = {'distributionValue': latency_distribution(spec.get('latenciesMs', []))}
+            else:
+                continue
+            result.append({
+                'metric': {'type': metric_type},
+                'resource': {'type': 'cloud_run_revision',
+                             'labels': {'project_id': self.project_id, 'service_name': name}},
+                'points': [{'value': value}]
+            })
+        return result
+
+
+def latency_distribution(latencies_ms: list) -> dict:
+    """Distribution de Monitoring (buckets exponenciales) para una lista de latencias."""
+    opts = LATENCY_BUCKETS
+    edges = [opts['scale'] * opts['growthFactor'] ** i for i in range(opts['numFiniteBuckets'] + 1)]
+    counts = [0] * (len(edges) + 1)
+    for latency in latencies_ms:
+        counts[sum(1 for edge in edges if edge <= latency)] += 1
+    return {
+        'count': str(len(latencies_ms)),
+        'mean': sum(latencies_ms) / len(latencies_ms) if latencies_ms else 0,
+        'bucketOptions': {'exponentialBuckets': opts},
+        'bucketCounts': [str(c) for c in counts]
+    }
+
+
+def _metric_type(filter_str: str) -> str:
+    # 'metric.type="run.googleapis.com/request_count" AND ...'
+    return filter_str.split('metric.type="', 1)[-1].split('"', 1)[0]
+
+
+def make_handler(stub: StubMonitoring):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, data: dict):
+            body = json.dumps(data).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            with stub.lock:
+                stub.requests += 1
+            parsed = urllib.parse.urlsplit(self.path)
+            query = urllib.parse.parse_qs(parsed.query)
+            if stub.failing:
+                self._send(500, {'error': {'code': 500, 'message': 'Internal error'}})
+                return
+            if parsed.path != f'/projects/{stub.project_id}/timeSeries':
+                self._send(404, {'error': {'code': 404, 'message': 'Not Found'}})
+                return
+            if not self.headers.get('Authorization', '').startswith('Bearer '):
+                self._send(401, {'error': {'code': 401, 'message': 'Unauthenticated'}})
+                return
+
+            period = query.get('aggregation.alignmentPeriod', ['0s'])[0]
+            days = int(period.rstrip('s')) // 86400
+            series = stub.series(_metric_type(query.get('filter', [''])[0]), days)
+            start = int(query.get('pageToken', ['0'])[0])
+            page = {'timeSeries': series[start:start + stub.page_size]}
+            if start + stub.page_size < len(series):
+                page['nextPageToken'] = str(start + stub.page_size)
+            self._send(200, page)
+
+    return Handler
+
+
+def start_stub(stub: StubMonitoring) -> ThreadingHTTPServer:
+    """Inicia el servidor en un puerto libre (server.server_address) en segundo plano."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(stub))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    from monitoring import MonitoringClient, MonitoringError, get_request_stats
+
+    stub = StubMonitoring(services={
+        f'service-{i}': {'requestsPerDay': 1000 * (i + 1), 'billableSecondsPerDay': 3600.0,
+                         'latenciesMs': [20, 40, 80, 120, 900]}
+        for i in range(5)
+    })
+    server = start_stub(stub)
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    client = MonitoringClient(stub.project_id, base_url=base_url, token_provider=lambda: 'test')
+
+    stats = get_request_stats(client)
+    for service, values in sorted(stats.items()):
+        print(f"{service}: {values['requests7d']} requests 7d, {values['requests30d']} 30d, "
+              f"p50 {values['latency']['p50Ms']}ms")
+    print(f"Requests a la API: {stub.requests}")
+
+    stub.failing = True
+    try:
+        get_request_stats(client)
+    except MonitoringError as e:
+        print(f"Con la API caida se lanza MonitoringError: {e}")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
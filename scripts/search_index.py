@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Indice de busqueda estatico para la vista de lista de errores (data/search/).
+
+Los errores se numeran del mas reciente al mas antiguo en el mismo orden de
+los shards diarios de data/errors/ (data_publish.py): el error N es el
+elemento N - offset del shard de su dia. Asi las listas de postings ya salen
+ordenadas por fecha y un rango de tiempo es un rango contiguo de ids.
+
+- manifest.json: dias (shard, offset, cantidad), horas UTC (offset, cantidad)
+  y archivos de terminos
+- fields.<digest>.json: postings exactos de service:, severity: y status:
+- terms/<c>.<digest>.json: postings de los tokens que empiezan con <c>
+  (una busqueda por prefijo descarga un solo shard)
+
+Los postings se guardan con codificacion delta ([primero, d1, d2, ...]).
+Los tokens son secuencias de letras/digitos/_ en minusculas de 2 a
+MAX_TOKEN_LENGTH caracteres; los identificadores compuestos (KeyError,
+no_such_table, django.db.utils) se indexan completos y por partes. Una
+consulta busca cada palabra como prefijo de algun token (js/search.js
+tokeniza la consulta igual que query_tokens).
+
+Uso:
+    python scripts/search_index.py                # reconstruye el indice
+    python scripts/search_index.py "texto" [servicio]   # consulta de prueba
+"""
+
+import json
+import os
+import re
+import sys
+from datetime import datetime, timezone, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from data_publish import (ERRORS_DIR, PUBLISH_GZIP, load_manifest, prune_directory,
+                          write_compact, write_content_addressed)
+
+SEARCH_DIR = 'search'
+INDEX_VERSION = 2
+MIN_TOKEN_LENGTH = 2
+MAX_TOKEN_LENGTH = 40
+# Los tracebacks largos repiten frames; el inicio y el final bastan para buscar
+MAX_INDEXED_CHARS = int(os.environ.get('SEARCH_MAX_INDEXED_CHARS', '8000'))
+
+_TOKEN = re.compile(r'\w+')
+
+
+def _subtokens(word: str) -> list:
+    """
+    Partes de un identificador: KeyError -> Key, Error; no_such_table ->
+    no, such, table; HTTPError -> HTTP, Error; utf8 -> utf, 8.
+    """
+    parts = []
+    for chunk in word.split('_'):
+        start = 0
+        for i in range(1, len(chunk)):
+            prev, char = chunk[i - 1], chunk[i]
+            following = chunk[i + 1] if i + 1 < len(chunk) else ''
+            if ((prev.islower() and char.isupper())
+                    or (prev.isupper() and char.isupper() and following.islower())
+                    or prev.isdigit() != char.isdigit()):
+                parts.append(chunk[start:i])
+                start = i
+        parts.append(chunk[start:])
+    return [part for part in parts if part]
+
+
+def tokenize(text: str) -> list:
+    """
+    Tokens a indexar: cada palabra completa y, si es un identificador
+    compuesto, tambien sus partes (buscar "error" encuentra KeyError).
+    """
+    tokens = []
+    for word in _TOKEN.findall(text or ''):
+        tokens.append(word.lower())
+        parts = _subtokens(word)
+        if len(parts) > 1:
+            tokens.extend(part.lower() for part in parts)
+    return [t for t in tokens if MIN_TOKEN_LENGTH <= len(t) <= MAX_TOKEN_LENGTH]
+
+
+def query_tokens(text: str) -> list:
+    """Tokens de una consulta: palabras completas (prefijos de algun token indexado)."""
+    return [t for t in _TOKEN.findall((text or '').lower())
+            if MIN_TOKEN_LENGTH <= len(t) <= MAX_TOKEN_LENGTH]
+
+
+def shard_key(token: str) -> str:
+    first = token[0]
+    return first if ('a' <= first <= 'z' or '0' <= first <= '9') else '_'
+
+
+def _indexed_text(error: dict) -> str:
+    message = error.get('message') or ''
+    if len(message) > MAX_INDEXED_CHARS:
+        half = MAX_INDEXED_CHARS // 2
+        message = message[:half] + ' ' + message[-half:]
+    return f"{message} {error.get('service') or ''}"
+
+
+def field_terms(error: dict) -> list:
+    terms = [f"service:{error.get('service') or 'unknown'}",
+             f"severity:{error.get('severity') or 'ERROR'}"]
+    status = (error.get('httpRequest') or {}).get('status')
+    if status:
+        terms.append(f'status:{status}')
+    return terms
+
+
+def delta_encode(postings: list) -> list:
+    return [postings[0]] + [b - a for a, b in zip(postings, postings[1:])] if postings else []
+
+
+def delta_decode(encoded: list) -> list:
+    postings = []
+    total = 0
+    for value in encoded:
+        total += value
+        postings.append(total)
+    return postings
+
+
+def _add(index: dict, term: str, doc_id: int):
+    postings = index.setdefault(term, [])
+    # Los ids se recorren en orden: basta mirar el ultimo para no duplicar
+    if not postings or postings[-1] != doc_id:
+        postings.append(doc_id)
+
+
+def build_postings(days: list) -> tuple:
+    """
+    days: [(dia, [errores del mas reciente al mas antiguo])] en orden
+    descendente. Retorna (terms, fields, day_entries, hours).
+    """
+    terms = {}
+    fields = {}
+    day_entries = []
+    hours = []
+    doc_id = 0
+    for day, errors in days:
+        day_entries.append({'day': day, 'offset': doc_id, 'count': len(errors)})
+        for error in errors:
+            hour = (error.get('timestamp') or '')[:13]
+            if hours and hours[-1][0] == hour:
+                hours[-1][2] += 1
+            else:
+                hours.append([hour, doc_id, 1])
+            for token in tokenize(_indexed_text(error)):
+                _add(terms, token, doc_id)
+            for term in field_terms(error):
+                _add(fields, term, doc_id)
+            doc_id += 1
+    return terms, fields, day_entries, hours
+
+
+def build_search_index(data_dir: str, gzip_copy: bool = PUBLISH_GZIP) -> dict:
+    """Reconstruye data/search/ a partir de los shards diarios publicados."""
+    errors_manifest = load_manifest(os.path.join(data_dir, ERRORS_DIR, 'manifest.json'))
+    if not errors_manifest:
+        print("  No hay manifiesto de errores; indice de busqueda sin cambios")
+        return {}
+
+    days = []
+    for day, entry in sorted(errors_manifest['days'].items(), reverse=True):
+        with open(os.path.join(data_dir, entry['file']), 'r') as f:
+            days.append((day, json.load(f)))
+
+    terms, fields, day_entries, hours = build_postings(days)
+    for entry in day_entries:
+        entry['file'] = errors_manifest['days'][entry['day']]['file']
+
+    by_shard = {}
+    for term in sorted(terms):
+        by_shard.setdefault(shard_key(term), {})[term] = delta_encode(terms[term])
+
+    terms_dir = f'{SEARCH_DIR}/terms'
+    term_files = {key: write_content_addressed(data_dir, terms_dir, key, shard, gzip_copy)
+                  for key, shard in sorted(by_shard.items())}
+    fields_file = write_content_addressed(
+        data_dir, SEARCH_DIR, 'fields',
+        {term: delta_encode(postings) for term, postings in sorted(fields.items())}, gzip_copy)
+
+    manifest_path = os.path.join(data_dir, SEARCH_DIR, 'manifest.json')
+    previous = load_manifest(manifest_path) or {}
+    manifest = {
+        'version': INDEX_VERSION,
+        'generatedAt': datetime.now(timezone.utc).isoformat(),
+        'total': sum(d['count'] for d in day_entries),
+        'minTokenLength': MIN_TOKEN_LENGTH,
+        'maxTokenLength': MAX_TOKEN_LENGTH,
+        'days': day_entries,
+        'hours': hours,
+        'fields': fields_file['file'],
+        'terms': {key: entry['file'] for key, entry in term_files.items()}
+    }
+
+    # Se conservan tambien los archivos del indice anterior (paginas ya abiertas)
+    keep = set(manifest['terms'].values()) | set((previous.get('terms') or {}).values())
+    keep |= {manifest['fields'], previous.get('fields')}
+    prune_directory(data_dir, terms_dir, keep)
+    prune_directory(data_dir, SEARCH_DIR, keep | {f'{SEARCH_DIR}/manifest.json'})
+    write_compact(manifest_path, manifest, gzip_copy=False)
+
+    size = sum(e['bytes'] for e in term_files.values()) + fields_file['bytes']
+    print(f"  Indice de busqueda: {manifest['total']} errores, {len(terms)} terminos, "
+          f"{len(term_files)} shards, {size / 1024:.0f} KB")
+    return manifest
+
+
+# ----------------------------------------------------------------------
+# Consultas (misma logica que js/search.js, para verificar el indice)
+# ----------------------------------------------------------------------
+
+def intersect(a: list, b: list) -> list:
+    result = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        if a[i] == b[j]:
+            result.append(a[i])
+            i += 1
+            j += 1
+        elif a[i] < b[j]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def id_range(manifest: dict, start: datetime = None, end: datetime = None) -> tuple:
+    """Ids [lo, hi) de las horas UTC que se solapan con [start, end]."""
+    lo, hi = manifest['total'], 0
+    for hour, offset, count in manifest['hours']:
+        try:
+            hour_start = datetime.strptime(hour, '%Y-%m-%dT%H').replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+        if (end is None or hour_start <= end) and (start is None or hour_start + timedelta(hours=1) > start):
+            lo = min(lo, offset)
+            hi = max(hi, offset + count)
+    return (lo, hi) if lo < hi else (0, 0)
+
+
+def search(data_dir: str, text: str = '', service: str = None, severity: str = None,
+           status: int = None, start: datetime = None, end: datetime = None) -> list:
+    """Ids (del mas reciente al mas antiguo) que cumplen todos los filtros."""
+    def load(relative):
+        with open(os.path.join(data_dir, relative), 'r') as f:
+            return json.load(f)
+
+    manifest = load(f'{SEARCH_DIR}/manifest.json')
+    lo, hi = id_range(manifest, start, end)
+    fields = load(manifest['fields'])
+    lists = []
+    for term in ([f'service:{service}'] if service else []) + \
+                ([f'severity:{severity}'] if severity else []) + \
+                ([f'status:{status}'] if status else []):
+        lists.append(delta_decode(fields.get(term, [])))
+
+    for token in query_tokens(text):
+        file = manifest['terms'].get(shard_key(token))
+        shard = load(file) if file else {}
+        matches = set()
+        for term, encoded in shard.items():
+            if term.startswith(token):
+                matches.update(delta_decode(encoded))
+        lists.append(sorted(matches))
+
+    if not lists:
+        return list(range(lo, hi))
+    lists.sort(key=len)
+    result = [doc_id for doc_id in lists[0] if lo <= doc_id < hi]
+    for postings in lists[1:]:
+        result = intersect(result, postings)
+    return result
+
+
+def main():
+    data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+    if len(sys.argv) > 1:
+        ids = search(data_dir, sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+        print(f"{len(ids)} errores: {ids[:20]}")
+        return
+    build_search_index(data_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Parser de tracebacks de Python e indice de frames.
+
+parse_traceback recorre el mensaje una sola vez, linea por linea, y extrae:
+- la excepcion final (clase y primera linea del mensaje)
+- la cadena de excepciones ("During handling of...", "The above exception...")
+- los frames del ultimo traceback y el frame de aplicacion mas interno
+  (el primero que no pertenece a librerias instaladas ni a la stdlib)
+
+build_frame_index arma un indice invertido archivo/frame -> grupos de error,
+de modo que "todos los errores que pasan por views/x.py" sea una busqueda en
+data/error_frames.json y no un regex sobre cada mensaje.
+"""
+
+import re
+from typing import Optional
+
+TRACEBACK_HEADER = 'Traceback (most recent call last):'
+
+_FRAME_PATTERN = re.compile(r'\s*File "([^"]+)", line (\d+), in (.+)$')
+_EXCEPTION_PATTERN = re.compile(r'([A-Za-z_][\w.]*)(?::\s?(.*))?$')
+
+# Rutas que no son codigo de la aplicacion
+LIBRARY_MARKERS = ('/site-packages/', '/dist-packages/', '/lib/python', '<frozen', '<string>')
+
+MAX_FRAMES = 50
+MAX_EXCEPTION_MESSAGE = 300
+
+
+def is_app_frame(path: str) -> bool:
+    return not any(marker in path for marker in LIBRARY_MARKERS)
+
+
+def parse_traceback(message: str) -> Optional[dict]:
+    """
+    Retorna los campos estructurados de un traceback, o None si el mensaje
+    no contiene uno.
+    """
+    if not message or TRACEBACK_HEADER not in message:
+        return None
+
+    blocks = []
+    current = None
+    for line in message.splitlines():
+        if line.startswith(TRACEBACK_HEADER):
+            current = {'frames': [], 'exception': None, 'exception_message': ''}
+            blocks.append(current)
+            continue
+        if current is None:
+            continue
+
+        frame = _FRAME_PATTERN.match(line)
+        if frame:
+            current['frames'].append({
+                'file': frame.group(1),
+                'line': int(frame.group(2)),
+                'function': frame.group(3).strip()
+            })
+            continue
+
+        # La excepcion es la primera linea sin sangria despues de los frames
+        if current['exception'] is None and current['frames'] and line and not line[0].isspace():
+            match = _EXCEPTION_PATTERN.match(line)
+            if match:
+                current['exception'] = match.group(1)
+                current['exception_message'] = (match.group(2) or '')[:MAX_EXCEPTION_MESSAGE]
+
+    if not blocks:
+        return None
+
+    final = blocks[-1]
+    app_frame = None
+    # Frame de aplicacion mas interno: primero en el ultimo traceback y luego
+    # en los anteriores de la cadena
+    for block in reversed(blocks):
+        app_frame = next((f for f in reversed(block['frames']) if is_app_frame(f['file'])), None)
+        if app_frame:
+            break
+
+    return {
+        'exception': final['exception'],
+        'exception_message': final['exception_message'],
+        'exception_chain': [b['exception'] for b in blocks if b['exception']],
+        'app_frame': app_frame,
+        'frames': [f"{f['file']}:{f['function']}" for f in final['frames'][-MAX_FRAMES:]]
+    }
+
+
+def exception_name(parsed: Optional[dict]) -> Optional[str]:
+    """Nombre corto de la excepcion final ('psycopg2.errors.X' -> 'X')."""
+    if not parsed or not parsed.get('exception'):
+        return None
+    return parsed['exception'].rsplit('.', 1)[-1]
+
+
+def build_frame_index(groups: dict) -> dict:
+    """
+    Indice invertido a partir de los grupos consolidados con campo traceback:
+    {'files': {archivo: [hashes]}, 'frames': {'archivo:funcion': [hashes]},
+     'app_frames': {'archivo:funcion': [hashes]}}
+    """
+    files, frames, app_frames = {}, {}, {}
+    for error_hash, group in groups.items():
+        parsed = group.get('traceback')
+        if not parsed:
+            continue
+        for frame in dict.fromkeys(parsed.get('frames', [])):
+            frames.setdefault(frame, []).append(error_hash)
+            files.setdefault(frame.rsplit(':', 1)[0], set()).add(error_hash)
+        app_frame = parsed.get('app_frame')
+        if app_frame:
+            key = f"{app_frame['file']}:{app_frame['function']}"
+            app_frames.setdefault(key, []).append(error_hash)
+            files.setdefault(app_frame['file'], set()).add(error_hash)
+
+    return {
+        'files': {k: sorted(v) for k, v in sorted(files.items())},
+        'frames': {k: sorted(v) for k, v in sorted(frames.items())},
+        'app_frames': {k: sorted(v) for k, v in sorted(app_frames.items())}
+    }
+
+
+def errors_through(index: dict, path_suffix: str) -> list:
+    """Hashes de los grupos cuyo traceback pasa por un archivo que termina en path_suffix."""
+    hashes = set()
+    for path, members in index.get('files', {}).items():
+        if path.endswith(path_suffix):
+            hashes.update(members)
+    return sorted(hashes)
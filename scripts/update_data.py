@@ -7,9 +7,22 @@ Obtiene información de Cloud Run, logs y GitHub para generar los archivos JSON.
 import json
 import subprocess
 import os
+import threading
 from datetime import datetime, timezone, timedelta
 from collections import defaultdict
 
+from aggregates import build_aggregates
+from collector_engine import Collector, run_collectors
+from cost_model import CALIBRATION_BOUNDS, CostModel, calibrate
+from data_publish import publish_error_shards, write_compact
+from error_warehouse import ERROR_STORE, EXPORT_WINDOW_DAYS, ErrorWarehouse, warehouse_path
+from github_client import ETagCache, GitHubClient, GitHubError
+from history_store import HistoryStore
+from latency_sketch import LatencySketch, LatencySketchStore, hour_key, parse_latency_ms
+from log_ingest import LogIngestState, LogQuery, iter_json_values
+from monitoring import MonitoringClient, get_request_stats
+from search_index import build_search_index
+
 # Mapeo de servicios Cloud Run a repositorios
 SERVICE_TO_REPO = {
     'arcopack-erp': 'Arcopack',
@@ -78,6 +91,7 @@ SERVICES_WITH_DEDICATED_DB = {
 }
 
 GITHUB_ORG = 'mbrt26'
+PROJECT_ID = 'appsindunnova'
 PROJECT_NUMBER = '381877373634'  # Google Cloud project number for appsindunnova
 
 def run_command(cmd, timeout=120):
@@ -89,16 +103,175 @@ def run_command(cmd, timeout=120):
         print(f"Error ejecutando comando: {e}")
         return ""
 
-def get_cloud_run_services():
+class CommandStream:
+    """
+    Salida JSON de un comando leida de forma incremental.
+
+    Al iterar produce cada entrada en cuanto llega por stdout (arreglo JSON o
+    NDJSON), de modo que ni el texto completo ni la lista completa quedan en
+    memoria. Despues de iterar, `ok` indica si el comando termino bien.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, cmd, timeout=120):
+        self.cmd = cmd
+        self.timeout = timeout
+        self.ok = False
+
+    def __iter__(self):
+        self.ok = False
+        try:
+            proc = subprocess.Popen(self.cmd, shell=True, stdout=subprocess.PIPE,
+                                    stderr=subprocess.DEVNULL, text=True)
+        except Exception as e:
+            print(f"Error ejecutando comando: {e}")
+            return
+
+        timer = threading.Timer(self.timeout, proc.kill)
+        timer.start()
+        try:
+            chunks = iter(lambda: proc.stdout.read(self.CHUNK_SIZE), '')
+            yield from iter_json_values(chunks)
+            self.ok = proc.wait() == 0
+        except json.JSONDecodeError as e:
+            print(f"Error parseando JSON en streaming: {e}")
+        finally:
+            timer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+            proc.stdout.close()
+            proc.wait()
+
+# Consultas compartidas por varias vistas derivadas
+CLOUD_RUN_SERVICES_CMD = 'gcloud run services list --format="json" 2>/dev/null'
+
+# Consultas de logs (ventana completa o incremental segun LOG_INGEST_MODE)
+# De las requests solo se guardan los campos que leen los agregadores (sin IP,
+# user agent ni URL)
+REQUEST_FIELDS = ('insertId', 'timestamp', 'resource.labels.service_name',
+                  'resource.labels.revision_name', 'httpRequest.status',
+                  'httpRequest.latency')
+ERROR_LOGS_QUERY = LogQuery(
+    'errors', 'resource.type="cloud_run_revision" AND severity>=ERROR',
+    window_days=7, timeout=300,
+    fields=('insertId', 'timestamp', 'severity', 'resource', 'textPayload',
+            'jsonPayload', 'httpRequest', 'trace', 'spanId')
+)
+REQUEST_ERRORS_QUERY = LogQuery(
+    'requests5xx', 'resource.type="cloud_run_revision" AND httpRequest.status>=500',
+    window_days=7, timeout=180,
+    fields=REQUEST_FIELDS
+)
+REQUESTS_QUERY = LogQuery(
+    'requests', 'resource.type="cloud_run_revision" AND httpRequest.requestMethod!=""',
+    window_days=30, timeout=300,
+    fields=REQUEST_FIELDS
+)
+
+# 'full' vuelve a leer toda la ventana; 'incremental' usa cursores en data/
+LOG_INGEST_MODE = os.environ.get('LOG_INGEST_MODE', 'full')
+
+# Origen de los conteos de requests: 'logs' (contar entradas) o
+# 'monitoring' (series pre-agregadas de Cloud Monitoring)
+REQUEST_STATS_BACKEND = os.environ.get('REQUEST_STATS_BACKEND', 'logs')
+
+
+class SourceSnapshot:
+    """
+    Snapshot de fuentes con alcance de una ejecucion.
+
+    Cada consulta se ejecuta y parsea una sola vez; los colectores que piden
+    la misma consulta (incluso en paralelo) reciben el mismo payload parseado.
+    """
+
+    def __init__(self, ingest_state=None):
+        self.ingest_state = ingest_state
+        self._payloads = {}
+        self._locks = {}
+        self._guard = threading.Lock()
+        self.fetches = 0
+        self.hits = 0
+        # {consulta: {'entries': n, 'exact': bool}}: si los conteos son exactos
+        # o se basan en una lectura cortada (timeout, error o tope de entradas)
+        self.log_coverage = {}
+
+    def get(self, key, loader):
+        """Retorna el payload de key, cargandolo con loader() si no existe."""
+        with self._guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if key in self._payloads:
+                self.hits += 1
+                return self._payloads[key]
+            self.fetches += 1
+            payload = loader()
+            self._payloads[key] = payload
+            return payload
+
+    def json_command(self, cmd, timeout=120, label='comando'):
+        """Ejecuta cmd una vez y retorna su salida JSON parseada (None si falla)."""
+        def load():
+            output = run_command(cmd, timeout=timeout)
+            if not output:
+                return None
+            try:
+                return json.loads(output)
+            except json.JSONDecodeError as e:
+                print(f"Error parseando JSON de {label}: {e}")
+                return None
+        return self.get(cmd, load)
+
+    def cloud_run_services(self):
+        """Payload de 'gcloud run services list'."""
+        return self.json_command(CLOUD_RUN_SERVICES_CMD, label='Cloud Run')
+
+    def stream_logs(self, query):
+        """
+        Itera las entradas de una consulta de logs para agregadores de una sola
+        pasada. En modo completo se leen en streaming sin materializar la
+        lista; en modo incremental se itera la ventana movil ya actualizada.
+        """
+        if self.ingest_state is None:
+            return self._stream_full(query)
+        entries = self.get(('ingest', query.key),
+                           lambda: self.ingest_state.ingest(query, CommandStream)) or []
+        self.log_coverage[query.key] = self.ingest_state.coverage.get(
+            query.key, {'entries': len(entries), 'exact': False})
+        return entries
+
+    def _stream_full(self, query):
+        stream = CommandStream(query.command(), query.timeout)
+        fetched = 0
+        for entry in stream:
+            fetched += 1
+            yield query.project(entry)
+        self.log_coverage[query.key] = {
+            'entries': fetched,
+            'exact': stream.ok and not query.is_truncated(fetched)
+        }
+
+    def is_exact(self, query):
+        """Indica si los conteos derivados de query cubren toda la ventana."""
+        return self.log_coverage.get(query.key, {}).get('exact', False)
+
+    def log_entries(self, query):
+        """Entradas de una consulta de logs compartida por varias vistas (lista)."""
+        return self.get(('entries', query.key), lambda: list(self.stream_logs(query)))
+
+    def error_logs(self):
+        """Logs severity>=ERROR de los ultimos 7 dias."""
+        return self.log_entries(ERROR_LOGS_QUERY)
+
+
+def get_cloud_run_services(snapshot=None):
     """Obtiene la lista de servicios de Cloud Run."""
-    cmd = 'gcloud run services list --format="json" 2>/dev/null'
-    output = run_command(cmd)
+    data = (snapshot or SourceSnapshot()).cloud_run_services()
 
-    if not output:
+    if not data:
         return []
 
     try:
-        data = json.loads(output)
         services = []
 
         for svc in data:
@@ -133,21 +306,20 @@ def get_cloud_run_services():
             })
 
         return services
-    except json.JSONDecodeError as e:
-        print(f"Error parseando JSON de Cloud Run: {e}")
+    except (KeyError, TypeError) as e:
+        print(f"Error procesando servicios de Cloud Run: {e}")
         return []
 
-def get_error_logs():
+def get_error_logs(snapshot=None):
     """Obtiene los errores de los últimos 7 días agrupados por servicio."""
-    # Obtener errores de los últimos 7 días
-    cmd = '''gcloud logging read 'resource.type="cloud_run_revision" AND severity>=ERROR' --limit=1000 --format="json" --freshness=7d 2>/dev/null'''
-    output = run_command(cmd, timeout=180)
+    # Comparte la consulta de logs con get_all_errors_detailed
+    snapshot = snapshot or SourceSnapshot()
+    data = snapshot.error_logs()
 
-    if not output:
+    if not data:
         return {}
 
     try:
-        data = json.loads(output)
         errors_by_service = defaultdict(lambda: {
             'total': 0,
             'last24h': 0,
@@ -194,9 +366,14 @@ def get_error_logs():
                     'severity': severity
                 })
 
+        # Conteos exactos o basados en una lectura parcial de los logs
+        exact = snapshot.is_exact(ERROR_LOGS_QUERY)
+        for counters in errors_by_service.values():
+            counters['exact'] = exact
+
         return dict(errors_by_service)
-    except json.JSONDecodeError as e:
-        print(f"Error parseando JSON de logs: {e}")
+    except (AttributeError, TypeError) as e:
+        print(f"Error procesando logs de errores: {e}")
         return {}
 
 def get_deployments():
@@ -214,7 +391,8 @@ def get_deployments():
             'last24h': 0,
             'last7d': 0,
             'lastDeployment': None,
-            'recentDeployments': []
+            'recentDeployments': [],
+            'byDay': {}
         })
 
         now = datetime.now(timezone.utc)
@@ -244,6 +422,9 @@ def get_deployments():
 
             if timestamp > week_ago:
                 deployments_by_service[service_name]['last7d'] += 1
+                by_day = deployments_by_service[service_name]['byDay']
+                day = timestamp.strftime('%Y-%m-%d')
+                by_day[day] = by_day.get(day, 0) + 1
 
             if timestamp > day_ago:
                 deployments_by_service[service_name]['last24h'] += 1
@@ -272,22 +453,21 @@ def get_deployments():
         print(f"Error parseando JSON de revisiones: {e}")
         return {}
 
-def get_request_metrics():
+def get_request_metrics(snapshot=None):
     """Obtiene métricas de requests HTTP de los últimos 7 días."""
-    # Obtener requests con errores 5xx
-    cmd = '''gcloud logging read 'resource.type="cloud_run_revision" AND httpRequest.status>=500' --limit=500 --format="json" --freshness=7d 2>/dev/null'''
-    output = run_command(cmd, timeout=180)
+    # Obtener requests con errores 5xx (todas las páginas)
+    snapshot = snapshot or SourceSnapshot()
+    data = snapshot.stream_logs(REQUEST_ERRORS_QUERY)
 
     metrics_by_service = defaultdict(lambda: {
         'errors5xx': 0,
         'errors4xx': 0,
         'avgLatencyMs': 0,
-        'latencySamples': []
+        'latencySketch': LatencySketch()
     })
 
-    if output:
+    if data:
         try:
-            data = json.loads(output)
             for log in data:
                 resource = log.get('resource', {})
                 labels = resource.get('labels', {})
@@ -300,51 +480,60 @@ def get_request_metrics():
                 elif status >= 400:
                     metrics_by_service[service_name]['errors4xx'] += 1
 
-                # Obtener latencia
-                latency = http_request.get('latency', '')
-                if latency:
-                    try:
-                        # Formato: "0.123456s"
-                        latency_sec = float(latency.rstrip('s'))
-                        latency_ms = int(latency_sec * 1000)
-                        metrics_by_service[service_name]['latencySamples'].append(latency_ms)
-                    except:
-                        pass
-        except json.JSONDecodeError:
+                # Obtener latencia (formato: "0.123456s")
+                latency_ms = parse_latency_ms(http_request.get('latency', ''))
+                if latency_ms is not None:
+                    metrics_by_service[service_name]['latencySketch'].add(latency_ms)
+        except (AttributeError, TypeError):
             pass
 
-    # Calcular promedios de latencia
+    # Calcular promedio y percentiles de latencia de las requests 5xx
+    exact = snapshot.is_exact(REQUEST_ERRORS_QUERY)
     for service_name, metrics in metrics_by_service.items():
-        samples = metrics['latencySamples']
-        if samples:
-            metrics['avgLatencyMs'] = sum(samples) // len(samples)
-        del metrics['latencySamples']
+        sketch = metrics.pop('latencySketch')
+        if sketch.count:
+            summary = sketch.summary()
+            metrics['avgLatencyMs'] = summary['meanMs']
+            metrics['p50Ms'] = summary['p50Ms']
+            metrics['p90Ms'] = summary['p90Ms']
+            metrics['p99Ms'] = summary['p99Ms']
+        metrics['exact'] = exact
 
     return dict(metrics_by_service)
 
-def get_user_interactions():
-    """Obtiene el conteo de interacciones de usuarios (requests HTTP) por servicio."""
+def get_user_interactions(snapshot=None, latency_store=None):
+    """
+    Obtiene el conteo de interacciones de usuarios (requests HTTP) por servicio,
+    junto con percentiles de latencia de los últimos 7 días por servicio y revisión.
+
+    Si se pasa latency_store, también actualiza sus sketches por hora para
+    las vistas diarias y semanales.
+    """
     interactions_by_service = defaultdict(lambda: {
         'requests7d': 0,
         'requests30d': 0
     })
+    service_sketches = defaultdict(LatencySketch)
+    revision_sketches = defaultdict(lambda: defaultdict(LatencySketch))
+    hourly = defaultdict(lambda: {'services': defaultdict(LatencySketch),
+                                  'revisions': defaultdict(LatencySketch)})
 
     # Obtener requests de los últimos 30 días
     # Usamos httpRequest para contar solo requests HTTP reales (no logs internos)
     print("  Obteniendo requests de 30 días...")
-    cmd_30d = '''gcloud logging read 'resource.type="cloud_run_revision" AND httpRequest.requestMethod!=""' --limit=10000 --format="json" --freshness=30d 2>/dev/null'''
-    output_30d = run_command(cmd_30d, timeout=300)
+    snapshot = snapshot or SourceSnapshot()
+    data = snapshot.stream_logs(REQUESTS_QUERY)
 
     now = datetime.now(timezone.utc)
     week_ago = now - timedelta(days=7)
 
-    if output_30d:
+    if data:
         try:
-            data = json.loads(output_30d)
             for log in data:
                 resource = log.get('resource', {})
                 labels = resource.get('labels', {})
                 service_name = labels.get('service_name', 'unknown')
+                revision_name = labels.get('revision_name', '')
                 timestamp_str = log.get('timestamp', '')
 
                 # Parsear timestamp
@@ -356,31 +545,60 @@ def get_user_interactions():
                 # Contar para 30 días
                 interactions_by_service[service_name]['requests30d'] += 1
 
+                latency_ms = parse_latency_ms(log.get('httpRequest', {}).get('latency', ''))
+
                 # Contar para 7 días
                 if timestamp > week_ago:
                     interactions_by_service[service_name]['requests7d'] += 1
+                    if latency_ms is not None:
+                        service_sketches[service_name].add(latency_ms)
+                        if revision_name:
+                            revision_sketches[service_name][revision_name].add(latency_ms)
+
+                if latency_store is not None and latency_ms is not None:
+                    bucket = hourly[hour_key(timestamp)]
+                    bucket['services'][service_name].add(latency_ms)
+                    if revision_name:
+                        bucket['revisions'][revision_name].add(latency_ms)
+
+        except (AttributeError, TypeError) as e:
+            print(f"  Error procesando interacciones: {e}")
+
+    exact = snapshot.is_exact(REQUESTS_QUERY)
+    for service_name, counters in interactions_by_service.items():
+        counters['exact'] = exact
+        if service_sketches[service_name].count:
+            counters['latency'] = service_sketches[service_name].summary()
+            counters['latencyByRevision'] = {
+                rev: sketch.summary() for rev, sketch in revision_sketches[service_name].items()
+            }
 
-        except json.JSONDecodeError as e:
-            print(f"  Error parseando JSON de interacciones: {e}")
+    if latency_store is not None:
+        latency_store.update_hours({key: {'services': dict(b['services']), 'revisions': dict(b['revisions'])}
+                                    for key, b in hourly.items()}, now=now)
 
     return dict(interactions_by_service)
 
-def get_service_configurations():
-    """Obtiene la configuración de CPU y memoria de cada servicio para estimar costos."""
-    cmd = 'gcloud run services list --format="json" 2>/dev/null'
-    output = run_command(cmd)
+def get_service_configurations(snapshot=None):
+    """
+    Obtiene la configuración de cada servicio para estimar costos: CPU, memoria,
+    concurrencia, instancias mínimas/máximas y modo de asignación de CPU.
+    """
+    data = (snapshot or SourceSnapshot()).cloud_run_services()
 
-    if not output:
+    if not data:
         return {}
 
     try:
-        data = json.loads(output)
         configs = {}
 
         for svc in data:
             name = svc['metadata']['name']
-            spec = svc.get('spec', {}).get('template', {}).get('spec', {})
+            template = svc.get('spec', {}).get('template', {})
+            spec = template.get('spec', {})
             containers = spec.get('containers', [{}])
+            annotations = template.get('metadata', {}).get('annotations', {})
+            service_annotations = svc['metadata'].get('annotations', {})
 
             if containers:
                 resources = containers[0].get('resources', {}).get('limits', {})
@@ -405,15 +623,25 @@ def get_service_configurations():
                 else:
                     memory_gib = 0.5  # Default
 
+                # Instancias mínimas de la revisión o, si no tiene, del servicio
+                min_scale = (annotations.get('autoscaling.knative.dev/minScale')
+                             or service_annotations.get('run.googleapis.com/minScale') or 0)
+                max_scale = annotations.get('autoscaling.knative.dev/maxScale')
+
                 configs[name] = {
                     'cpu': cpu_cores,
                     'memoryGiB': memory_gib,
                     'cpuRaw': cpu,
-                    'memoryRaw': memory
+                    'memoryRaw': memory,
+                    'concurrency': int(spec.get('containerConcurrency') or 80),
+                    'minInstances': int(min_scale),
+                    'maxInstances': int(max_scale) if max_scale else None,
+                    # cpu-throttling: false = CPU siempre asignada (facturación por instancia)
+                    'cpuAlwaysAllocated': annotations.get('run.googleapis.com/cpu-throttling') == 'false'
                 }
 
         return configs
-    except json.JSONDecodeError as e:
+    except (KeyError, TypeError, ValueError) as e:
         print(f"Error parseando configuración de servicios: {e}")
         return {}
 
@@ -531,6 +759,7 @@ def get_real_billing_data():
       service_name,
       ROUND(mtd_cost, 2) as mtd_cost,
       days_with_data,
+      avg_daily_cost,
       ROUND(avg_daily_cost * 31, 2) as projected_monthly
     FROM service_summary
     ORDER BY mtd_cost DESC
@@ -548,6 +777,7 @@ def get_real_billing_data():
             costs[service] = {
                 'mtd': float(row['mtd_cost']),
                 'projected': float(row['projected_monthly']),
+                'avgDaily': float(row['avg_daily_cost']),
                 'days': int(row['days_with_data'])
             }
 
@@ -559,12 +789,14 @@ def get_real_billing_data():
         return None
 
 
-def get_project_cost_summary(cloud_run_cost, cloud_sql_data):
-    """Genera un resumen de costos del proyecto usando datos reales de BigQuery."""
-    sql_cost = cloud_sql_data.get('totalCost', 0)
+def get_project_cost_summary(cloud_run_cost, cloud_sql_data, real_costs=None):
+    """
+    Genera un resumen de costos del proyecto usando datos reales de BigQuery.
 
-    # Intentar obtener costos reales de BigQuery
-    real_costs = get_real_billing_data()
+    real_costs es el resultado de get_real_billing_data() (obtenido por el
+    motor de colectores); si es None se usan estimaciones.
+    """
+    sql_cost = cloud_sql_data.get('totalCost', 0)
 
     if real_costs:
         print("  Usando datos reales de facturación de BigQuery")
@@ -627,115 +859,26 @@ def get_project_cost_summary(cloud_run_cost, cloud_sql_data):
         }
 
 
-def get_billable_time_from_monitoring(service_name):
-    """Obtiene el tiempo de ejecución facturable desde Cloud Monitoring."""
-    # Por ahora usamos una estimación más realista basada en patrones típicos
-    return None
-
-
-def estimate_monthly_cost(config, interactions, avg_latency_ms):
-    """
-    Estima el costo mensual de un servicio Cloud Run.
-
-    Precios de Cloud Run (us-central1) - Enero 2025:
-    - CPU: $0.00002400 por vCPU-segundo
-    - Memoria: $0.00000250 por GiB-segundo
-    - Requests: $0.40 por millón de requests
-    - Tier gratuito: 2 millones de requests, 360,000 vCPU-segundos, 180,000 GiB-segundos
-
-    Consideraciones adicionales:
-    - Cold start: ~2-5 segundos adicionales por instancia nueva
-    - Min instances: Si hay instancias mínimas, se factura 24/7
-    - Tiempo mínimo facturable: 100ms por request
+def get_user_interactions_from_monitoring(client=None):
     """
-    CPU_PRICE_PER_VCPU_SECOND = 0.00002400
-    MEMORY_PRICE_PER_GIB_SECOND = 0.00000250
-    REQUEST_PRICE_PER_MILLION = 0.40
-
-    # Estimar requests mensuales
-    requests_7d = interactions.get('requests7d', 0)
-    requests_30d = interactions.get('requests30d', 0)
-
-    # Si 7d y 30d son iguales, significa que solo tenemos 7 días de datos
-    # Proyectar a 30 días multiplicando por ~4.3 (30/7)
-    if requests_7d > 0 and requests_7d == requests_30d:
-        estimated_monthly_requests = int(requests_7d * 4.3)
-    else:
-        estimated_monthly_requests = requests_30d
-
-    # Estimar latencia promedio más realista
-    # La latencia de error logs suele ser mayor que la normal
-    # Usar un promedio típico de aplicación Django: 200-500ms
-    if avg_latency_ms <= 0:
-        avg_latency_ms = 350  # Default más realista para Django
-    elif avg_latency_ms > 2000:
-        # Si es muy alta (viene de errores), reducir un poco
-        avg_latency_ms = int(avg_latency_ms * 0.7)
-
-    # Tiempo mínimo facturable es 100ms
-    billable_ms = max(avg_latency_ms, 100)
-
-    # Agregar tiempo de cold start (estimado 10% de requests son cold starts)
-    # Cold start típico: 3 segundos
-    cold_start_overhead_ms = 3000 * 0.10  # 300ms promedio por request
-    effective_ms_per_request = billable_ms + cold_start_overhead_ms
-
-    # Tiempo total de ejecución en segundos
-    total_execution_seconds = (estimated_monthly_requests * effective_ms_per_request) / 1000
-
-    # Costos base
-    cpu_cores = config.get('cpu', 1)
-    memory_gib = config.get('memoryGiB', 0.5)
-
-    cpu_cost = cpu_cores * total_execution_seconds * CPU_PRICE_PER_VCPU_SECOND
-    memory_cost = memory_gib * total_execution_seconds * MEMORY_PRICE_PER_GIB_SECOND
-    request_cost = (estimated_monthly_requests / 1_000_000) * REQUEST_PRICE_PER_MILLION
-
-    # Agregar costo de instancias mínimas si el servicio tiene tráfico constante
-    # (asumimos 0 min instances por defecto, pero servicios activos suelen tener al menos 1)
-    min_instance_cost = 0
-    if estimated_monthly_requests > 10000:
-        # Servicios con alto tráfico probablemente tienen min instances
-        # 1 min instance 24/7 = 2,592,000 segundos/mes
-        # Pero Cloud Run solo cobra cuando hay requests, así que esto es solo para referencia
-        pass
+    Obtiene requests por servicio (7 y 30 días) y distribución de latencias
+    desde Cloud Monitoring, sin descargar logs. Mismo formato que
+    get_user_interactions, más 'latency' y 'billableInstanceSeconds30d'.
 
-    # Total
-    total_cost = cpu_cost + memory_cost + request_cost
-
-    # Aplicar factor de ajuste basado en observaciones reales
-    # Los costos reales suelen ser 2-3x la estimación básica debido a:
-    # - Overhead de contenedor
-    # - Tiempo de graceful shutdown
-    # - Variabilidad en latencia
-    adjustment_factor = 2.0
-    adjusted_total = total_cost * adjustment_factor
-    adjusted_cpu = cpu_cost * adjustment_factor
-    adjusted_memory = memory_cost * adjustment_factor
-
-    return {
-        'estimatedMonthly': round(adjusted_total, 2),
-        'cpuCost': round(adjusted_cpu, 2),
-        'memoryCost': round(adjusted_memory, 2),
-        'requestCost': round(request_cost, 2),
-        'estimatedRequests': estimated_monthly_requests,
-        'avgLatencyMs': int(effective_ms_per_request),
-        'cpuCores': cpu_cores,
-        'memoryGiB': memory_gib,
-        'note': 'Estimacion incluye cold starts y overhead tipico'
-    }
+    Si la API falla se lanza MonitoringError y el colector queda con error
+    (en lugar de publicar 0 requests por servicio).
+    """
+    return get_request_stats(client or MonitoringClient(PROJECT_ID))
 
 
-def get_all_errors_detailed():
+def get_all_errors_detailed(snapshot=None):
     """Obtiene todos los errores detallados de los últimos 7 días."""
-    cmd = '''gcloud logging read 'resource.type="cloud_run_revision" AND severity>=ERROR' --limit=2000 --format="json" --freshness=7d 2>/dev/null'''
-    output = run_command(cmd, timeout=300)
+    data = (snapshot or SourceSnapshot()).error_logs()
 
-    if not output:
+    if not data:
         return []
 
     try:
-        data = json.loads(output)
         errors = []
 
         for log in data:
@@ -785,40 +928,36 @@ def get_all_errors_detailed():
             })
 
         return errors
-    except json.JSONDecodeError as e:
-        print(f"Error parseando JSON de errores detallados: {e}")
+    except (AttributeError, TypeError) as e:
+        print(f"Error procesando errores detallados: {e}")
         return []
 
-def get_github_repos():
+def get_github_repos(client=None):
     """Obtiene la lista de repositorios de GitHub."""
-    cmd = 'gh repo list --limit 100 --json name,url,updatedAt,description 2>/dev/null'
-    output = run_command(cmd)
-
-    if not output:
+    client = client or GitHubClient()
+    try:
+        data = client.list_user_repos(limit=100)
+    except (GitHubError, OSError, ValueError) as e:
+        print(f"Error consultando repositorios de GitHub: {e}")
         return []
 
-    try:
-        data = json.loads(output)
-        repos = []
+    repos = []
 
-        # Crear mapeo inverso para encontrar servicios Cloud Run
-        repo_to_service = {v: k for k, v in SERVICE_TO_REPO.items()}
+    # Crear mapeo inverso para encontrar servicios Cloud Run
+    repo_to_service = {v: k for k, v in SERVICE_TO_REPO.items()}
 
-        for repo in data:
-            cloud_run_service = repo_to_service.get(repo['name'])
+    for repo in data:
+        cloud_run_service = repo_to_service.get(repo['name'])
 
-            repos.append({
-                'name': repo['name'],
-                'url': repo['url'],
-                'description': repo.get('description', ''),
-                'updatedAt': repo.get('updatedAt', ''),
-                'cloudRunService': cloud_run_service
-            })
+        repos.append({
+            'name': repo['name'],
+            'url': repo['html_url'],
+            'description': repo.get('description') or '',
+            'updatedAt': repo.get('updated_at', ''),
+            'cloudRunService': cloud_run_service
+        })
 
-        return repos
-    except json.JSONDecodeError as e:
-        print(f"Error parseando JSON de GitHub: {e}")
-        return []
+    return repos
 
 def main():
     """Función principal."""
@@ -829,43 +968,74 @@ def main():
     # Crear directorio si no existe
     os.makedirs(data_dir, exist_ok=True)
 
-    print("Obteniendo servicios de Cloud Run...")
-    services = get_cloud_run_services()
-    print(f"  Encontrados {len(services)} servicios")
+    # meta.json anterior: conserva la última calibración de costos
+    previous_meta = {}
+    try:
+        with open(os.path.join(data_dir, 'meta.json'), 'r') as f:
+            previous_meta = json.load(f)
+    except (OSError, ValueError):
+        pass
 
-    print("Obteniendo errores de logs...")
-    errors = get_error_logs()
-    print(f"  Servicios con errores: {len(errors)}")
+    print("Obteniendo datos en paralelo (Cloud Run, logs, SQL, GitHub, BigQuery)...")
+    # Las consultas repetidas entre colectores se ejecutan una sola vez
+    ingest_state = LogIngestState(data_dir) if LOG_INGEST_MODE == 'incremental' else None
+    snapshot = SourceSnapshot(ingest_state)
+    latency_store = LatencySketchStore(os.path.join(data_dir, 'latency_sketches.json'))
+    # ETags persistidos: si los repos no cambiaron, GitHub responde 304 sin costo de rate limit
+    github = GitHubClient(etag_cache=ETagCache(os.path.join(data_dir, 'github_etags.json')))
+    collectors = [
+        Collector('services', lambda: get_cloud_run_services(snapshot), default=list, timeout=150),
+        Collector('errors', lambda: get_error_logs(snapshot), timeout=330),
+        Collector('deployments', get_deployments, timeout=150),
+        Collector('requestMetrics', lambda: get_request_metrics(snapshot), timeout=210),
+        Collector('interactions',
+                  get_user_interactions_from_monitoring if REQUEST_STATS_BACKEND == 'monitoring'
+                  else lambda: get_user_interactions(snapshot, latency_store),
+                  timeout=330),
+        Collector('serviceConfigs', lambda: get_service_configurations(snapshot), timeout=150),
+        Collector('cloudSql', get_cloud_sql_costs, default=lambda: {'instances': [], 'totalCost': 0}, timeout=90),
+        Collector('repos', lambda: get_github_repos(github), default=list, timeout=150),
+        Collector('errorsDetailed', lambda: get_all_errors_detailed(snapshot), default=list, timeout=330),
+        Collector('billing', get_real_billing_data, default=lambda: None, timeout=150),
+    ]
+    results = run_collectors(collectors)
+    collector_status = {name: r.to_meta() for name, r in results.items()}
+    degraded = sorted(name for name, r in results.items() if r.status != 'ok')
+
+    services = results['services'].value
+    errors = results['errors'].value
+    deployments = results['deployments'].value
+    request_metrics = results['requestMetrics'].value
+    user_interactions = results['interactions'].value
+    service_configs = results['serviceConfigs'].value
+    cloud_sql_data = results['cloudSql'].value
+    repos = results['repos'].value
+    all_errors = results['errorsDetailed'].value
+    real_costs = results['billing'].value
+
+    for name, r in results.items():
+        print(f"  {name}: {r.status} ({r.duration:.1f}s){' - ' + r.error if r.error else ''}")
+    print(f"  Consultas ejecutadas: {snapshot.fetches} (reutilizadas: {snapshot.hits})")
+    if ingest_state is not None:
+        ingest_state.save()
+    latency_store.save()
+    github.etags.save()
+    github.close()
+    latency_views = {'last24h': latency_store.view(1), 'last7d': latency_store.view(7)}
 
-    print("Obteniendo historial de despliegues...")
-    deployments = get_deployments()
+    print(f"  Encontrados {len(services)} servicios")
+    print(f"  Servicios con errores: {len(errors)}")
     print(f"  Servicios con despliegues: {len(deployments)}")
-
-    print("Obteniendo métricas de requests...")
-    request_metrics = get_request_metrics()
     print(f"  Servicios con métricas: {len(request_metrics)}")
-
-    print("Obteniendo interacciones de usuarios...")
-    user_interactions = get_user_interactions()
     print(f"  Servicios con interacciones: {len(user_interactions)}")
-
-    print("Obteniendo configuración de servicios para estimar costos...")
-    service_configs = get_service_configurations()
     print(f"  Servicios con configuración: {len(service_configs)}")
-
-    print("Obteniendo costos de Cloud SQL...")
-    cloud_sql_data = get_cloud_sql_costs()
     print(f"  Instancias SQL activas: {cloud_sql_data.get('runningCount', 0)}")
     print(f"  Instancias SQL detenidas: {cloud_sql_data.get('stoppedCount', 0)}")
     print(f"  Costo SQL estimado: ${cloud_sql_data.get('totalCost', 0):.2f}/mes")
-
-    print("Obteniendo repositorios de GitHub...")
-    repos = get_github_repos()
     print(f"  Encontrados {len(repos)} repositorios")
-
-    print("Obteniendo errores detallados para pagina de errores...")
-    all_errors = get_all_errors_detailed()
     print(f"  Encontrados {len(all_errors)} errores detallados")
+    if degraded:
+        print(f"  Secciones degradadas: {', '.join(degraded)}")
 
     # Calcular costo de la base de datos consolidada para distribuir
     consolidated_db_cost = 0
@@ -890,33 +1060,58 @@ def main():
             'total': 0,
             'last24h': 0,
             'last7d': 0,
-            'recentErrors': []
+            'recentErrors': [],
+            'exact': snapshot.is_exact(ERROR_LOGS_QUERY)
         })
         service['deployments'] = deployments.get(name, {
             'total': 0,
             'last24h': 0,
             'last7d': 0,
             'lastDeployment': None,
-            'recentDeployments': []
+            'recentDeployments': [],
+            'byDay': {}
         })
         service['metrics'] = request_metrics.get(name, {
             'errors5xx': 0,
             'errors4xx': 0,
-            'avgLatencyMs': 0
+            'avgLatencyMs': 0,
+            'exact': snapshot.is_exact(REQUEST_ERRORS_QUERY)
         })
         service['interactions'] = user_interactions.get(name, {
             'requests7d': 0,
-            'requests30d': 0
+            'requests30d': 0,
+            'exact': snapshot.is_exact(REQUESTS_QUERY)
         })
 
-        # Calcular estimación de costos de Cloud Run
-        config = service_configs.get(name, {'cpu': 1, 'memoryGiB': 0.5})
-        avg_latency = service['metrics'].get('avgLatencyMs', 0)
-        cost_estimate = estimate_monthly_cost(
-            config,
-            service['interactions'],
-            avg_latency
-        )
+        # Tendencia de latencia (todas las requests) desde los sketches persistidos
+        service['latencyTrend'] = {
+            view: bucket['services'][name].summary()
+            for view, bucket in latency_views.items()
+            if name in bucket['services']
+        }
+
+    # Estimación de costos de Cloud Run de todos los servicios en una pasada,
+    # calibrada contra el costo real de BigQuery (o la última calibración)
+    cost_model = CostModel.from_services(services, service_configs)
+    calibration = calibrate(cost_model.estimate().total(), real_costs,
+                            (previous_meta.get('costs') or {}).get('calibration'))
+    cost_model.calibration = calibration['factor']
+    cost_estimates = cost_model.estimate()
+    cost_by_service = cost_estimates.by_service()
+    overprovisioned = cost_model.overprovisioned(cost_estimates)
+    print(f"  Modelo de costos: motor {'numpy' if cost_model.use_numpy else 'python (numpy no disponible)'}, "
+          f"{len(cost_model.names)} servicios")
+    print(f"  Calibración de costos: x{calibration['factor']} ({calibration['source']})")
+    if calibration.get('clamped'):
+        print(f"  Advertencia: el factor de calibración sin recortar es x{calibration['rawFactor']} "
+              f"(límites {CALIBRATION_BOUNDS[0]}-{CALIBRATION_BOUNDS[1]}); revisar el modelo de costos")
+    for finding in overprovisioned:
+        print(f"  Sobredimensionado: {finding['service']} - {finding['detail']} "
+              f"(ahorro ${finding['monthlySavings']:.2f}/mes)")
+
+    for service in services:
+        name = service['name']
+        cost_estimate = cost_by_service[name]
 
         # Agregar costo de Cloud SQL
         if name in SERVICES_USING_CONSOLIDATED_DB:
@@ -950,12 +1145,12 @@ def main():
 
         service['costEstimate'] = cost_estimate
 
-    # Calcular costo total estimado de Cloud Run
-    cloud_run_cost = sum(s['costEstimate']['estimatedMonthly'] for s in services)
+    # Costo total estimado de Cloud Run
+    cloud_run_cost = cost_estimates.total()
     print(f"\n  Costo Cloud Run estimado: ${cloud_run_cost:.2f}/mes")
 
     # Calcular resumen de costos del proyecto
-    project_costs = get_project_cost_summary(cloud_run_cost, cloud_sql_data)
+    project_costs = get_project_cost_summary(cloud_run_cost, cloud_sql_data, real_costs)
     print(f"  Costo Cloud SQL estimado: ${project_costs['cloudSql']:.2f}/mes")
     print(f"  Otros costos estimados: ${project_costs['other']:.2f}/mes")
     print(f"  COSTO TOTAL ESTIMADO: ${project_costs['total']:.2f}/mes")
@@ -966,18 +1161,37 @@ def main():
     errors_path = os.path.join(data_dir, 'errors.json')
     meta_path = os.path.join(data_dir, 'meta.json')
 
-    with open(services_path, 'w') as f:
-        json.dump(services, f, indent=2)
+    # JSON minificado: estos archivos los descarga el navegador
+    write_compact(services_path, services)
     print(f"  Guardado: {services_path}")
 
-    with open(repos_path, 'w') as f:
-        json.dump(repos, f, indent=2)
+    write_compact(repos_path, repos)
     print(f"  Guardado: {repos_path}")
 
-    with open(errors_path, 'w') as f:
-        json.dump(all_errors, f, indent=2)
+    if ERROR_STORE == 'sqlite':
+        # Base de errores: deduplica por insertId y errors.json sale de la base
+        warehouse = ErrorWarehouse(warehouse_path(data_dir))
+        inserted = warehouse.insert_errors(all_errors)
+        warehouse.expire()
+        all_errors = warehouse.errors_between(datetime.now(timezone.utc) - timedelta(days=EXPORT_WINDOW_DAYS))
+        warehouse.close()
+        print(f"  Base de errores: {inserted} nuevos, {len(all_errors)} en la ventana")
+
+    # errors.json completo queda como entrada de consolidate_errors.py;
+    # las paginas solo descargan los shards que muestran
+    write_compact(errors_path, all_errors, gzip_copy=False)
     print(f"  Guardado: {errors_path}")
 
+    manifest = publish_error_shards(all_errors, data_dir)
+    print(f"  Shards de errores: {len(manifest['days'])} dias, {len(manifest['services'])} servicios")
+    # El indice numera los errores segun los shards recien publicados
+    build_search_index(data_dir)
+
+    # Conteos precalculados para los graficos (unos pocos KB)
+    aggregates_path = os.path.join(data_dir, 'aggregates.json')
+    write_compact(aggregates_path, build_aggregates(all_errors, services))
+    print(f"  Guardado: {aggregates_path}")
+
     # Calcular totales para metadatos
     total_errors_24h = sum(s['errors']['last24h'] for s in services)
     total_errors_7d = sum(s['errors']['last7d'] for s in services)
@@ -1006,15 +1220,29 @@ def main():
                 'running': project_costs['sqlInstances'],
                 'stopped': project_costs['sqlStopped']
             },
-            'breakdown': project_costs['otherBreakdown']
+            'breakdown': project_costs['otherBreakdown'],
+            'calibration': calibration,
+            'freeTierCredit': round(sum(cost_estimates.column('free_tier_credit')), 2),
+            'overprovisioned': overprovisioned,
+            # Costo de Cloud Run si se cambia la CPU o las instancias mínimas de todos los servicios
+            'sensitivity': [
+                cost_model.sensitivity('cpu', [0.25, 0.5, 1, 2]),
+                cost_model.sensitivity('min_instances', [0, 1])
+            ]
         },
-        'cloudSqlInstances': cloud_sql_data.get('instances', [])
+        'cloudSqlInstances': cloud_sql_data.get('instances', []),
+        'collectors': collector_status,
+        'logCoverage': snapshot.log_coverage,
+        'degradedSections': degraded
     }
 
-    with open(meta_path, 'w') as f:
-        json.dump(meta, f, indent=2)
+    write_compact(meta_path, meta)
     print(f"  Guardado: {meta_path}")
 
+    # Historial columnar: una fila por servicio por ejecucion
+    history = HistoryStore(os.path.join(data_dir, 'history'))
+    print(f"  Historial: {history.record(services, meta)} filas agregadas")
+
     print("\nActualización completada!")
     print(f"  Errores últimas 24h: {total_errors_24h}")
     print(f"  Errores últimos 7 días: {total_errors_7d}")
@@ -0,0 +1,14 @@
+"""Digest de las entradas del prompt de analisis."""
+
+from analysis_cache import analysis_digest
+
+
+def _error(method):
+    return {'services': ['crm'], 'error_type': 'KeyError', 'sample_message': "KeyError: 'x'",
+            'sample_http': {'method': method, 'url': '/api', 'status': 500}}
+
+
+def test_digest_depends_on_http_method():
+    # sample_http guarda el metodo como 'method' (ver get_all_errors_detailed)
+    assert analysis_digest(_error('GET')) != analysis_digest(_error('POST'))
+    assert analysis_digest(_error('GET')) == analysis_digest(_error('GET'))
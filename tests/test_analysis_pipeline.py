@@ -0,0 +1,76 @@
+"""Pipeline de llamadas a la API: concurrencia, reintentos y limite de tasa."""
+
+import pytest
+
+from analysis_pipeline import (FakeAPIError, FakeClient, TokenBucket, call_with_retry,
+                               is_retryable, run_concurrent)
+
+
+def _ask(client, prompt):
+    response = client.messages.create(model='fake', max_tokens=100,
+                                      messages=[{'role': 'user', 'content': prompt}])
+    return response.content[0].text
+
+
+def test_run_concurrent_with_fake_client():
+    client = FakeClient(latency=0.05, responder=lambda prompt: prompt.upper())
+    jobs = {f'svc-{i}': f'prompt {i}' for i in range(8)}
+    results = run_concurrent(jobs, lambda key, prompt: _ask(client, prompt), max_concurrency=3)
+    assert list(results) == list(jobs)
+    assert results['svc-5'] == 'PROMPT 5'
+    assert client.calls == 8
+    assert 1 < client.max_in_flight <= 3
+    assert run_concurrent({}, lambda key, value: None) == {}
+
+
+def test_run_concurrent_propagates_worker_errors():
+    client = FakeClient(failures=[400])
+    with pytest.raises(FakeAPIError):
+        run_concurrent({'a': 'x'}, lambda key, prompt: _ask(client, prompt))
+
+
+def test_call_with_retry_recovers_from_transient_errors():
+    client = FakeClient(failures=[429, 503])
+    delays = []
+    text = call_with_retry(lambda: _ask(client, 'hola'), sleep=delays.append)
+    assert text.startswith('**Resumen**')
+    assert client.calls == 3
+    assert len(delays) == 2
+
+
+def test_call_with_retry_respects_retry_after_and_limits():
+    calls = []
+
+    def rate_limited():
+        calls.append(1)
+        raise FakeAPIError(429, retry_after=7)
+
+    delays = []
+    with pytest.raises(FakeAPIError):
+        call_with_retry(rate_limited, max_retries=2, sleep=delays.append)
+    assert len(calls) == 3
+    assert delays == [7.0, 7.0]
+
+
+def test_non_retryable_errors_raise_immediately():
+    client = FakeClient(failures=[400])
+    delays = []
+    with pytest.raises(FakeAPIError):
+        call_with_retry(lambda: _ask(client, 'hola'), sleep=delays.append)
+    assert client.calls == 1 and delays == []
+    assert not is_retryable(ValueError('x'))
+    assert is_retryable(ConnectionError('reset'))
+
+
+def test_token_bucket_waits_for_tokens():
+    now = [0.0]
+    waits = []
+
+    def sleep(seconds):
+        waits.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(4):
+        bucket.acquire()
+    assert waits == [0.5, 0.5]
@@ -0,0 +1,49 @@
+"""Motor de colectores: errores, timeouts y presupuesto de la ejecucion."""
+
+import threading
+import time
+
+from collector_engine import Collector, run_collectors
+
+
+def _fail():
+    raise ValueError('sin datos')
+
+
+def test_ok_and_error_results():
+    results = run_collectors([
+        Collector('ok', lambda: {'a': 1}),
+        Collector('error', _fail, default=list),
+    ], max_workers=2, run_budget=10)
+    assert results['ok'].status == 'ok' and results['ok'].value == {'a': 1}
+    assert results['error'].status == 'error'
+    assert results['error'].error == 'ValueError: sin datos'
+    assert results['error'].value == []
+
+
+def test_slow_collector_times_out_without_blocking_others():
+    release = threading.Event()
+    results = run_collectors([
+        Collector('slow', lambda: release.wait(5), timeout=0.2),
+        Collector('fast', lambda: 'listo'),
+    ], max_workers=1, run_budget=10)
+    release.set()
+    assert results['slow'].status == 'timeout'
+    assert results['slow'].value == {}
+    # Con un solo worker, 'fast' corre en el worker de reemplazo
+    assert results['fast'].status == 'ok' and results['fast'].value == 'listo'
+
+
+def test_run_budget_degrades_running_and_pending():
+    release = threading.Event()
+    start = time.monotonic()
+    results = run_collectors([
+        Collector('running', lambda: release.wait(5), timeout=60),
+        Collector('pending', lambda: 'nunca'),
+    ], max_workers=1, run_budget=0.3)
+    release.set()
+    assert time.monotonic() - start < 2
+    assert results['running'].status == 'timeout'
+    assert 'presupuesto' in results['running'].error
+    assert results['pending'].status == 'skipped'
+    assert results['pending'].to_meta()['status'] == 'skipped'
@@ -0,0 +1,70 @@
+"""Ocurrencias guardadas por grupo: las mas recientes en todos los modos."""
+
+import random
+from datetime import datetime, timezone, timedelta
+
+import consolidate_errors as ce
+from consolidation_state import ConsolidationState
+from error_warehouse import ErrorWarehouse
+
+
+def _errors(start, stop, base):
+    rng = random.Random(start)
+    errors = [{
+        'id': f'id{i}',
+        'service': rng.choice(['crm-gyt', 'seyca']),
+        'message': rng.choice(["KeyError: 'x'", 'ValueError: y', 'Timeout']),
+        'timestamp': (base + timedelta(minutes=i)).strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+    } for i in range(start, stop)]
+    # errors.json viene del mas reciente al mas antiguo
+    return sorted(errors, key=lambda e: e['timestamp'], reverse=True)
+
+
+def _occurrences(groups):
+    return {h: [o['timestamp'] for o in g['occurrences']] for h, g in groups.items()}
+
+
+def test_incremental_keeps_newest_occurrences(tmp_path):
+    base = datetime.now(timezone.utc) - timedelta(days=2)
+    first_run = _errors(0, 300, base)
+    second_run = _errors(0, 300, base) + _errors(300, 600, base)
+    second_run.sort(key=lambda e: e['timestamp'], reverse=True)
+    full = ce.consolidate_errors(second_run, workers=1)
+
+    state = ConsolidationState(str(tmp_path))
+    ce.consolidate_errors_incremental(first_run, state, workers=1)
+    state.save()
+    incremental = ce.consolidate_errors_incremental(second_run, ConsolidationState(str(tmp_path)), workers=1)
+
+    assert _occurrences(incremental) == _occurrences(full)
+    for timestamps in _occurrences(full).values():
+        assert timestamps == sorted(timestamps, reverse=True)
+        assert len(timestamps) == ce.MAX_OCCURRENCES
+
+
+def test_parallel_and_warehouse_match_serial(tmp_path):
+    errors = _errors(0, 500, datetime(2026, 1, 1, tzinfo=timezone.utc))
+    serial = ce.consolidate_errors(errors, workers=1)
+    parallel = ce.finalize_groups(ce.build_partial_groups_parallel(errors, workers=2, chunk_size=37))
+    warehouse = ErrorWarehouse(str(tmp_path / 'errors.db'))
+    warehouse.insert_errors(errors[250:])
+    warehouse.insert_errors(errors)
+    assert _occurrences(parallel) == _occurrences(serial)
+    assert _occurrences(ce.consolidate_from_warehouse(warehouse)) == _occurrences(serial)
+    warehouse.close()
+
+
+def test_incremental_applies_errors_without_id_once(tmp_path):
+    base = datetime.now(timezone.utc) - timedelta(days=2)
+    errors = _errors(0, 50, base)
+    for error in errors[:10]:
+        del error['id']
+
+    state = ConsolidationState(str(tmp_path))
+    ce.consolidate_errors_incremental(errors, state, workers=1)
+    state.save()
+
+    state = ConsolidationState(str(tmp_path))
+    assert state.new_errors(errors) == []
+    groups = ce.consolidate_errors_incremental(errors, state, workers=1)
+    assert sum(g['count'] for g in groups.values()) == 50
@@ -0,0 +1,37 @@
+"""Calibracion del modelo de costos contra BigQuery."""
+
+import pytest
+
+from cost_model import CALIBRATION_BOUNDS, DAYS_PER_MONTH, calibrate
+
+
+def test_same_month_length_on_both_sides():
+    # 10 USD por dia son 10 x 30.4 USD en el mes de 730 h del modelo
+    real = {'Cloud Run': {'projected': 310.0, 'avgDaily': 10.0, 'days': 10}}
+    calibration = calibrate(10.0 * DAYS_PER_MONTH, real)
+    assert calibration['factor'] == 1.0
+    assert calibration['source'] == 'bigquery'
+    assert 'clamped' not in calibration
+
+
+def test_projection_without_daily_average():
+    real = {'Cloud Run': {'projected': 310.0, 'days': 10}}
+    assert calibrate(10.0 * DAYS_PER_MONTH, real)['factor'] == 1.0
+
+
+@pytest.mark.parametrize('model_monthly, bound', [(1.0, CALIBRATION_BOUNDS[1]),
+                                                  (10_000.0, CALIBRATION_BOUNDS[0])])
+def test_clamped_factor_is_flagged(model_monthly, bound):
+    real = {'Cloud Run': {'projected': 310.0, 'avgDaily': 10.0, 'days': 10}}
+    calibration = calibrate(model_monthly, real)
+    assert calibration['factor'] == bound
+    assert calibration['source'] == 'bigquery-clamped'
+    assert calibration['clamped'] is True
+    assert calibration['rawFactor'] == round(10.0 * DAYS_PER_MONTH / model_monthly, 3)
+
+
+def test_too_few_days_keeps_previous():
+    real = {'Cloud Run': {'projected': 310.0, 'avgDaily': 10.0, 'days': 2}}
+    calibration = calibrate(100.0, real, previous={'factor': 1.5, 'source': 'bigquery'})
+    assert calibration['factor'] == 1.5
+    assert calibration['source'] == 'previous'
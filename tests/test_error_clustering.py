@@ -0,0 +1,68 @@
+"""Agrupamiento de errores en familias con MinHash."""
+
+from error_clustering import (MinHasher, build_families, cluster_groups,
+                              estimated_similarity, message_features)
+
+
+def _traceback(line, detail):
+    return (
+        'Traceback (most recent call last):\n'
+        f'  File "/app/views/orders.py", line {line}, in create_order\n'
+        '    order = repository.save(payload)\n'
+        f'  File "/app/repository.py", line {line + 10}, in save\n'
+        '    raise IntegrityError(detail)\n'
+        f'IntegrityError: duplicate key value violates unique constraint {detail}'
+    )
+
+
+def _group(message, count=1, services=('api',), first='2026-10-01', last='2026-10-02'):
+    return {'count': count, 'services': list(services), 'first_seen': first, 'last_seen': last,
+            'error_type': 'error', 'sample_message': message}
+
+
+def test_message_features():
+    features = message_features('File "/app/x.py", line 3, in run')
+    assert 'frame:/app/x.py:run' in features
+    assert 'shingle:File app x' in features
+    assert message_features('short one') == {'word:short', 'word:one'}
+    assert message_features('') == set()
+
+
+def test_similar_signatures():
+    hasher = MinHasher()
+    a = hasher.signature(message_features(_traceback(10, 'orders_pkey')))
+    b = hasher.signature(message_features(_traceback(12, 'orders_pkey')))
+    c = hasher.signature(message_features('Memory limit exceeded while serving request'))
+    assert estimated_similarity(a, b) > 0.8
+    assert estimated_similarity(a, c) < 0.2
+
+
+def test_near_duplicates_share_a_family():
+    groups = {
+        'b1': _group(_traceback(10, 'orders_pkey'), count=3),
+        'a1': _group(_traceback(14, 'orders_pkey'), count=5, services=('worker',)),
+        'c1': _group('Memory limit of 512 MiB exceeded with 530 MiB used'),
+        'd1': _group(''),
+        'e1': _group(''),
+    }
+    assignment = cluster_groups(groups)
+    assert assignment['a1'] == assignment['b1'] == 'a1'
+    assert assignment['c1'] == 'c1'
+    # Mensajes vacios: cada uno en su propia familia
+    assert assignment['d1'] == 'd1' and assignment['e1'] == 'e1'
+
+
+def test_build_families_aggregates_members():
+    groups = {
+        'a1': _group('x', count=2, services=('api',), first='2026-10-03', last='2026-10-04'),
+        'b1': _group('y', count=7, services=('worker', 'api'), first='2026-10-01', last='2026-10-02'),
+        'c1': _group('z', count=1),
+    }
+    families = build_families(groups, {'a1': 'a1', 'b1': 'a1', 'c1': 'c1'})
+    assert list(families) == ['a1', 'c1']
+    family = families['a1']
+    assert family['members'] == ['b1', 'a1']
+    assert family['count'] == 9
+    assert family['services'] == ['api', 'worker']
+    assert (family['first_seen'], family['last_seen']) == ('2026-10-01', '2026-10-04')
+    assert family['sample_message'] == 'y'
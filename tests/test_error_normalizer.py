@@ -0,0 +1,61 @@
+"""Normalizador de una pasada: equivalencia con la version de seis re.sub."""
+
+import pytest
+
+from bench_normalize import normalize_error_message_legacy
+from error_normalizer import ErrorNormalizer, get_error_hash
+
+MESSAGES = [
+    '',
+    'ConnectionError at 2026-10-10T12:30:45 host 10.0.0.12 port 5432',
+    'Order 12345678901 not found for user 1234567890123',
+    'Request 123e4567-E89B-12d3-a456-426614174000 failed',
+    'GET /api/orders/42/items/7/ returned 500',
+    'Segfault at 0xDEADbeef in worker',
+    '  multiple   spaces\n\tand\nnewlines  ',
+    # Coincidencias que se solapan o quedan junto a digitos: caen al camino secuencial
+    '2026-10-10 12:30:451234567890',
+    '/1234567890/ and 1.2.3.4567',
+    'deadbeef-0000-0000-0000-000000000000/12/',
+    'ids 99999999999/123/0x1f 192.168.1.1',
+]
+
+
+@pytest.mark.parametrize('message', MESSAGES)
+def test_matches_legacy_normalization(message):
+    assert ErrorNormalizer().normalize(message) == normalize_error_message_legacy(message)
+
+
+def test_each_rule():
+    normalizer = ErrorNormalizer()
+    assert normalizer.normalize('at 2026-01-02 03:04:05') == 'at [TIMESTAMP]'
+    assert normalizer.normalize('id 12345678901') == 'id [ID]'
+    assert normalizer.normalize('id 123456789') == 'id 123456789'
+    assert normalizer.normalize('x 123e4567-e89b-12d3-a456-42661417400a') == 'x [UUID]'
+    assert normalizer.normalize('/users/42/profile') == '/users/[ID]/profile'
+    assert normalizer.normalize('from 10.1.2.3') == 'from [IP]'
+    assert normalizer.normalize('addr 0xff') == 'addr [HEX]'
+
+
+def test_service_rules_only_apply_to_their_service():
+    normalizer = ErrorNormalizer()
+    normalizer.register_service_rules('orders', [('order', r'ORD-\d+', '[ORDER]')])
+    assert normalizer.normalize('missing ORD-991', 'orders') == 'missing [ORDER]'
+    assert normalizer.normalize('missing ORD-991', 'billing') == 'missing ORD-991'
+    assert normalizer.normalize('missing ORD-991') == 'missing ORD-991'
+
+
+def test_cache_shared_across_services_without_rules():
+    normalizer = ErrorNormalizer()
+    normalizer.normalize('boom 10.0.0.1', 'a')
+    normalizer.normalize('boom 10.0.0.1', 'b')
+    assert normalizer.cache_info().hits == 1
+    normalizer.cache_clear()
+    assert normalizer.cache_info().currsize == 0
+
+
+def test_error_hash_ignores_variable_parts():
+    a = get_error_hash('api', 'Timeout for 2026-10-10T01:02:03 from 10.0.0.1')
+    b = get_error_hash('api', 'Timeout for 2026-10-11T09:08:07 from 10.0.0.2')
+    assert a == b and len(a) == 12
+    assert get_error_hash('worker', 'Timeout for 2026-10-10T01:02:03 from 10.0.0.1') != a
@@ -0,0 +1,50 @@
+"""Almacen SQLite de errores: ids, retencion e importaciones."""
+
+import os
+import sqlite3
+import subprocess
+import sys
+from datetime import datetime, timezone, timedelta
+
+from error_warehouse import ErrorWarehouse
+
+NOW = datetime(2026, 10, 17, 12, tzinfo=timezone.utc)
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts')
+
+
+def _error(i, **extra):
+    error = {'service': 'crm', 'message': f'KeyError: {i}', 'timestamp': '2026-10-16T10:00:00Z'}
+    error.update(extra)
+    return error
+
+
+def test_errors_without_id_are_inserted_once(tmp_path):
+    warehouse = ErrorWarehouse(str(tmp_path / 'errors.db'))
+    errors = [_error(1), _error(2), _error(1, id='abc')]
+    assert warehouse.insert_errors(errors, now=NOW) == 3
+    assert warehouse.insert_errors(errors, now=NOW) == 0
+    assert warehouse.count() == 3
+
+
+def test_errors_without_timestamp_expire(tmp_path):
+    path = str(tmp_path / 'errors.db')
+    warehouse = ErrorWarehouse(path)
+    warehouse.insert_errors([_error(1, timestamp='')], now=NOW - timedelta(days=100))
+    warehouse.insert_errors([_error(2, timestamp='')], now=NOW)
+    # Fila de una version anterior, guardada con ts NULL
+    with sqlite3.connect(path) as conn:
+        conn.execute("INSERT INTO errors (insert_id, service, ts, error_hash, has_message, data) "
+                     "VALUES ('old', 'crm', NULL, 'h', 1, '{}')")
+    assert warehouse.expire(days=90, now=NOW) == 2
+    assert [e['message'] for e in warehouse.errors_between(NOW - timedelta(days=7))] == ['KeyError: 2']
+
+
+def test_import_has_no_side_effects():
+    # update_data usa el almacen: no debe cargar consolidate_errors (aviso de anthropic)
+    code = ('import sys, error_warehouse; '
+            'w = error_warehouse.ErrorWarehouse(":memory:"); '
+            'w.insert_errors([{"service": "crm", "message": "x"}]); '
+            'print("consolidate_errors" in sys.modules)')
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            cwd=SCRIPTS_DIR)
+    assert result.stdout.strip() == 'False', result.stderr
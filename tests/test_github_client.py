@@ -0,0 +1,53 @@
+"""Cliente de GitHub contra el servidor local falso."""
+
+import http.client
+import json
+
+import pytest
+
+from github_client import ETagCache, GitHubClient, REPO_FIELDS
+from github_stub import StubGitHub, start_stub
+
+
+@pytest.fixture
+def stub():
+    stub = StubGitHub(repos=3)
+    server = start_stub(stub)
+    stub.base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    yield stub
+    server.shutdown()
+
+
+def test_get_is_retried_after_disconnect(stub):
+    client = GitHubClient('owner/repo', token='test', base_url=stub.base_url)
+    stub.drop_responses = 1
+    assert len(client.list_user_repos()) == 3
+    client.close()
+
+
+def test_post_is_not_retried_after_disconnect(stub):
+    client = GitHubClient('owner/repo', token='test', base_url=stub.base_url)
+    stub.drop_responses = 1
+    with pytest.raises(http.client.RemoteDisconnected):
+        client.create_issue('[ERROR-1] x', 'body', ['bug'])
+    # El servidor proceso la request: repetirla duplicaria el issue
+    assert len(stub.issues) == 1
+    client.close()
+
+
+def test_etag_cache_keeps_only_repo_fields(stub, tmp_path):
+    path = str(tmp_path / 'github_etags.json')
+    for repo in stub.repos:
+        repo.update({'private': True, 'owner': {'login': 'owner'}, 'permissions': {'admin': True}})
+
+    client = GitHubClient(token='test', base_url=stub.base_url, etag_cache=ETagCache(path))
+    first = client.list_user_repos()
+    client.etags.save()
+    with open(path) as f:
+        cached = [item for entry in json.load(f).values() for item in entry['data']]
+    assert cached and all(set(item) <= set(REPO_FIELDS) for item in cached)
+
+    # Segunda lectura: 304 con el contenido reducido
+    client = GitHubClient(token='test', base_url=stub.base_url, etag_cache=ETagCache(path))
+    assert client.list_user_repos() == first
+    assert client.not_modified == 1
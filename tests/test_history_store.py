@@ -0,0 +1,71 @@
+"""Historial de metricas: filas crudas, compactacion diaria y rollups."""
+
+import os
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+from history_store import HistoryStore
+
+DAY = datetime(2026, 10, 14, tzinfo=timezone.utc)
+META = {'healthyServices': 1, 'totalErrors24h': 0, 'totalErrors7d': 0, 'costs': {'total': 12.5}}
+
+
+def _service(errors24h, healthy=True):
+    return {'name': 'crm', 'status': 'True' if healthy else 'False',
+            'errors': {'last24h': errors24h, 'last7d': errors24h * 7},
+            'deployments': {'last24h': 0, 'last7d': 1}}
+
+
+def _record_day(store, day, values):
+    for hour, (errors, healthy) in enumerate(values):
+        store.record([_service(errors, healthy)], META, day + timedelta(hours=hour))
+
+
+def test_record_and_duplicate_run(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    assert store.record([_service(3)], META, DAY) == 2
+    assert store.record([_service(4)], META, DAY) == 0
+    rows = store.query('cost', 'raw')
+    assert [(r['service'], r['last']) for r in rows] == [('crm', 0), ('_project', 12.5)]
+
+
+def test_hour_and_day_rollups_with_flaps(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    _record_day(store, DAY, [(2, True), (4, False), (6, True)])
+    hours = store.query('errors24h', 'hour', service='crm')
+    assert [r['last'] for r in hours] == [2, 4, 6]
+
+    # El dia en curso sale de los datos crudos
+    [day] = store.query('errors24h', 'day', service='crm')
+    assert (day['samples'], day['avg'], day['max'], day['last'], day['flaps']) == (3, 4, 6, 6, 2)
+    assert not os.path.exists(tmp_path / 'daily')
+
+
+def test_closed_days_are_compacted(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    _record_day(store, DAY, [(2, True), (4, True)])
+    _record_day(store, DAY + timedelta(days=1), [(10, True)])
+    assert os.path.exists(tmp_path / 'daily' / '2026-10.json')
+
+    # Una instancia nueva lee el rollup materializado y el dia en curso
+    days = HistoryStore(str(tmp_path)).query('errors24h', 'day', service='crm')
+    assert [(r['samples'], r['avg']) for r in days] == [(2, 3), (1, 10)]
+
+    [week] = store.query('errors24h', 'week', service='crm')
+    assert week['bucket'] == int(datetime(2026, 10, 12, tzinfo=timezone.utc).timestamp())
+    assert (week['samples'], week['avg'], week['max'], week['last']) == (3, pytest.approx(16 / 3, abs=1e-3), 10, 10)
+
+
+def test_raw_retention(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    store.record([_service(1)], META, DAY)
+    store.record([_service(1)], META, DAY + timedelta(days=40))
+    assert sorted(os.listdir(tmp_path / 'raw')) == ['2026-11-23.json']
+    days = store.query('errors24h', 'day', service='crm')
+    assert [r['bucket'] for r in days][0] == int(DAY.timestamp())
+
+
+def test_unknown_resolution(tmp_path):
+    with pytest.raises(ValueError):
+        HistoryStore(str(tmp_path)).query('errors24h', 'month')
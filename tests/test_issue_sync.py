@@ -0,0 +1,44 @@
+"""Sincronizacion de issues con los grupos consolidados."""
+
+from datetime import datetime, timezone
+
+from issue_index import IssueIndex
+from issue_sync import COMMENT_MIN_NEW, load_records, plan_sync, seed_records
+
+NOW = datetime(2026, 10, 17, 12, tzinfo=timezone.utc)
+
+
+def _group(count):
+    return {'count': count, 'last_seen': '2026-10-17T11:00:00Z', 'services': ['crm'],
+            'revisions': ['crm-001']}
+
+
+def _index(tmp_path, *hashes):
+    index = IssueIndex(str(tmp_path / 'issue_index.json'), client=None)
+    for i, error_hash in enumerate(hashes, 1):
+        index.add(error_hash, i, f'https://github.com/owner/repo/issues/{i}')
+    return index
+
+
+def test_legacy_records_do_not_trigger_comments(tmp_path):
+    # Registro del formato anterior: solo el conteo al crear el issue
+    records = load_records([{'hash': 'aaa', 'count': 3, 'url': 'https://github.com/owner/repo/issues/1'}])
+    consolidated = {'aaa': _group(50)}
+    index = _index(tmp_path, 'aaa')
+
+    seed_records(records, index, consolidated)
+    assert records['aaa']['reported_count'] == 50
+    assert plan_sync(consolidated, index, records, NOW) == []
+
+    consolidated['aaa'] = _group(50 + COMMENT_MIN_NEW)
+    actions = plan_sync(consolidated, index, records, NOW)
+    assert [(a.kind, a.number) for a in actions] == [('comment', 1)]
+
+
+def test_seeded_issue_without_record(tmp_path):
+    records = {}
+    consolidated = {'bbb': _group(20)}
+    index = _index(tmp_path, 'bbb')
+    seed_records(records, index, consolidated)
+    assert records['bbb']['reported_count'] == 20
+    assert plan_sync(consolidated, index, records, NOW) == []
@@ -0,0 +1,67 @@
+"""Sketches de latencia: fusion y percentiles con error relativo acotado."""
+
+import random
+
+import pytest
+
+from latency_sketch import DEFAULT_RELATIVE_ACCURACY, LatencySketch, parse_latency_ms
+
+
+def _values(seed, n=5000):
+    rng = random.Random(seed)
+    return [rng.lognormvariate(4, 1) for _ in range(n)]
+
+
+def _exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+@pytest.mark.parametrize('q', [0.5, 0.9, 0.99])
+def test_quantile_within_relative_accuracy(q):
+    values = _values(1)
+    sketch = LatencySketch()
+    for value in values:
+        sketch.add(value)
+    exact = _exact_quantile(values, q)
+    assert abs(sketch.quantile(q) - exact) <= DEFAULT_RELATIVE_ACCURACY * exact * 1.01
+
+
+def test_merge_equals_single_sketch():
+    a_values, b_values = _values(1), _values(2)
+    a, b, both = LatencySketch(), LatencySketch(), LatencySketch()
+    for value in a_values:
+        a.add(value)
+        both.add(value)
+    for value in b_values:
+        b.add(value)
+        both.add(value)
+    a.add(0.5)
+    both.add(0.5)
+
+    merged = LatencySketch().merge(a).merge(b)
+    assert merged.to_dict() == both.to_dict()
+    assert merged.summary() == both.summary()
+    assert merged.min == min(a_values + b_values + [0.5])
+
+
+def test_merge_rejects_different_accuracy():
+    with pytest.raises(ValueError):
+        LatencySketch(0.02).merge(LatencySketch(0.05))
+
+
+def test_empty_and_roundtrip():
+    sketch = LatencySketch()
+    assert sketch.quantile(0.5) is None
+    assert sketch.summary()['p99Ms'] == 0
+    for value in (0.2, 12, 350, 350, 2000):
+        sketch.add(value)
+    assert sketch.quantile(0) == 0.0
+    assert sketch.quantile(1) == pytest.approx(2000, rel=DEFAULT_RELATIVE_ACCURACY)
+    assert LatencySketch.from_dict(sketch.to_dict()).summary() == sketch.summary()
+
+
+def test_parse_latency_ms():
+    assert parse_latency_ms('0.123456s') == pytest.approx(123.456)
+    assert parse_latency_ms('') is None
+    assert parse_latency_ms('abc') is None
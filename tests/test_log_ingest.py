@@ -0,0 +1,58 @@
+"""Pruebas de la proyeccion de campos en las ventanas de logs."""
+
+from datetime import datetime, timezone
+
+from log_ingest import LogIngestState, LogQuery
+from update_data import REQUEST_FIELDS
+
+
+ENTRY = {
+    'insertId': 'abc',
+    'timestamp': '2026-10-16T10:00:00Z',
+    'resource': {'type': 'cloud_run_revision',
+                 'labels': {'service_name': 'crm', 'revision_name': 'crm-001',
+                            'location': 'us-central1'}},
+    'httpRequest': {'status': 200, 'latency': '0.120s', 'remoteIp': '10.0.0.1',
+                    'userAgent': 'Mozilla/5.0', 'requestUrl': 'https://crm/?token=x'},
+}
+
+
+def test_project_keeps_only_nested_fields():
+    query = LogQuery('requests', 'filter', window_days=30, fields=REQUEST_FIELDS)
+    assert query.project(ENTRY) == {
+        'insertId': 'abc',
+        'timestamp': '2026-10-16T10:00:00Z',
+        'resource': {'labels': {'service_name': 'crm', 'revision_name': 'crm-001'}},
+        'httpRequest': {'status': 200, 'latency': '0.120s'},
+    }
+
+
+def test_project_skips_missing_paths():
+    query = LogQuery('requests', 'filter', window_days=30, fields=REQUEST_FIELDS)
+    assert query.project({'insertId': 'x', 'httpRequest': {}}) == {'insertId': 'x'}
+
+
+def test_window_stores_projected_entries(tmp_path):
+    query = LogQuery('requests', 'filter', window_days=30, fields=REQUEST_FIELDS)
+    state = LogIngestState(str(tmp_path))
+    now = datetime(2026, 10, 17, tzinfo=timezone.utc)
+    entries = list(state.ingest(query, lambda cmd, timeout: [ENTRY], now=now))
+    assert entries == [query.project(ENTRY)]
+    stored = (tmp_path / 'log_windows' / 'requests' / '2026-10-16.json').read_text()
+    assert 'remoteIp' not in stored and 'userAgent' not in stored
+
+
+def test_view_last_reads_only_oldest_days(tmp_path):
+    query = LogQuery('requests', 'filter', window_days=30, fields=REQUEST_FIELDS)
+    state = LogIngestState(str(tmp_path))
+    now = datetime(2026, 10, 17, tzinfo=timezone.utc)
+    entries = [dict(ENTRY, insertId=f'id{i}', timestamp=f'2026-10-{10 + i // 3:02d}T{i % 3:02d}:00:00Z')
+               for i in range(18)]
+    view = state.ingest(query, lambda cmd, timeout: entries, now=now)
+
+    oldest = list(view)[-1]
+    loaded = []
+    load_day = view.window.load_day
+    view.window.load_day = lambda day: loaded.append(day) or load_day(day)
+    assert view.last() == oldest and oldest['insertId'] == 'id0'
+    assert loaded == ['2026-10-10']
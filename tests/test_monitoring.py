@@ -0,0 +1,55 @@
+"""Cliente de Cloud Monitoring contra el servidor local falso."""
+
+import pytest
+
+from collector_engine import Collector, run_collectors
+from monitoring import MonitoringClient, MonitoringError, get_request_stats
+from monitoring_stub import StubMonitoring, start_stub
+import update_data
+
+
+SERVICES = {
+    'crm': {'requestsPerDay': 100, 'billableSecondsPerDay': 1800.0,
+            'latenciesMs': [10, 20, 30, 40, 1000]},
+    'erp': {'requestsPerDay': 5, 'billableSecondsPerDay': 60.0, 'latenciesMs': []},
+    'api': {'requestsPerDay': 0, 'billableSecondsPerDay': 0.0, 'latenciesMs': [5]},
+}
+
+
+@pytest.fixture
+def stub():
+    stub = StubMonitoring(services=SERVICES, page_size=2)
+    server = start_stub(stub)
+    stub.client = MonitoringClient(stub.project_id,
+                                   base_url=f'http://127.0.0.1:{server.server_address[1]}',
+                                   token_provider=lambda: 'test')
+    yield stub
+    server.shutdown()
+
+
+def test_request_stats_across_pages(stub):
+    stats = get_request_stats(stub.client)
+    assert set(stats) == {'crm', 'erp', 'api'}
+    assert stats['crm']['requests7d'] == 700
+    assert stats['crm']['requests30d'] == 3000
+    assert stats['erp']['billableInstanceSeconds30d'] == 1800
+    assert 'latency' not in stats['erp']
+    assert stats['crm']['latency']['meanMs'] == 220
+    assert 16 <= stats['crm']['latency']['p50Ms'] <= 32
+
+
+def test_failing_api_raises(stub):
+    stub.failing = True
+    with pytest.raises(MonitoringError):
+        get_request_stats(stub.client)
+
+
+def test_failing_api_marks_collector_as_error(stub):
+    stub.failing = True
+    results = run_collectors([
+        Collector('interactions',
+                  lambda: update_data.get_user_interactions_from_monitoring(stub.client))
+    ])
+    assert results['interactions'].status == 'error'
+    assert 'MonitoringError' in results['interactions'].error
+    assert results['interactions'].value == {}
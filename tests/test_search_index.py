@@ -0,0 +1,129 @@
+"""El indice de busqueda contra un recorrido lineal de los mismos errores."""
+
+import json
+import os
+import random
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+import search_index
+from data_publish import publish_error_shards
+
+SERVICES = ['crm-gyt', 'seyca', 'hemisferio-erp', 'rgd-aire']
+MESSAGES = [
+    "KeyError: 'cliente_id'",
+    'ValueError: invalid literal for int() with base 10',
+    'django.db.utils.OperationalError: no such table: ventas_factura',
+    'HTTPError 502 Bad Gateway from upstream',
+    'Timeout waiting for response from payments service',
+    'DoesNotExist: Producto matching query does not exist.',
+    'psycopg2.errors.UniqueViolation: duplicate key value violates unique constraint',
+    'Error interno del servidor: configuración inválida',
+    '',
+]
+START = datetime(2026, 1, 28, tzinfo=timezone.utc)
+
+
+def _fixture_errors(count=400, seed=7):
+    rng = random.Random(seed)
+    errors = []
+    for i in range(count):
+        timestamp = START + timedelta(seconds=rng.randint(0, 3 * 24 * 3600))
+        error = {
+            'id': f'id{i:05d}',
+            'timestamp': timestamp.strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+            'service': rng.choice(SERVICES),
+            'severity': rng.choice(['ERROR', 'ERROR', 'WARNING', 'CRITICAL']),
+            'message': rng.choice(MESSAGES),
+        }
+        if rng.random() < 0.5:
+            error['httpRequest'] = {'status': rng.choice([500, 502, 404])}
+        errors.append(error)
+    return errors
+
+
+@pytest.fixture(scope='module')
+def index(tmp_path_factory):
+    data_dir = str(tmp_path_factory.mktemp('data'))
+    publish_error_shards(_fixture_errors(), data_dir, gzip_copy=False)
+    manifest = search_index.build_search_index(data_dir, gzip_copy=False)
+    # Los documentos en el orden de los ids: shards diarios concatenados
+    docs = []
+    for day in manifest['days']:
+        with open(os.path.join(data_dir, day['file'])) as f:
+            docs.extend(json.load(f))
+    return data_dir, docs
+
+
+def _linear(docs, text='', service=None, severity=None, status=None, start=None, end=None):
+    words = search_index.query_tokens(text)
+    result = []
+    for doc_id, error in enumerate(docs):
+        if service and error['service'] != service:
+            continue
+        if severity and error['severity'] != severity:
+            continue
+        if status and (error.get('httpRequest') or {}).get('status') != status:
+            continue
+        hour = datetime.strptime(error['timestamp'][:13], '%Y-%m-%dT%H').replace(tzinfo=timezone.utc)
+        if end and hour > end:
+            continue
+        if start and hour + timedelta(hours=1) <= start:
+            continue
+        tokens = search_index.tokenize(search_index._indexed_text(error))
+        if all(any(t.startswith(word) for t in tokens) for word in words):
+            result.append(doc_id)
+    return result
+
+
+def test_ids_follow_newest_first_order(index):
+    _, docs = index
+    timestamps = [error['timestamp'] for error in docs]
+    assert timestamps == sorted(timestamps, reverse=True)
+
+
+@pytest.mark.parametrize('text', ['error', 'keyerror', 'Key', 'table ventas', 'django.db',
+                                  'unique', 'configuración', 'gyt', 'timeout payments', 'nomatch'])
+def test_free_text_matches_linear_scan(index, text):
+    data_dir, docs = index
+    assert search_index.search(data_dir, text) == _linear(docs, text)
+
+
+def test_identifier_parts_match_substring_search(index):
+    data_dir, docs = index
+    expected = [i for i, e in enumerate(docs)
+                if 'error' in e['message'].lower() or 'error' in e['service'].lower()]
+    assert search_index.search(data_dir, 'error') == expected
+
+
+@pytest.mark.parametrize('filters', [
+    {'service': 'seyca'},
+    {'severity': 'WARNING'},
+    {'status': 502},
+    {'service': 'crm-gyt', 'severity': 'ERROR', 'status': 500},
+    {'service': 'rgd-aire', 'text': 'ValueError'},
+])
+def test_field_filters_match_linear_scan(index, filters):
+    data_dir, docs = index
+    assert search_index.search(data_dir, **filters) == _linear(docs, **filters)
+
+
+@pytest.mark.parametrize('start, end', [
+    (START + timedelta(hours=5, minutes=30), START + timedelta(hours=20)),
+    (START + timedelta(days=1), START + timedelta(days=2) - timedelta(microseconds=1)),
+    (None, START + timedelta(hours=12)),
+    (START + timedelta(days=2, hours=6), None),
+    (START - timedelta(days=5), START - timedelta(days=4)),
+])
+def test_hour_range_matches_linear_scan(index, start, end):
+    data_dir, docs = index
+    assert search_index.search(data_dir, start=start, end=end) == _linear(docs, start=start, end=end)
+    assert search_index.search(data_dir, 'error', service='seyca', start=start, end=end) == \
+        _linear(docs, 'error', service='seyca', start=start, end=end)
+
+
+def test_tokenize_splits_compound_identifiers():
+    assert search_index.tokenize('KeyError no_such_table HTTPError utf8') == [
+        'keyerror', 'key', 'error', 'no_such_table', 'no', 'such', 'table',
+        'httperror', 'http', 'error', 'utf8', 'utf']
@@ -0,0 +1,64 @@
+"""Parser de tracebacks e indice invertido de frames."""
+
+from traceback_parser import build_frame_index, errors_through, exception_name, parse_traceback
+
+CHAINED = '''Error al procesar pedido
+Traceback (most recent call last):
+  File "/app/db.py", line 20, in fetch
+    cursor.execute(sql)
+  File "/usr/lib/python3.11/site-packages/psycopg2/extras.py", line 146, in execute
+    return super().execute(query, vars)
+psycopg2.errors.UniqueViolation: duplicate key value
+DETAIL:  Key (id)=(1) already exists.
+
+During handling of the above exception, another exception occurred:
+
+Traceback (most recent call last):
+  File "/app/views/orders.py", line 55, in create_order
+    repository.save(order)
+  File "/app/repository.py", line 31, in save
+    raise RepositoryError("no se pudo guardar") from None
+  File "/usr/local/lib/python3.11/site-packages/sqlalchemy/orm/session.py", line 900, in flush
+    self._flush()
+app.errors.RepositoryError: no se pudo guardar
+'''
+
+
+def test_no_traceback():
+    assert parse_traceback('ValueError: plain message') is None
+    assert parse_traceback('') is None
+    assert exception_name(None) is None
+
+
+def test_chained_traceback():
+    parsed = parse_traceback(CHAINED)
+    assert parsed['exception'] == 'app.errors.RepositoryError'
+    assert parsed['exception_message'] == 'no se pudo guardar'
+    assert parsed['exception_chain'] == ['psycopg2.errors.UniqueViolation', 'app.errors.RepositoryError']
+    assert exception_name(parsed) == 'RepositoryError'
+    # El frame mas interno es de sqlalchemy: se toma el de la aplicacion
+    assert parsed['app_frame'] == {'file': '/app/repository.py', 'line': 31, 'function': 'save'}
+    assert parsed['frames'][0] == '/app/views/orders.py:create_order'
+    assert len(parsed['frames']) == 3
+
+
+def test_app_frame_falls_back_to_previous_block():
+    message = CHAINED.replace('/app/views/orders.py', '/usr/lib/python3.11/runpy.py') \
+                     .replace('/app/repository.py', '<frozen importlib>')
+    assert parse_traceback(message)['app_frame']['file'] == '/app/db.py'
+
+
+def test_frame_index_and_errors_through():
+    other = CHAINED.split('During handling')[0]
+    groups = {
+        'h1': {'traceback': parse_traceback(CHAINED)},
+        'h2': {'traceback': parse_traceback(other)},
+        'h3': {'traceback': None},
+    }
+    index = build_frame_index(groups)
+    assert index['app_frames'] == {'/app/db.py:fetch': ['h2'], '/app/repository.py:save': ['h1']}
+    assert index['frames']['/app/views/orders.py:create_order'] == ['h1']
+    assert errors_through(index, 'repository.py') == ['h1']
+    assert errors_through(index, 'site-packages/psycopg2/extras.py') == ['h2']
+    assert errors_through(index, '.py') == ['h1', 'h2']
+    assert errors_through(index, 'missing.py') == []